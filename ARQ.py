@@ -0,0 +1,370 @@
+import heapq
+import itertools
+
+import numpy as np
+
+from Meio import MeioDeComunicacao
+from Perfil import LinkProfile
+from Varredura import gerar_carga
+
+PROTOCOLOS = ["Stop-and-Wait", "Go-Back-N", "Selective Repeat"]
+
+# Tipos de quadro (primeiro byte do cabeçalho ARQ)
+DADOS = 0
+ACK = 1
+NAK = 2
+
+class SimuladorARQ:
+    """
+    Simulação por eventos de um protocolo ARQ sobre o canal ruidoso.
+
+    Cada quadro (de dados ou de controle) passa pelo perfil de enlace
+    completo: cabeçalho ARQ (tipo, número de sequência) + carga, controle
+    de erro, enquadramento, modulação, ruído e o caminho inverso. Ida e
+    volta usam fluxos de ruído independentes. Quadros com erro detectado
+    são descartados pelo receptor (que pode responder com NAK); ACKs e
+    NAKs corrompidos são descartados pelo transmissor.
+
+    O tempo é contado em segundos: cada quadro ocupa o enlace por
+    len(quadro_bits) / taxa_bits e chega atraso_propagacao depois.
+
+    Protocolos:
+    • "Stop-and-Wait": janela 1, sequência módulo 2.
+    • "Go-Back-N": ACK cumulativo; timeout ou NAK reenviam toda a janela a
+      partir do quadro perdido. Exige janela < 2^bits_sequencia.
+    • "Selective Repeat": ACK individual, receptor com buffer; só o quadro
+      perdido é reenviado. Exige janela <= 2^(bits_sequencia - 1).
+    """
+
+    def __init__(self, protocolo="Go-Back-N", janela=8, bits_sequencia=8, perfil=None, sigma=0.0,
+                 taxa_bits=1e6, atraso_propagacao=1e-3, timeout=None, semente=0, indice=0):
+        if protocolo not in PROTOCOLOS:
+            raise ValueError(f"Protocolo desconhecido: {protocolo}")
+        if protocolo == "Stop-and-Wait":
+            janela, bits_sequencia = 1, 1
+
+        self.modulo = 1 << bits_sequencia
+        if bits_sequencia > 8:
+            raise ValueError("O cabeçalho ARQ guarda a sequência em um byte (bits_sequencia <= 8)")
+        if protocolo == "Go-Back-N" and not 1 <= janela < self.modulo:
+            raise ValueError(f"Go-Back-N exige 1 <= janela < {self.modulo}")
+        if protocolo == "Selective Repeat" and not 1 <= janela <= self.modulo // 2:
+            raise ValueError(f"Selective Repeat exige 1 <= janela <= {self.modulo // 2}")
+
+        self.protocolo = protocolo
+        self.janela = janela
+        self.perfil = perfil or LinkProfile(controle_erro="CRC-32")
+        self.sigma = sigma
+        self.taxa_bits = taxa_bits
+        self.atraso_propagacao = atraso_propagacao
+        self.timeout = timeout
+
+        # Fluxos de ruído independentes para ida (dados) e volta (ACK/NAK)
+        self.meio_ida = MeioDeComunicacao(semente=semente, trabalhador=2 * indice)
+        self.meio_volta = MeioDeComunicacao(semente=semente, trabalhador=2 * indice + 1)
+
+    # ------------------------------------------------------------ canal
+    def _atravessar(self, meio, quadro: bytes):
+        """
+        Transmite 'quadro' pelo perfil e pelo meio.
+
+        Retorna:
+        • (duracao_s, recebido): Tempo de transmissão e os bytes entregues
+          pelo receptor, ou None se o controle de erro detectou falha.
+        """
+        sinal, quadro_bits = self.perfil.transmitir(quadro)
+        duracao = len(quadro_bits) / self.taxa_bits
+        try:
+            recebido = self.perfil.receber(meio.transmitir(sinal, self.sigma))
+        except Exception:
+            # Erro detectado (ou quadro ilegível): o quadro é descartado
+            recebido = None
+        return duracao, recebido
+
+    @staticmethod
+    def _ler_cabecalho(recebido):
+        if recebido is None or len(recebido) < 2 or recebido[0] not in (DADOS, ACK, NAK):
+            return None
+        return recebido[0], recebido[1], recebido[2:]
+
+    # ------------------------------------------------------------ simulação
+    def executar(self, cargas, max_eventos=200_000):
+        """
+        Entrega a lista 'cargas' (bytes) do transmissor ao receptor.
+
+        Retorna:
+        • dict: Tempo total, goodput (bits de carga por segundo e relativo à
+          taxa do canal), latência média e p95 de entrega, razão de
+          retransmissão e contadores de quadros. Se 'max_eventos' se esgotar
+          antes de tudo ser confirmado (canal ruidoso demais), 'concluido' é False.
+        """
+        n = len(cargas)
+        modulo = self.modulo
+        seletivo = self.protocolo == "Selective Repeat"
+
+        eventos = []
+        contador = itertools.count()
+
+        def agendar(tempo, tipo, *dados):
+            heapq.heappush(eventos, (tempo, next(contador), tipo, dados))
+
+        # Transmissor: base e próximo número (absolutos), fila do enlace de ida
+        base = 0
+        proximo = 0
+        confirmados = np.zeros(n, dtype=bool)
+        fila = []
+        ida_livre = 0.0
+        transmitindo = False
+        versao_timer = {}
+        primeiro_envio = {}
+        transmissoes = 0
+        retransmissoes = 0
+        duracoes = []
+
+        # Receptor: próximo esperado (absoluto), buffer (Selective Repeat) e NAK pendente
+        esperado = 0
+        buffer = {}
+        nak_enviado = False
+        entregues = [None] * n
+        instante_entrega = np.full(n, np.nan)
+        volta_livre = 0.0
+        controles = 0
+        controles_perdidos = 0
+        dados_perdidos = 0
+
+        def timeout_padrao(duracao_dados):
+            # Ida e volta do quadro mais um ACK, com folga
+            return self.timeout or 2 * (duracao_dados + 2 * self.atraso_propagacao)
+
+        def iniciar_timer(sequencia, agora, duracao):
+            versao_timer[sequencia] = versao_timer.get(sequencia, 0) + 1
+            agendar(agora + timeout_padrao(duracao), "timeout", sequencia, versao_timer[sequencia])
+
+        def enfileirar_janela():
+            nonlocal proximo
+            while proximo < n and proximo < base + self.janela:
+                fila.append(proximo)
+                proximo += 1
+
+        def iniciar_transmissao(agora):
+            nonlocal transmitindo, ida_livre, transmissoes, retransmissoes, dados_perdidos
+            while fila:
+                sequencia = fila.pop(0)
+                # Quadros já confirmados (ou fora da janela após um go-back) saem da fila
+                if sequencia < base or confirmados[sequencia]:
+                    continue
+                quadro = bytes((DADOS, sequencia % modulo)) + cargas[sequencia]
+                duracao, recebido = self._atravessar(self.meio_ida, quadro)
+                duracoes.append(duracao)
+
+                transmissoes += 1
+                if sequencia in primeiro_envio:
+                    retransmissoes += 1
+                else:
+                    primeiro_envio[sequencia] = agora
+
+                transmitindo = True
+                ida_livre = agora + duracao
+                agendar(ida_livre, "fim_envio")
+                agendar(ida_livre + self.atraso_propagacao, "chega_dados", recebido)
+                if seletivo or sequencia == base:
+                    iniciar_timer(sequencia if seletivo else -1, agora, duracao)
+                return
+            transmitindo = False
+
+        def enviar_controle(agora, tipo, sequencia):
+            nonlocal volta_livre, controles
+            controles += 1
+            duracao, recebido = self._atravessar(self.meio_volta, bytes((tipo, sequencia % modulo)))
+            inicio = max(agora, volta_livre)
+            volta_livre = inicio + duracao
+            agendar(volta_livre + self.atraso_propagacao, "chega_controle", recebido)
+
+        def absoluto(valor, referencia):
+            # Número absoluto mais próximo de 'referencia' (para frente) com esse valor módulo 'modulo'
+            return referencia + ((valor - referencia) % modulo)
+
+        # ---- receptor
+        def receber_dados(agora, recebido):
+            nonlocal esperado, nak_enviado, dados_perdidos
+            cabecalho = self._ler_cabecalho(recebido)
+            if cabecalho is None or cabecalho[0] != DADOS:
+                dados_perdidos += 1
+                if not nak_enviado and esperado < n:
+                    nak_enviado = True
+                    enviar_controle(agora, NAK, esperado)
+                return
+            _, valor, carga = cabecalho
+
+            if not seletivo:
+                if valor == esperado % modulo and esperado < n:
+                    entregues[esperado] = carga
+                    instante_entrega[esperado] = agora
+                    esperado += 1
+                    nak_enviado = False
+                # ACK cumulativo: próximo esperado
+                enviar_controle(agora, ACK, esperado)
+                return
+
+            deslocamento = (valor - esperado) % modulo
+            if deslocamento < self.janela:
+                sequencia = esperado + deslocamento
+                if sequencia < n:
+                    buffer[sequencia] = carga
+                enviar_controle(agora, ACK, valor)
+                if deslocamento > 0 and not nak_enviado:
+                    # Lacuna: pede logo o quadro que falta
+                    nak_enviado = True
+                    enviar_controle(agora, NAK, esperado)
+                while esperado in buffer:
+                    entregues[esperado] = buffer.pop(esperado)
+                    instante_entrega[esperado] = agora
+                    esperado += 1
+                    nak_enviado = False
+            elif (esperado - valor) % modulo <= self.janela:
+                # Duplicata de um quadro já entregue: o ACK anterior se perdeu
+                enviar_controle(agora, ACK, valor)
+
+        # ---- transmissor
+        def receber_controle(agora, recebido):
+            nonlocal base, controles_perdidos
+            cabecalho = self._ler_cabecalho(recebido)
+            if cabecalho is None or cabecalho[0] == DADOS:
+                controles_perdidos += 1
+                return
+            tipo, valor, _ = cabecalho
+
+            if not seletivo:
+                alvo = absoluto(valor, base)
+                if tipo == ACK and base < alvo <= proximo:
+                    confirmados[base:alvo] = True
+                    base = alvo
+                    # Reinicia o timer para o novo quadro da base (se houver em voo)
+                    versao_timer[-1] = versao_timer.get(-1, 0) + 1
+                    if base < proximo:
+                        agendar(agora + timeout_padrao(np.mean(duracoes)), "timeout", -1, versao_timer[-1])
+                elif tipo == NAK and base <= alvo < proximo:
+                    # Go-back: reenvia a partir do quadro pedido
+                    confirmados[base:alvo] = True
+                    base = alvo
+                    fila[:] = list(range(base, proximo))
+            else:
+                sequencia = absoluto(valor, base)
+                if not base <= sequencia < proximo:
+                    return
+                if tipo == ACK:
+                    confirmados[sequencia] = True
+                    versao_timer[sequencia] = versao_timer.get(sequencia, 0) + 1
+                    while base < n and confirmados[base]:
+                        base += 1
+                elif not confirmados[sequencia] and sequencia not in fila:
+                    fila.insert(0, sequencia)
+
+            enfileirar_janela()
+            if not transmitindo:
+                iniciar_transmissao(max(agora, ida_livre))
+
+        def estourar_timer(agora, sequencia, versao):
+            if versao_timer.get(sequencia) != versao:
+                return
+            if not seletivo:
+                if base >= proximo:
+                    return
+                fila[:] = list(range(base, proximo))
+            else:
+                if confirmados[sequencia]:
+                    return
+                if sequencia not in fila:
+                    fila.insert(0, sequencia)
+            if not transmitindo:
+                iniciar_transmissao(max(agora, ida_livre))
+
+        enfileirar_janela()
+        iniciar_transmissao(0.0)
+
+        agora = 0.0
+        for _ in range(max_eventos):
+            if base >= n or not eventos:
+                break
+            agora, _, tipo, dados = heapq.heappop(eventos)
+            if tipo == "fim_envio":
+                transmitindo = False
+                enfileirar_janela()
+                iniciar_transmissao(agora)
+            elif tipo == "chega_dados":
+                receber_dados(agora, *dados)
+            elif tipo == "chega_controle":
+                receber_controle(agora, *dados)
+            elif tipo == "timeout":
+                estourar_timer(agora, *dados)
+
+        entregues_ok = sum(1 for recebida, enviada in zip(entregues, cargas) if recebida == enviada)
+        bits_entregues = 8 * sum(len(c) for c, r in zip(cargas, entregues) if r == c)
+        latencias = instante_entrega - np.array([primeiro_envio.get(i, np.nan) for i in range(n)])
+        latencias = latencias[~np.isnan(latencias)]
+
+        return {
+            "protocolo": self.protocolo,
+            "janela": self.janela,
+            "sigma": float(self.sigma),
+            "quadros": n,
+            "entregues": entregues_ok,
+            "erros_nao_detectados": sum(1 for r, c in zip(entregues, cargas) if r is not None and r != c),
+            "concluido": bool(base >= n),
+            "tempo_s": agora,
+            "goodput_bps": bits_entregues / agora if agora else 0.0,
+            "eficiencia": bits_entregues / agora / self.taxa_bits if agora else 0.0,
+            "latencia_media_s": float(latencias.mean()) if len(latencias) else float("nan"),
+            "latencia_p95_s": float(np.percentile(latencias, 95)) if len(latencias) else float("nan"),
+            "transmissoes": transmissoes,
+            "retransmissoes": retransmissoes,
+            "razao_retransmissao": retransmissoes / transmissoes if transmissoes else 0.0,
+            "dados_perdidos": dados_perdidos,
+            "controles": controles,
+            "controles_perdidos": controles_perdidos,
+        }
+
+
+def gerar_cargas(n_quadros, tamanho_carga=32, semente=0):
+    """
+    Cargas aleatórias (ASCII imprimível) reprodutíveis a partir de 'semente'.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(semente, spawn_key=(0xA4,)))
+    return [gerar_carga(rng, tamanho_carga) for _ in range(n_quadros)]
+
+
+def comparar_protocolos(sigmas, janelas=(1, 4, 8, 16), n_quadros=200, tamanho_carga=32, semente=0, **opcoes):
+    """
+    Executa Stop-and-Wait e, para cada janela, Go-Back-N e Selective Repeat
+    em cada sigma, sempre com as mesmas cargas e a mesma semente.
+    As 'opcoes' são repassadas ao SimuladorARQ (perfil, taxa_bits, ...).
+
+    Retorna:
+    • list[dict]: Um resultado de SimuladorARQ.executar por combinação.
+    """
+    cargas = gerar_cargas(n_quadros, tamanho_carga, semente)
+    resultados = []
+    for sigma in sigmas:
+        configuracoes = [("Stop-and-Wait", 1)]
+        configuracoes += [(p, j) for j in janelas for p in ("Go-Back-N", "Selective Repeat") if j > 1]
+        for protocolo, janela in configuracoes:
+            simulador = SimuladorARQ(protocolo, janela, sigma=sigma, semente=semente, **opcoes)
+            resultados.append(simulador.executar(cargas))
+    return resultados
+
+
+def imprimir_resultados(resultados):
+    colunas = ["protocolo", "janela", "sigma", "eficiencia", "latencia_media_s", "latencia_p95_s",
+               "razao_retransmissao", "entregues"]
+    print(" | ".join(f"{c:>19}" for c in colunas))
+    for r in resultados:
+        celulas = [f"{r[c]:>19.4g}" if isinstance(r[c], float) else f"{r[c]!s:>19}" for c in colunas]
+        print(" | ".join(celulas))
+
+
+def main():
+    imprimir_resultados(comparar_protocolos(sigmas=[0.0, 0.6, 0.8]))
+
+
+if __name__ == "__main__":
+    main()
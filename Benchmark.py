@@ -0,0 +1,383 @@
+import time
+import numpy as np
+
+import CamadaFisica
+import Utils
+import Enlace.enquadramentoDados as enquadramentoDados
+from CamadaEnlace import CamadaEnlace
+import Enlace.errorDetection as errorDetection
+from Enlace.crcTabelado import CRC, PRESETS_CRC
+from Enlace.somaVerificacao import PRESETS_SOMA, soma_preset
+
+
+def _cronometrar(funcao, *args, repeticoes=3):
+    """
+    Executa a função algumas vezes e devolve o menor tempo (em segundos).
+    """
+    melhor = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao(*args)
+        decorrido = time.perf_counter() - inicio
+        if melhor is None or decorrido < melhor:
+            melhor = decorrido
+    return melhor
+
+
+# ==================== CÓDIGOS DE LINHA (MANCHESTER / BIPOLAR) ====================
+def _codificador_manchester_laco(bits, amostras_por_bit=10):
+    # Versão original (bit a bit) mantida apenas como referência de desempenho
+    meio = amostras_por_bit // 2
+    sinal = []
+    for bit in bits:
+        if bit == 1:
+            sinal.extend([1.0] * meio)
+            sinal.extend([-1.0] * meio)
+        else:
+            sinal.extend([-1.0] * meio)
+            sinal.extend([1.0] * meio)
+    return np.array(sinal)
+
+
+def _decodificador_manchester_laco(sinal, amostras_por_bit=10):
+    meio = amostras_por_bit // 2
+    n_bits = len(sinal) // amostras_por_bit
+    bits = []
+    for i in range(n_bits):
+        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
+        bits.append(1 if bloco[:meio].mean() > 0 else 0)
+    return np.array(bits)
+
+
+def _codificador_bipolar_laco(bits, amostras_por_bit=10):
+    sinal = []
+    ultimo_pulso = -1
+    for bit in bits:
+        if bit == 1:
+            ultimo_pulso = -ultimo_pulso
+            sinal.extend([ultimo_pulso] * amostras_por_bit)
+        else:
+            sinal.extend([0.0] * amostras_por_bit)
+    return np.array(sinal)
+
+
+def _decodificador_bipolar_laco(sinal, amostras_por_bit=10):
+    n_bits = len(sinal) // amostras_por_bit
+    bits = []
+    for i in range(n_bits):
+        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
+        bits.append(0 if abs(bloco.mean()) < 0.1 else 1)
+    return np.array(bits)
+
+
+def benchmark_codigos_linha(n_bits=100_000, amostras_por_bit=50):
+    """
+    Compara as implementações vetorizadas de Manchester e Bipolar com as
+    versões bit a bit, conferindo se as saídas são idênticas.
+
+    Retorna:
+        list[dict]: Uma linha por função com os tempos e o ganho obtido.
+    """
+    bits = np.random.default_rng(0).integers(0, 2, n_bits)
+
+    casos = [
+        ("codificador_manchester", _codificador_manchester_laco, CamadaFisica.codificador_manchester, bits),
+        ("codificador_bipolar", _codificador_bipolar_laco, CamadaFisica.codificador_bipolar, bits),
+        ("decodificador_manchester", _decodificador_manchester_laco, CamadaFisica.decodificador_manchester,
+         CamadaFisica.codificador_manchester(bits, amostras_por_bit)),
+        ("decodificador_bipolar", _decodificador_bipolar_laco, CamadaFisica.decodificador_bipolar,
+         CamadaFisica.codificador_bipolar(bits, amostras_por_bit)),
+    ]
+
+    resultados = []
+    for nome, antiga, nova, entrada in casos:
+        if not np.array_equal(antiga(entrada, amostras_por_bit), nova(entrada, amostras_por_bit)):
+            raise AssertionError(f"{nome}: saída vetorizada difere da versão bit a bit")
+
+        t_laco = _cronometrar(antiga, entrada, amostras_por_bit)
+        t_vetor = _cronometrar(nova, entrada, amostras_por_bit)
+        resultados.append({
+            "funcao": nome,
+            "laco_s": t_laco,
+            "vetorizado_s": t_vetor,
+            "ganho": t_laco / t_vetor,
+        })
+
+    return resultados
+
+
+# ==================== DEMODULADORES (BANCO DE CORRELATORES) ====================
+def benchmark_demoduladores(n_simbolos=200_000, amostras_por_simbolo=50, fc=5):
+    """
+    Mede a vazão (símbolos por segundo) dos demoduladores baseados no banco
+    de correlatores.
+
+    Retorna:
+        list[dict]: Uma linha por modulação.
+    """
+    rng = np.random.default_rng(0)
+
+    casos = [
+        ("ASK", 1, CamadaFisica.modulador_ask, CamadaFisica.demodulador_ask, (fc,)),
+        ("FSK", 1, CamadaFisica.modulador_fsk, CamadaFisica.demodulador_fsk, (fc, 2 * fc)),
+        ("QPSK", 2, CamadaFisica.modulador_qpsk, CamadaFisica.demodulador_qpsk, (fc,)),
+        ("16QAM", 4, CamadaFisica.modulador_16qam, CamadaFisica.demodulador_16qam, (fc,)),
+    ]
+    for nome in ("8PSK", "64QAM", "256QAM"):
+        constelacao = CamadaFisica.CONSTELACOES[nome]
+        casos.append((nome, constelacao.bits_por_simbolo, constelacao.modular, constelacao.demodular, (fc,)))
+
+    resultados = []
+    for nome, bits_por_simbolo, modulador, demodulador, freqs in casos:
+        bits = rng.integers(0, 2, n_simbolos * bits_por_simbolo)
+        sinal = modulador(bits, *freqs, amostras_por_simbolo)
+
+        tempo = _cronometrar(demodulador, sinal, *freqs, amostras_por_simbolo)
+        resultados.append({
+            "modulacao": nome,
+            "tempo_s": tempo,
+            "simbolos_por_s": n_simbolos / tempo,
+        })
+
+    return resultados
+
+
+# ==================== M-FSK (FFT) ====================
+def benchmark_mfsk(n_simbolos=200_000, amostras_por_simbolo=50):
+    """
+    Mostra que o custo do detector M-FSK por FFT quase não cresce com o
+    número de tons, ao contrário de um banco de correlatores no tempo.
+
+    Retorna:
+        list[dict]: Uma linha por número de tons.
+    """
+    rng = np.random.default_rng(0)
+    resultados = []
+    for M in (2, 4, 8, 16):
+        bits = rng.integers(0, 2, n_simbolos * int(np.log2(M)))
+        sinal = CamadaFisica.modulador_mfsk(bits, M, amostras_por_simbolo=amostras_por_simbolo)
+
+        tempo = _cronometrar(CamadaFisica.demodulador_mfsk, sinal, M, 1, 1, amostras_por_simbolo)
+        resultados.append({
+            "tons": M,
+            "tempo_s": tempo,
+            "simbolos_por_s": n_simbolos / tempo,
+        })
+
+    return resultados
+
+
+# ==================== CRC (TABELADO) ====================
+def benchmark_crc(tamanho=16 << 20, tamanho_legado=64 << 10):
+    """
+    Vazão (MB/s) do motor tabelado para cada preset, comparada com o CRC-32
+    bit a bit original (medido numa entrada menor, por ser muito mais lento).
+
+    Retorna:
+        list[dict]: Uma linha por CRC.
+    """
+    rng = np.random.default_rng(0)
+    dados = rng.integers(0, 256, tamanho, dtype=np.uint8).tobytes()
+
+    resultados = []
+    for nome in ["CRC-32 (bit a bit)", "CRC-32"] + list(PRESETS_CRC):
+        if nome == "CRC-32 (bit a bit)":
+            entrada = dados[:tamanho_legado]
+            tempo = _cronometrar(_crc_laco, entrada, repeticoes=1)
+        elif nome == "CRC-32":
+            entrada = dados
+            tempo = _cronometrar(errorDetection.crc, entrada)
+        else:
+            entrada = dados
+            tempo = _cronometrar(lambda d, n=nome: CRC.preset(n).update(d), entrada)
+        resultados.append({
+            "crc": nome,
+            "tempo_s": tempo,
+            "mb_por_s": len(entrada) / tempo / 1e6,
+        })
+
+    return resultados
+
+
+def _crc_laco(quadro, tamanho_do_edc=32, polinomio=0x04C11DB7):
+    # Versão original (bit a bit) mantida apenas como referência de desempenho
+    crc = 0
+    mask = (1 << tamanho_do_edc) - 1
+    for byte in quadro:
+        crc ^= (byte << (tamanho_do_edc - 8))
+        for _ in range(8):
+            if crc & (1 << (tamanho_do_edc - 1)):
+                crc = (crc << 1) ^ polinomio
+            else:
+                crc <<= 1
+            crc &= mask
+    return crc
+
+
+
+def benchmark_somas(tamanho=16 << 20, tamanho_legado=1 << 20):
+    """
+    Vazão (MB/s) das somas de verificação de Enlace.somaVerificacao,
+    comparada com o checksum de 8 bits original (laço byte a byte, medido
+    numa entrada menor) e com o CRC-32C, o CRC sem acelerador do zlib.
+
+    Retorna:
+        list[dict]: Uma linha por soma.
+    """
+    rng = np.random.default_rng(0)
+    dados = rng.integers(0, 256, tamanho, dtype=np.uint8).tobytes()
+
+    resultados = []
+    for nome in ["Checksum-8 (laço)"] + list(PRESETS_SOMA) + ["CRC-32C"]:
+        if nome == "Checksum-8 (laço)":
+            entrada = dados[:tamanho_legado]
+            tempo = _cronometrar(_checksum_laco, entrada, repeticoes=1)
+        elif nome == "CRC-32C":
+            entrada = dados
+            tempo = _cronometrar(lambda d: CRC.preset("CRC-32C").update(d), entrada)
+        else:
+            entrada = dados
+            tempo = _cronometrar(lambda d, n=nome: soma_preset(n).update(d).valor(), entrada)
+        resultados.append({
+            "soma": nome,
+            "tempo_s": tempo,
+            "mb_por_s": len(entrada) / tempo / 1e6,
+        })
+
+    return resultados
+
+
+def _checksum_laco(quadro):
+    # Versão original (byte a byte, dobrando o vai-um a cada soma) mantida apenas como referência
+    soma = 0
+    for byte in quadro:
+        soma += byte
+        while soma > 0xFF:
+            soma = (soma & 0xFF) + (soma >> 8)
+    return ~soma & 0xFF
+
+# ==================== ENQUADRAMENTO (INSERÇÃO DE BYTES) ====================
+def _enquadrar_insercao_byte_fatias(dado, flag=b'\x7E', esc=b'\x7D'):
+    # Versão original (uma cópia do quadro por inserção) mantida apenas como referência de desempenho
+    if flag in dado:
+        esc_pos = Utils.findall(esc, dado)
+        for pos in range(len(esc_pos)):
+            offset = len(esc) * pos
+            dado = dado[:(esc_pos[pos] + offset)] + esc + dado[(esc_pos[pos] + offset):]
+
+        flag_pos = Utils.findall(flag, dado)
+        for pos in range(len(flag_pos)):
+            offset = len(esc) * pos
+            dado = dado[:(flag_pos[pos] + offset)] + esc + dado[(flag_pos[pos] + offset):]
+
+    return flag + dado + flag
+
+
+def benchmark_insercao_bytes(tamanhos=(1_000, 10_000, 50_000)):
+    """
+    Enquadramento por inserção de bytes com carga binária cheia de flags e
+    escapes (um terço de cada): versão por fatias vs. bytes.replace, e o
+    desenquadrador incremental alimentado em trechos de 1500 bytes.
+
+    Retorna:
+        list[dict]: Uma linha por tamanho de carga.
+    """
+    rng = np.random.default_rng(0)
+    resultados = []
+    for tamanho in tamanhos:
+        dado = rng.choice(np.array([0x7E, 0x7D, 0x41], dtype=np.uint8), tamanho).tobytes()
+        quadro = enquadramentoDados.enquadrar_flag_insercao_byte(dado)
+        if _enquadrar_insercao_byte_fatias(dado) != quadro:
+            raise AssertionError("Inserção de bytes: saída difere da versão por fatias")
+
+        def desenquadrar_em_trechos():
+            desenquadrador = enquadramentoDados.DesenquadradorBytes()
+            return [q for i in range(0, len(quadro), 1500) for q in desenquadrador.alimentar(quadro[i:i + 1500])]
+
+        t_fatias = _cronometrar(_enquadrar_insercao_byte_fatias, dado, repeticoes=1)
+        t_replace = _cronometrar(enquadramentoDados.enquadrar_flag_insercao_byte, dado)
+        t_fluxo = _cronometrar(desenquadrar_em_trechos)
+        resultados.append({
+            "bytes": tamanho,
+            "fatias_s": t_fatias,
+            "replace_s": t_replace,
+            "ganho": t_fatias / t_replace,
+            "desenquadrar_fluxo_s": t_fluxo,
+        })
+
+    return resultados
+
+
+# ==================== SEGMENTAÇÃO (MTU) ====================
+def benchmark_segmentacao(tamanho_mensagem=1 << 20, mtus=(64, 256, 1024, 4096, 16384),
+                          tipo_erro="CRC-32", tipo_enquadramento="Contagem de Caracteres"):
+    """
+    Vazão da camada de enlace para uma mensagem grande em função da MTU:
+    segmentar + controle de erro + enquadramento no transmissor e o caminho
+    inverso com remontagem no receptor.
+
+    Retorna:
+        list[dict]: Uma linha por MTU, com a vazão (MB/s de mensagem) e a
+        sobrecarga (bytes no canal por byte de mensagem).
+    """
+    mensagem = np.random.default_rng(0).integers(0, 256, tamanho_mensagem, dtype=np.uint8).tobytes()
+
+    resultados = []
+    for mtu in mtus:
+        transmissor = CamadaEnlace(mtu=mtu)
+        receptor = CamadaEnlace(mtu=mtu)
+
+        def ida_e_volta():
+            quadros = transmissor.segmentar(mensagem, tipo_erro, tipo_enquadramento)
+            for quadro in quadros:
+                recebida = receptor.remontar(quadro, tipo_erro, tipo_enquadramento)
+            return quadros, recebida
+
+        quadros, recebida = ida_e_volta()
+        if recebida != mensagem:
+            raise AssertionError(f"MTU {mtu}: mensagem remontada difere da original")
+        # Duplicatas atrasadas (de uma mensagem de vários segmentos e de uma de um só) não são entregues de novo
+        curta = transmissor.segmentar(b"curta", tipo_erro, tipo_enquadramento)
+        receptor.remontar(curta[0], tipo_erro, tipo_enquadramento)
+        for duplicata in (quadros[0], curta[0]):
+            if receptor.remontar(duplicata, tipo_erro, tipo_enquadramento) is not None or receptor.remontador.pendentes():
+                raise AssertionError(f"MTU {mtu}: segmento duplicado de uma mensagem já entregue foi aceito")
+
+        tempo = _cronometrar(ida_e_volta)
+        resultados.append({
+            "mtu": mtu,
+            "quadros": len(quadros),
+            "tempo_s": tempo,
+            "mb_por_s": tamanho_mensagem / tempo / 1e6,
+            "sobrecarga": sum(len(q) for q in quadros) / tamanho_mensagem,
+        })
+
+    return resultados
+
+
+def imprimir_tabela(titulo, linhas):
+    print(f"\n=== {titulo} ===")
+    if not linhas:
+        return
+    colunas = list(linhas[0].keys())
+    print(" | ".join(f"{c:>24}" for c in colunas))
+    for linha in linhas:
+        celulas = []
+        for c in colunas:
+            valor = linha[c]
+            celulas.append(f"{valor:>24.4f}" if isinstance(valor, float) else f"{valor!s:>24}")
+        print(" | ".join(celulas))
+
+
+def main():
+    imprimir_tabela("Códigos de linha (100k bits, 50 amostras/bit)", benchmark_codigos_linha())
+    imprimir_tabela("Demoduladores (200k símbolos, 50 amostras/símbolo)", benchmark_demoduladores())
+    imprimir_tabela("M-FSK por FFT (200k símbolos, 50 amostras/símbolo)", benchmark_mfsk())
+    imprimir_tabela("CRC (16 MiB; bit a bit com 64 KiB)", benchmark_crc())
+    imprimir_tabela("Somas de verificação (16 MiB; laço com 1 MiB)", benchmark_somas())
+    imprimir_tabela("Inserção de bytes (carga com 2/3 de flags e escapes)", benchmark_insercao_bytes())
+    imprimir_tabela("Segmentação de 1 MiB por MTU (CRC-32 + contagem de caracteres)", benchmark_segmentacao())
+
+
+if __name__ == "__main__":
+    main()
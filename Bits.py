@@ -0,0 +1,185 @@
+import numpy as np
+
+# Número de bits '1' de cada valor de byte
+_UNS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1).astype(np.uint8)
+
+
+def contar_uns_por_linha(matriz) -> np.ndarray:
+    """
+    Popcount de cada linha de uma matriz uint8 (um quadro por linha).
+    """
+    return _UNS_POR_BYTE[np.asarray(matriz, dtype=np.uint8)].sum(axis=1, dtype=np.int64)
+
+
+class BitBuffer:
+    """
+    Sequência de bits empacotada (8 bits por byte, o mais significativo
+    primeiro, como np.packbits), com comprimento exato em bits.
+
+    É a representação única de bits entre as camadas: o transmissor, o
+    receptor, o enquadramento e o controle de erro trocam bytes <-> bits
+    por aqui, em vez de listas de int ou strings de '0'/'1'.
+
+    • Fatias (buffer[a:b]) são vistas: compartilham os bytes do original,
+      guardando só o deslocamento em bits e o comprimento.
+    • bits() devolve um array uint8 de 0/1 (np.asarray(buffer) também);
+      tobytes() devolve os bits empacotados, com o último byte completado
+      com zeros.
+    • contar_uns() conta os bits '1' por tabela, sem desempacotar.
+    """
+
+    __slots__ = ("_dados", "_inicio", "_tamanho")
+
+    def __init__(self, dados=b"", n_bits=None, inicio=0):
+        """
+        Parâmetros:
+        • dados: Bytes empacotados (bytes, bytearray, memoryview ou array uint8).
+          bytes e memoryview são usados sem cópia.
+        • n_bits: Número de bits válidos (padrão: todos os bits a partir de 'inicio').
+        • inicio: Deslocamento, em bits, do primeiro bit válido.
+        """
+        if isinstance(dados, np.ndarray):
+            dados = np.ascontiguousarray(dados, dtype=np.uint8)
+        self._dados = memoryview(dados).cast("B")
+        disponiveis = 8 * len(self._dados) - inicio
+        if n_bits is None:
+            n_bits = disponiveis
+        if inicio < 0 or not 0 <= n_bits <= disponiveis:
+            raise ValueError(f"{n_bits} bits a partir do bit {inicio} não cabem em {len(self._dados)} bytes")
+        self._inicio = inicio
+        self._tamanho = n_bits
+
+    # ------------------------------------------------------------ construção
+    @classmethod
+    def de_bytes(cls, dados, n_bits=None):
+        return cls(dados, n_bits)
+
+    @classmethod
+    def de_bits(cls, bits):
+        """
+        A partir de uma sequência de 0/1 (array, lista ou outro BitBuffer).
+        """
+        if isinstance(bits, BitBuffer):
+            return bits
+        bits = np.asarray(bits, dtype=np.uint8)
+        return cls(np.packbits(bits), len(bits))
+
+    @classmethod
+    def de_texto(cls, texto: str):
+        """
+        A partir de uma string de '0' e '1' (espaços são ignorados).
+        """
+        codigos = np.frombuffer(texto.replace(" ", "").encode("ascii"), dtype=np.uint8)
+        if np.any((codigos != ord("0")) & (codigos != ord("1"))):
+            raise ValueError("O texto deve conter apenas '0', '1' e espaços")
+        return cls.de_bits(codigos - ord("0"))
+
+    # ------------------------------------------------------------ acesso
+    def __len__(self):
+        return self._tamanho
+
+    @property
+    def n_bytes(self) -> int:
+        """
+        Bytes necessários para guardar os bits (o último pode estar incompleto).
+        """
+        return -(-self._tamanho // 8)
+
+    def _bytes_cobertos(self):
+        # Bytes do buffer que contêm os bits válidos
+        primeiro = self._inicio // 8
+        return np.frombuffer(self._dados, dtype=np.uint8)[primeiro:-(-(self._inicio + self._tamanho) // 8)]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, passo = indice.indices(self._tamanho)
+            if passo != 1:
+                return BitBuffer.de_bits(self.bits()[indice])
+            return BitBuffer(self._dados, max(0, fim - inicio), self._inicio + inicio)
+
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("índice de bit fora do buffer")
+        posicao = self._inicio + indice
+        return (self._dados[posicao // 8] >> (7 - posicao % 8)) & 1
+
+    def bits(self) -> np.ndarray:
+        """
+        Retorna:
+        • np.ndarray: Array uint8 (novo) com um bit (0/1) por elemento.
+        """
+        deslocamento = self._inicio % 8
+        return np.unpackbits(self._bytes_cobertos())[deslocamento:deslocamento + self._tamanho]
+
+    def __array__(self, dtype=None, copy=None):
+        bits = self.bits()
+        return bits if dtype is None else bits.astype(dtype)
+
+    def __iter__(self):
+        return iter(self.bits().tolist())
+
+    def tobytes(self) -> bytes:
+        """
+        Retorna:
+        • bytes: Os bits empacotados; o último byte é completado com zeros.
+        """
+        if self._inicio % 8:
+            return np.packbits(self.bits()).tobytes()
+        cobertos = self._bytes_cobertos()
+        sobra = self._tamanho % 8
+        if not sobra:
+            return cobertos.tobytes()
+        saida = bytearray(cobertos)
+        saida[-1] &= (0xFF << (8 - sobra)) & 0xFF
+        return bytes(saida)
+
+    def __bytes__(self):
+        return self.tobytes()
+
+    # ------------------------------------------------------------ operações
+    def contar_uns(self) -> int:
+        """
+        Número de bits '1' (popcount), ignorando os bits fora da visão.
+        """
+        cobertos = self._bytes_cobertos()
+        if len(cobertos) == 0:
+            return 0
+        total = int(_UNS_POR_BYTE[cobertos].sum(dtype=np.int64))
+        # Desconta os bits antes do início e depois do fim dentro dos bytes das pontas
+        antes = self._inicio % 8
+        depois = (-(self._inicio + self._tamanho)) % 8
+        if antes:
+            total -= int(_UNS_POR_BYTE[cobertos[0] >> (8 - antes)])
+        if depois:
+            total -= int(_UNS_POR_BYTE[cobertos[-1] & ((1 << depois) - 1)])
+        return total
+
+    def __add__(self, outro):
+        outro = BitBuffer.de_bits(outro)
+        if self._inicio % 8 == 0 and self._tamanho % 8 == 0 and outro._inicio % 8 == 0:
+            return BitBuffer(self.tobytes() + outro.tobytes(), self._tamanho + len(outro))
+        return BitBuffer.de_bits(np.concatenate((self.bits(), outro.bits())))
+
+    def __eq__(self, outro):
+        if not isinstance(outro, BitBuffer):
+            return NotImplemented
+        if self._tamanho != outro._tamanho:
+            return False
+        return self.tobytes() == outro.tobytes()
+
+    __hash__ = None
+
+    def __str__(self):
+        return (self.bits() + ord("0")).tobytes().decode("ascii")
+
+    def __repr__(self):
+        texto = str(self[:64])
+        return f"BitBuffer({len(self)} bits: {texto}{'...' if len(self) > 64 else ''})"
+
+    def formatar(self, separador=" ") -> str:
+        """
+        Bits agrupados em bytes ("01000001 01000010"), para visualização.
+        """
+        texto = str(self)
+        return separador.join(texto[i:i + 8] for i in range(0, len(texto), 8))
@@ -1,64 +1,328 @@
+from functools import partial
+
+import numpy as np
+
 import Enlace.enquadramentoDados as enquadramentoDados
 import Enlace.errorDetection as errorDetection
 import Enlace.errorCorrection as errorCorrection
+from Enlace.segmentacao import Segmentador, Remontador
+from Enlace.bufferQuadro import BufferQuadro
+from Enlace.crcTabelado import CRC
+from Enlace.somaVerificacao import soma_preset
+from Bits import BitBuffer
+
+
+def _sem_tratamento(dados: bytes) -> bytes:
+    return dados
+
+
+# Nome vindo da GUI -> (aplicar, verificar)
+CONTROLES_ERRO = {
+    "Bit de Paridade Par": (errorDetection.bit_de_paridade_par, errorDetection.verifica_bit_de_paridade_par),
+    # Polinômio padrão IEEE 802.3 para CRC-32: 0x04C11DB7
+    "CRC-32": (errorDetection.crc, errorDetection.verifica_crc),
+    "CRC-8": (partial(errorDetection.crc_por_nome, nome="CRC-8"),
+              partial(errorDetection.verifica_crc_por_nome, nome="CRC-8")),
+    "CRC-16/CCITT": (partial(errorDetection.crc_por_nome, nome="CRC-16/CCITT"),
+                     partial(errorDetection.verifica_crc_por_nome, nome="CRC-16/CCITT")),
+    "CRC-32C": (partial(errorDetection.crc_por_nome, nome="CRC-32C"),
+                partial(errorDetection.verifica_crc_por_nome, nome="CRC-32C")),
+    "Hamming": (errorCorrection.hamming, errorCorrection.verifica_hamming),
+    **{
+        nome: (partial(errorCorrection.hamming, codigo=nome), partial(errorCorrection.verifica_hamming, codigo=nome))
+        for nome in errorCorrection.CODIGOS_HAMMING
+    },
+    **{
+        nome: (partial(errorCorrection.convolucional, codigo=nome),
+               partial(errorCorrection.verifica_convolucional, codigo=nome))
+        for nome in errorCorrection.CODIGOS_CONVOLUCIONAIS
+    },
+    "Checksum": (errorDetection.checksum, errorDetection.verifica_checksum),
+    **{
+        nome: (partial(errorDetection.soma_por_nome, nome=nome), partial(errorDetection.verifica_soma_por_nome, nome=nome))
+        for nome in ("Internet", "Fletcher-16", "Fletcher-32", "Adler-32")
+    },
+    "Nenhum": (_sem_tratamento, _sem_tratamento),
+}
+
+# Nome vindo da GUI -> (enquadrar, desenquadrar)
+ENQUADRAMENTOS = {
+    "Contagem de Caracteres": (enquadramentoDados.enquadrar_contagem_caracteres,
+                               enquadramentoDados.desenquadrar_contagem_caracteres),
+    "Inserção de Bytes": (enquadramentoDados.enquadrar_flag_insercao_byte,
+                          enquadramentoDados.desenquadrar_flag_insercao_byte),
+    "Inserção de Bits": (enquadramentoDados.enquadrar_flag_insercao_bit,
+                         enquadramentoDados.desenquadrar_flag_insercao_bit),
+    "Nenhum": (_sem_tratamento, _sem_tratamento),
+}
+
+
+def _paridade(dados) -> bytes:
+    return b"\x01" if BitBuffer.de_bytes(dados).contar_uns() % 2 else b"\x00"
+
+
+def _trailer_comparado(tamanho, calcular):
+    # Verifica recalculando o trailer sobre os dados e comparando com o recebido
+    return tamanho, calcular, lambda dados, trailer: calcular(dados) == trailer
+
+
+def _trailer_crc(nome):
+    return _trailer_comparado(len(CRC.preset(nome).digest()), lambda dados: CRC.preset(nome).update(dados).digest())
+
+
+def _trailer_soma(nome):
+    return _trailer_comparado(soma_preset(nome).num_bytes, lambda dados: soma_preset(nome).update(dados).digest())
+
+
+# Controles que só anexam um trailer: nome -> (bytes do trailer, calcular(dados), verificar(dados, trailer)).
+# Com eles o quadro é protegido e verificado no lugar (ver CamadaEnlace.*_buffer); os demais
+# (Hamming, convolucional) transformam os dados inteiros e passam pelas funções de CONTROLES_ERRO.
+TRAILERS = {
+    "Bit de Paridade Par": (1, _paridade,
+                            lambda dados, trailer: (BitBuffer.de_bytes(dados).contar_uns()
+                                                    + BitBuffer.de_bytes(trailer).contar_uns()) % 2 == 0),
+    # A soma em complemento de um dos dados com o checksum deve dar zero (como em verifica_checksum)
+    "Checksum": (1, lambda dados: soma_preset("Checksum-8").update(dados).digest(),
+                 lambda dados, trailer: soma_preset("Checksum-8").update(dados).update(trailer).valor() == 0),
+    "CRC-32": _trailer_comparado(4, lambda dados: CRC(32, 0x04C11DB7).update(dados).digest()),
+    **{nome: _trailer_crc(nome) for nome in ("CRC-8", "CRC-16/CCITT", "CRC-32C")},
+    **{nome: _trailer_soma(nome) for nome in ("Internet", "Fletcher-16", "Fletcher-32", "Adler-32")},
+}
+
+
+# Controles com versão em lote, para quadros de mesmo tamanho numa matriz uint8:
+# nome -> (aplicar(matriz) -> matriz, verificar(matriz) -> (dados, validos))
+CONTROLES_ERRO_LOTE = {
+    "Bit de Paridade Par": (errorDetection.bit_de_paridade_par_lote, errorDetection.verifica_bit_de_paridade_par_lote),
+    "Checksum": (errorDetection.checksum_lote, errorDetection.verifica_checksum_lote),
+    "CRC-32": (errorDetection.crc_lote, errorDetection.verifica_crc_lote),
+    **{
+        nome: (partial(errorDetection.crc_lote, nome=nome), partial(errorDetection.verifica_crc_lote, nome=nome))
+        for nome in ("CRC-8", "CRC-16/CCITT", "CRC-32C")
+    },
+    "Hamming": (errorCorrection.CODIGOS_HAMMING["Hamming (7,4)"].codificar_lote,
+                errorCorrection.CODIGOS_HAMMING["Hamming (7,4)"].verificar_lote),
+    **{nome: (codigo.codificar_lote, codigo.verificar_lote) for nome, codigo in errorCorrection.CODIGOS_HAMMING.items()},
+}
+
+
+def _agrupar_por_tamanho(quadros):
+    """
+    Agrupa os quadros (lista de bytes ou matriz uint8) em matrizes de linhas do mesmo tamanho.
+
+    Retorna:
+    • list[(indices, matriz)]: Posições dos quadros na entrada e a matriz deles.
+    """
+    if isinstance(quadros, np.ndarray):
+        if quadros.ndim != 2:
+            raise ValueError("Um lote em array deve ser uma matriz (quadros x bytes)")
+        return [(np.arange(len(quadros)), np.ascontiguousarray(quadros, dtype=np.uint8))]
+
+    grupos = {}
+    for indice, quadro in enumerate(quadros):
+        grupos.setdefault(len(quadro), []).append(indice)
+    return [
+        (np.array(indices),
+         np.frombuffer(b"".join(bytes(quadros[i]) for i in indices), dtype=np.uint8).reshape(len(indices), tamanho))
+        for tamanho, indices in grupos.items()
+    ]
+
+
+def _linhas(quadros):
+    if isinstance(quadros, np.ndarray):
+        return [linha.tobytes() for linha in quadros]
+    return [bytes(quadro) for quadro in quadros]
+
+
+def resolver_controle_erro(tipo: str):
+    """
+    Devolve (aplicar, verificar) para 'tipo'. Levanta ValueError se desconhecido.
+    """
+    if tipo not in CONTROLES_ERRO:
+        raise ValueError(f"Controle de erro desconhecido: {tipo}")
+    return CONTROLES_ERRO[tipo]
+
+
+def resolver_enquadramento(tipo: str):
+    """
+    Devolve (enquadrar, desenquadrar) para 'tipo'. Levanta ValueError se desconhecido.
+    """
+    if tipo not in ENQUADRAMENTOS:
+        raise ValueError(f"Enquadramento desconhecido: {tipo}")
+    return ENQUADRAMENTOS[tipo]
+
+
+def _ou_none(funcao, quadro):
+    try:
+        return funcao(quadro)
+    except Exception:
+        return None
+
 
 class CamadaEnlace:
-    def __init__(self):
-        pass
+    def __init__(self, mtu=1024, formato_segmento="varint"):
+        # Segmentação de mensagens maiores que a MTU (ver segmentar/remontar)
+        self.segmentador = Segmentador(mtu, formato_segmento)
+        self.remontador = Remontador(formato_segmento)
 
     def aplicar_deteccao_correcao(self, dados: bytes, tipo: str) -> bytes:
         """
         Aplica o algoritmo de erro escolhido.
         """
-        if tipo == "Bit de Paridade Par":
-            return errorDetection.bit_de_paridade_par(dados)
-        elif tipo == "CRC-32":
-            # Polinômio padrão IEEE 802.3 para CRC-32: 0x04C11DB7
-            return errorDetection.crc(dados)
-        elif tipo == "Hamming":
-            return errorCorrection.hamming(dados)
-        elif tipo == "Checksum":
-            return errorDetection.checksum(dados) 
-        else:
-            return dados # Nenhum tratamento
+        aplicar, _ = CONTROLES_ERRO.get(tipo, CONTROLES_ERRO["Nenhum"])
+        return aplicar(dados)
 
     def verificar_deteccao_correcao(self, dados: bytes, tipo: str) -> bytes:
         """
         Verifica/Corrige o erro e remove os bits de controle.
         """
-        if tipo == "Bit de Paridade Par":
-            return errorDetection.verifica_bit_de_paridade_par(dados)
-        elif tipo == "CRC-32":
-            return errorDetection.verifica_crc(dados)
-        elif tipo == "Hamming":
-            return errorCorrection.verifica_hamming(dados)
-        elif tipo == "Checksum":
-            return errorDetection.verifica_checksum(dados)
-        else:
-            return dados
+        _, verificar = CONTROLES_ERRO.get(tipo, CONTROLES_ERRO["Nenhum"])
+        return verificar(dados)
 
     def enquadrar(self, dados: bytes, tipo: str) -> bytes:
         """
         Aplica o enquadramento desejado.
         """
-        if tipo == "Contagem de Caracteres":
-            return enquadramentoDados.enquadrar_contagem_caracteres(dados)
-        elif tipo == "Inserção de Bytes":
-            return enquadramentoDados.enquadrar_flag_insercao_byte(dados)
-        elif tipo == "Inserção de Bits":
-            return enquadramentoDados.enquadrar_flag_insercao_bit(dados)
-        else:
-            return dados
+        enquadrar, _ = ENQUADRAMENTOS.get(tipo, ENQUADRAMENTOS["Nenhum"])
+        return enquadrar(dados)
 
     def desenquadrar(self, dados: bytes, tipo: str) -> bytes:
         """
         Desenquadra a mensagem transmitida
         """
+        _, desenquadrar = ENQUADRAMENTOS.get(tipo, ENQUADRAMENTOS["Nenhum"])
+        return desenquadrar(dados)
+
+    # ---------------------------------------------------------------- buffers
+    # Mesmo fluxo dos métodos acima, mas sobre um BufferQuadro: trailers e
+    # cabeçalhos são gravados na reserva do buffer e, na recepção, removidos
+    # movendo as bordas da janela. Os tipos que transformam os dados inteiros
+    # (Hamming, convolucional, inserção de bits, inserção de bytes com flags
+    # ou escapes na carga) caem nas funções acima e trocam o conteúdo do buffer.
+
+    def aplicar_deteccao_correcao_buffer(self, quadro: BufferQuadro, tipo: str) -> BufferQuadro:
+        trailer = TRAILERS.get(tipo)
+        if trailer is not None:
+            return quadro.anexar(trailer[1](quadro.dados()))
+        if tipo not in CONTROLES_ERRO or tipo == "Nenhum":
+            return quadro
+        return quadro.substituir(self.aplicar_deteccao_correcao(quadro.tobytes(), tipo))
+
+    def verificar_deteccao_correcao_buffer(self, quadro: BufferQuadro, tipo: str) -> BufferQuadro:
+        """
+        Verifica o quadro; o trailer é removido sem copiar os dados.
+        Erros detectados propagam como ValueError (com a mesma mensagem de
+        verificar_deteccao_correcao).
+        """
+        trailer = TRAILERS.get(tipo)
+        if trailer is not None and len(quadro) >= trailer[0]:
+            tamanho, _, verificar = trailer
+            dados = quadro.dados()
+            if verificar(dados[:-tamanho], dados[-tamanho:]):
+                quadro.remover_cauda(tamanho)
+                return quadro
+            # Erro detectado: o caminho original levanta a exceção com a mensagem de sempre
+        if tipo not in CONTROLES_ERRO or tipo == "Nenhum":
+            return quadro
+        return quadro.substituir(self.verificar_deteccao_correcao(quadro.tobytes(), tipo))
+
+    def enquadrar_buffer(self, quadro: BufferQuadro, tipo: str) -> BufferQuadro:
         if tipo == "Contagem de Caracteres":
-            return enquadramentoDados.desenquadrar_contagem_caracteres(dados)
-        elif tipo == "Inserção de Bytes":
-            return enquadramentoDados.desenquadrar_flag_insercao_byte(dados)
-        elif tipo == "Inserção de Bits":
-            return enquadramentoDados.desenquadrar_flag_insercao_bit(dados)
-        else:
-            return dados
\ No newline at end of file
+            return quadro.prefixar(enquadramentoDados.cabecalho_contagem(len(quadro)))
+        if tipo == "Inserção de Bytes" and quadro.encontrar(enquadramentoDados.FLAG) < 0 \
+                and quadro.encontrar(enquadramentoDados.ESC) < 0:
+            # Nada a escapar: só as flags nas pontas
+            return quadro.prefixar(enquadramentoDados.FLAG).anexar(enquadramentoDados.FLAG)
+        if tipo not in ENQUADRAMENTOS or tipo == "Nenhum":
+            return quadro
+        return quadro.substituir(self.enquadrar(quadro.tobytes(), tipo))
+
+    def desenquadrar_buffer(self, quadro: BufferQuadro, tipo: str) -> BufferQuadro:
+        if tipo == "Contagem de Caracteres":
+            inicio, fim = enquadramentoDados.limites_contagem(quadro.dados())
+            return quadro.limitar(inicio, fim)
+        if tipo == "Inserção de Bytes":
+            dados = quadro.dados()
+            flag = enquadramentoDados.FLAG[0]
+            if len(dados) >= 2 and dados[0] == flag and dados[-1] == flag \
+                    and quadro.encontrar(enquadramentoDados.ESC) < 0:
+                return quadro.limitar(1, len(dados) - 1)
+        if tipo not in ENQUADRAMENTOS or tipo == "Nenhum":
+            return quadro
+        return quadro.substituir(self.desenquadrar(quadro.tobytes(), tipo))
+
+    # ---------------------------------------------------------------- lotes
+    # Versões para N quadros de uma vez ('quadros' é uma lista de bytes ou uma
+    # matriz uint8 com um quadro por linha). Os quadros de mesmo tamanho passam
+    # juntos pelas funções de CONTROLES_ERRO_LOTE; os tipos sem versão em lote
+    # são resolvidos uma vez e aplicados quadro a quadro.
+
+    def aplicar_deteccao_correcao_lote(self, quadros, tipo: str) -> list:
+        """
+        Retorna:
+        • list[bytes]: O quadro protegido de cada entrada, na mesma ordem.
+        """
+        if tipo not in CONTROLES_ERRO_LOTE:
+            aplicar, _ = CONTROLES_ERRO.get(tipo, CONTROLES_ERRO["Nenhum"])
+            return [aplicar(quadro) for quadro in _linhas(quadros)]
+
+        aplicar_lote, _ = CONTROLES_ERRO_LOTE[tipo]
+        saida = [None] * len(quadros)
+        for indices, matriz in _agrupar_por_tamanho(quadros):
+            for indice, linha in zip(indices, aplicar_lote(matriz)):
+                saida[indice] = linha.tobytes()
+        return saida
+
+    def verificar_deteccao_correcao_lote(self, quadros, tipo: str) -> list:
+        """
+        Retorna:
+        • list[bytes | None]: Os dados de cada quadro, ou None onde o controle
+          de erro detectou falha (em vez de levantar ValueError).
+        """
+        _, verificar = CONTROLES_ERRO.get(tipo, CONTROLES_ERRO["Nenhum"])
+        if tipo not in CONTROLES_ERRO_LOTE:
+            return [_ou_none(verificar, quadro) for quadro in _linhas(quadros)]
+
+        _, verificar_lote = CONTROLES_ERRO_LOTE[tipo]
+        saida = [None] * len(quadros)
+        for indices, matriz in _agrupar_por_tamanho(quadros):
+            dados, validos = verificar_lote(matriz)
+            for indice, linha, valido, quadro in zip(indices, dados, validos, matriz):
+                # Os recusados no lote são refeitos um a um: o resultado é sempre o de verificar()
+                saida[indice] = linha.tobytes() if valido else _ou_none(verificar, quadro.tobytes())
+        return saida
+
+    def enquadrar_lote(self, quadros, tipo: str) -> list:
+        enquadrar, _ = ENQUADRAMENTOS.get(tipo, ENQUADRAMENTOS["Nenhum"])
+        return [enquadrar(quadro) for quadro in _linhas(quadros)]
+
+    def desenquadrar_lote(self, quadros, tipo: str) -> list:
+        """
+        Retorna:
+        • list[bytes | None]: A carga de cada quadro, ou None se o enquadramento for inválido.
+        """
+        _, desenquadrar = ENQUADRAMENTOS.get(tipo, ENQUADRAMENTOS["Nenhum"])
+        return [_ou_none(desenquadrar, quadro) for quadro in _linhas(quadros)]
+
+    def segmentar(self, mensagem: bytes, tipo_erro: str = "Nenhum", tipo_enquadramento: str = "Nenhum") -> list:
+        """
+        Divide a mensagem em segmentos que cabem na MTU e aplica a cada um o
+        controle de erro e o enquadramento.
+
+        Retorna:
+        • list[bytes]: Um quadro por segmento, prontos para a camada física.
+        """
+        segmentos = self.segmentador.segmentar(mensagem)
+        return self.enquadrar_lote(self.aplicar_deteccao_correcao_lote(segmentos, tipo_erro), tipo_enquadramento)
+
+    def remontar(self, quadro: bytes, tipo_erro: str = "Nenhum", tipo_enquadramento: str = "Nenhum"):
+        """
+        Desenquadra e verifica um quadro recebido e o entrega ao remontador.
+
+        Retorna:
+        • bytes | None: A mensagem completa quando este quadro a fecha.
+        Erros detectados no quadro propagam como ValueError.
+        """
+        quadro = BufferQuadro.recebido(quadro)
+        self.verificar_deteccao_correcao_buffer(self.desenquadrar_buffer(quadro, tipo_enquadramento), tipo_erro)
+        return self.remontador.receber(quadro.dados())
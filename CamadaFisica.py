@@ -1,19 +1,60 @@
+from collections import OrderedDict
+from functools import partial
+
 import numpy as np
 import matplotlib.pyplot as plt
 
+# ============================ AMOSTRAS ============================
+def como_amostras(sinal):
+    """
+    Converte o sinal para um array de ponto flutuante sem copiar quando ele
+    já é float32/float64; qualquer outro tipo vira float64.
+    """
+    sinal = np.asarray(sinal)
+    if sinal.dtype not in (np.float32, np.float64):
+        sinal = sinal.astype(np.float64)
+    return sinal.reshape(-1)
+
+
+def blocos_de_simbolos(sinal, amostras_por_simbolo):
+    """
+    Reorganiza o sinal recebido em uma matriz (n_simbolos, amostras_por_simbolo).
+    Amostras que não completam um símbolo no final são descartadas.
+    """
+    sinal = como_amostras(sinal)
+    n_simbolos = len(sinal) // amostras_por_simbolo
+    return sinal[:n_simbolos * amostras_por_simbolo].reshape(n_simbolos, amostras_por_simbolo)
+
+
+def _blocos_de_saida(out, n_simbolos, amostras_por_simbolo):
+    """
+    Valida o buffer 'out' fornecido pelo chamador e devolve uma visão
+    (n_simbolos, amostras_por_simbolo) dele, para escrita no próprio buffer.
+    """
+    if out.ndim != 1 or len(out) != n_simbolos * amostras_por_simbolo:
+        raise ValueError(f"Buffer de saída deve ter {n_simbolos * amostras_por_simbolo} amostras, recebido {out.shape}")
+    if not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError("Buffer de saída deve ser contíguo e gravável")
+    return out.reshape(n_simbolos, amostras_por_simbolo)
+
+
+def _repetir_niveis(niveis, amostras_por_bit, dtype, out):
+    # Equivale a np.repeat(niveis, amostras_por_bit), mas pode escrever em 'out'
+    if out is None:
+        return np.repeat(niveis.astype(dtype, copy=False), amostras_por_bit)
+    _blocos_de_saida(out, len(niveis), amostras_por_bit)[:] = niveis[:, np.newaxis]
+    return out
+
 # =========================== NRZ POLAR ===========================
-def codificador_nrz_polar(bits, amostras_por_bit=10):
+def codificador_nrz_polar(bits, amostras_por_bit=10, dtype=np.float64, out=None):
     bits = np.array(bits, dtype=int)
     niveis = np.where(bits == 1, 1.0, -1.0)
-    sinal = np.repeat(niveis, amostras_por_bit)
+    sinal = _repetir_niveis(niveis, amostras_por_bit, dtype, out)
     return sinal
 
 
 def decodificador_nrz_polar(sinal, amostras_por_bit=10):
-    sinal = np.array(sinal, dtype=float)
-    n_bits = len(sinal) // amostras_por_bit
-
-    blocos = sinal[:n_bits * amostras_por_bit].reshape(n_bits, amostras_por_bit)
+    blocos = blocos_de_simbolos(sinal, amostras_por_bit)
     bits = (blocos.mean(axis=1) > 0).astype(int)
 
     return bits
@@ -34,36 +75,32 @@ def plotagem_nrz(bits, amostras_por_bit=10):
 
 
 # =========================== MANCHESTER ===========================
-def codificador_manchester(bits, amostras_por_bit=10):
+def codificador_manchester(bits, amostras_por_bit=10, dtype=np.float64, out=None):
     bits = np.array(bits, dtype=int)
     meio = amostras_por_bit // 2
-    sinal = []
-
-    for bit in bits:
-        # Se o bit for 1, o sinal vai ser 1.0, 1.0, -1.0, -1.0
-        if bit == 1:
-            sinal.extend([1.0] * meio )
-            sinal.extend([-1.0] * meio )
-        # Se o bit for 0, o sinal vai ser -1.0, -1.0, 1.0, 1.0
-        else:
-            sinal.extend([ -1.0 ] * meio)
-            sinal.extend([ 1.0 ] * meio)
+    if out is not None:
+        dtype = out.dtype
+
+    # Molde de um bit 1: primeira metade em 1.0 e segunda em -1.0.
+    # O bit 0 é o mesmo molde invertido (-1.0, -1.0, 1.0, 1.0)
+    molde = np.concatenate((np.ones(meio, dtype=dtype), -np.ones(meio, dtype=dtype)))
+    polaridade = np.where(bits == 1, 1.0, -1.0).astype(dtype)
 
-    return np.array(sinal)
+    # Produto externo: cada linha é um bit já expandido em amostras
+    if out is None:
+        return np.outer(polaridade, molde).reshape(-1)
+
+    np.multiply.outer(polaridade, molde, out=_blocos_de_saida(out, len(bits), 2 * meio))
+    return out
 
 def decodificador_manchester(sinal, amostras_por_bit=10):
-    sinal = np.array(sinal, dtype=float)
     meio = amostras_por_bit // 2
-    n_bits = len(sinal) // amostras_por_bit
-
-    bits = []
 
-    for i in range(n_bits):
-        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
-        primeira_metade = bloco[:meio]
-        bits.append(1 if primeira_metade.mean() > 0 else 0)
+    # Cada linha é um bit; basta olhar a média da primeira metade
+    blocos = blocos_de_simbolos(sinal, amostras_por_bit)
+    bits = (blocos[:, :meio].mean(axis=1) > 0).astype(int)
 
-    return np.array(bits)
+    return bits
 
 def plotagem_manchester(bits, amostras_por_bit=10):
     sinal = codificador_manchester(bits, amostras_por_bit)
@@ -78,39 +115,25 @@ def plotagem_manchester(bits, amostras_por_bit=10):
     plt.show()
 
 # ============================ BIPOLAR =============================
-def codificador_bipolar(bits, amostras_por_bit=10):
+def codificador_bipolar(bits, amostras_por_bit=10, dtype=np.float64, out=None):
     bits = np.array(bits, dtype=int)
-    sinal = []
 
-    ultimo_pulso = -1
+    # AMI: os bits 1 alternam de polaridade. A paridade da contagem acumulada
+    # de 1s diz se o pulso é o 1º, 3º, 5º... (+1) ou o 2º, 4º, 6º... (-1)
+    contagem_uns = np.cumsum(bits == 1)
+    pulsos = np.where(contagem_uns % 2 == 1, 1.0, -1.0)
+    niveis = np.where(bits == 1, pulsos, 0.0)
 
-    for bit in bits:
-        if bit == 1:
-            ultimo_pulso = -ultimo_pulso
-            sinal.extend([ultimo_pulso] * amostras_por_bit)
-        else:
-            sinal.extend([0.0] * amostras_por_bit)
-
-    return np.array(sinal)
+    sinal = _repetir_niveis(niveis, amostras_por_bit, dtype, out)
+    return sinal
 
 def decodificador_bipolar(sinal, amostras_por_bit=10):
+    # Bloco com média próxima de zero é 0, qualquer pulso (+ ou -) é 1
+    blocos = blocos_de_simbolos(sinal, amostras_por_bit)
+    media = blocos.mean(axis=1)
+    bits = np.where(np.abs(media) < 0.1, 0, 1)
 
-    sinal = np.array(sinal, dtype=float)
-    n_bits = len(sinal) // amostras_por_bit
-
-    bits = []
-
-    for i in range(n_bits):
-        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
-        
-        media = bloco.mean()
-
-        if abs(media) < 0.1:
-            bits.append(0)
-        else:
-            bits.append(1)
-
-    return np.array(bits)
+    return bits
 
 def plotagem_bipolar(bits, amostras_por_bit=10):
     sinal = codificador_bipolar(bits, amostras_por_bit)
@@ -128,93 +151,439 @@ def plotagem_bipolar(bits, amostras_por_bit=10):
 #                           ANALÓGICOS
 # ==================================================================
 
+# ================= CACHE DE FORMAS DE ONDA (LRU) ==================
+class CacheFormasDeOnda:
+    """
+    Cache LRU de formas de onda pré-calculadas (portadoras, bancos de
+    referência e tabelas de símbolos), limitado por um orçamento de memória.
+
+    As tabelas devolvidas são somente leitura, para que possam ser
+    compartilhadas entre todas as chamadas de modulação e demodulação.
+    """
+
+    def __init__(self, orcamento_bytes=64 * 1024 * 1024):
+        self.orcamento_bytes = orcamento_bytes
+        self._tabelas = OrderedDict()
+        self.bytes_em_uso = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def obter(self, chave, gerar):
+        """
+        Devolve a tabela associada a 'chave', chamando gerar() apenas em caso de falha.
+        """
+        tabela = self._tabelas.get(chave)
+        if tabela is not None:
+            self._tabelas.move_to_end(chave)
+            self.acertos += 1
+            return tabela
+
+        self.falhas += 1
+        tabela = np.ascontiguousarray(gerar())
+        tabela.setflags(write=False)
+
+        # Tabelas maiores que o orçamento inteiro são usadas, mas não guardadas
+        if tabela.nbytes > self.orcamento_bytes:
+            return tabela
+
+        self._tabelas[chave] = tabela
+        self.bytes_em_uso += tabela.nbytes
+
+        # Remove as menos usadas recentemente até voltar ao orçamento
+        while self.bytes_em_uso > self.orcamento_bytes:
+            _, antiga = self._tabelas.popitem(last=False)
+            self.bytes_em_uso -= antiga.nbytes
+            self.remocoes += 1
+
+        return tabela
+
+    def limpar(self):
+        self._tabelas.clear()
+        self.bytes_em_uso = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.remocoes = 0
+
+    def estatisticas(self):
+        return {
+            "entradas": len(self._tabelas),
+            "bytes_em_uso": self.bytes_em_uso,
+            "orcamento_bytes": self.orcamento_bytes,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "remocoes": self.remocoes,
+        }
+
+
+cache_formas_de_onda = CacheFormasDeOnda()
+
+
+def portadora(fc, fase=0.0, amostras_por_simbolo=10, dtype=np.float64):
+    """
+    Portadora sin(2π·fc·t + fase) de um símbolo, com t em [0, 1).
+    A tabela vem do cache compartilhado e não pode ser modificada.
+    """
+    dtype = np.dtype(dtype)
+
+    def gerar():
+        # cria um array t de números começando em 0 e indo até 1 (0 <= x < 1) com [amostras_por_simbolo] amostras
+        t = np.linspace(0, 1, amostras_por_simbolo, endpoint=False)
+        return np.sin(2 * np.pi * fc * t + fase).astype(dtype)
+
+    return cache_formas_de_onda.obter(("portadora", fc, fase, amostras_por_simbolo, dtype), gerar)
+
+
+# ===================== BANCO DE CORRELATORES ======================
+def correlacionar_banco(sinal, banco, amostras_por_simbolo):
+    """
+    Correlaciona todos os símbolos do sinal com todas as referências de uma vez.
+
+    Parâmetros:
+    • sinal: Amostras recebidas.
+    • banco: Matriz (n_referencias, amostras_por_simbolo), uma forma de onda por linha.
+    • amostras_por_simbolo (int): Amostras de cada símbolo.
+
+    Retorna:
+    • np.ndarray: Matriz (n_simbolos, n_referencias) em que o elemento [i, k]
+      equivale a np.sum(bloco_i * banco[k]).
+    """
+    blocos = blocos_de_simbolos(sinal, amostras_por_simbolo)
+    # O banco acompanha o dtype do sinal para não promover float32 a float64
+    return blocos @ np.asarray(banco, dtype=blocos.dtype).T
+
+
+def _selecionar_simbolos(tabela, indices, out=None):
+    """
+    Concatena as linhas tabela[indices] (uma forma de onda por símbolo).
+    Com 'out', escreve diretamente no buffer do chamador.
+    """
+    if out is None:
+        return tabela[indices].reshape(-1)
+    np.take(tabela, indices, axis=0, out=_blocos_de_saida(out, len(indices), tabela.shape[1]))
+    return out
+
 # ================== AMPLITUDE SHIFT KEYING (ASK) ==================
-def modulador_ask(bits, fc=2000, A_1 = 1.0, A_0 = 0.0, amostras_por_bit=10):
+def modulador_ask(bits, fc=2000, A_1 = 1.0, A_0 = 0.0, amostras_por_bit=10, dtype=np.float64, out=None):
     bits = np.array(bits, dtype=int)
-    
-    # cria um array t de números começanmdo em 0 e indo ate 1 (0 <= x < 1)com 50 = [amostras_por_bit] amostras
-    t = np.linspace(0, 1, amostras_por_bit, endpoint=False)
-    sinal = []
-
-    for bit in bits:
-        if bit == 1:
-            A = A_1  
-        else:
-            A = A_0
+    dtype = np.dtype(out.dtype if out is not None else dtype)
 
-        # gera a portadora no trecho de tempo com a amplitude A
-        portadora = A * np.sin(2 * np.pi *fc * t)
-        sinal.extend(portadora)
+    # Tabela de símbolos: linha 0 -> portadora com amplitude A_0, linha 1 -> com A_1
+    def gerar():
+        return np.outer([A_0, A_1], portadora(fc, 0.0, amostras_por_bit)).astype(dtype)
 
-    return np.array(sinal)
+    tabela = cache_formas_de_onda.obter(("ask", fc, A_0, A_1, amostras_por_bit, dtype), gerar)
 
-def demodulador_ask(sinal, fc=2000, amostras_por_bit=10):
-    # cria um array t de números começanmdo em 0 e indo ate 1 (0 <= x < 1)com 50 = [amostras_por_bit] amostras
-    t = np.linspace(0, 1, amostras_por_bit, endpoint=False)
-    
+    # Cada bit seleciona a sua linha; o reshape concatena os símbolos
+    return _selecionar_simbolos(tabela, (bits == 1).astype(int), out)
+
+def demodulador_ask(sinal, fc=2000, amostras_por_bit=10, A_1=1.0, A_0=0.0, suave=False, sigma=1.0):
     # formula da onda portadora de referência
-    portadora = np.sin(2 * np.pi *fc * t)
-
-    # Calcula quantos bits tem no sinal modulado
-    n_bits = len(sinal) // amostras_por_bit
-    
-    bits = []
-
-    for i in range(n_bits):
-        # pega cada bloco ou trecho do sinal e calcula a correlação. sinal[inicio:fim]
-        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
-        correlacao = np.sum(bloco * portadora)
-
-        # Se a correlação for maior que zero, o bit é 1, isto significa que os sinais estão em fase
-        # caso contrário, o bit é 0, isto significa que os sinais estao fora de fase
-        if correlacao > 0:
-            bits.append(1)
-        else:
-            bits.append(0)
+    referencia = portadora(fc, 0.0, amostras_por_bit)
+    energia = float(referencia @ referencia)
+
+    # Correlação de todos os blocos com a portadora em um único produto matricial
+    correlacao = correlacionar_banco(sinal, referencia[np.newaxis, :], amostras_por_bit)[:, 0]
+
+    # Sem ruído a correlação vale A_b·E; com ruído de desvio σ por amostra ela
+    # tem variância σ²·E, e o LLR log(P(0)/P(1)) fica
+    # (A_1 - A_0)·((A_1 + A_0)·E - 2·correlação) / (2σ²)
+    llr = (A_1 - A_0) * ((A_1 + A_0) * energia - 2 * correlacao) / (2 * sigma ** 2)
+    if suave:
+        return llr
 
-    return np.array(bits)
+    # O bit é 1 quando a correlação passa do ponto médio entre A_0·E e A_1·E
+    return (llr < 0).astype(int)
 
 # ================== FREQUENCY SHIFT KEYING (FSK) ==================
-def modulador_fsk(bits, f_1 = 1000, f_0 = 2000, amostras_por_bit=10):
+def _banco_fsk(f_1, f_0, amostras_por_bit, dtype=np.float64):
+    dtype = np.dtype(dtype)
+
+    # Linha 0 -> portadora de f_0, linha 1 -> portadora de f_1
+    def gerar():
+        return np.vstack((portadora(f_0, 0.0, amostras_por_bit, dtype), portadora(f_1, 0.0, amostras_por_bit, dtype)))
+
+    return cache_formas_de_onda.obter(("fsk", f_1, f_0, amostras_por_bit, dtype), gerar)
+
+def modulador_fsk(bits, f_1 = 1000, f_0 = 2000, amostras_por_bit=10, dtype=np.float64, out=None):
     bits = np.array(bits, dtype=int)
-    
-    # cria um array t de números commencendo em 0 e indo ate 1 (0 <= x < 1)com 50 = [amostras_por_bit] amostras
-    t = np.linspace(0, 1, amostras_por_bit, endpoint=False)
-    sinal = []
-
-    for bit in bits:
-        if bit == 1:
-            f = f_1
-        else:
-            f = f_0
+    tabela = _banco_fsk(f_1, f_0, amostras_por_bit, out.dtype if out is not None else dtype)
+    return _selecionar_simbolos(tabela, (bits == 1).astype(int), out)
+
+def demodulador_fsk (sinal, f_1 = 1000, f_0 = 2000, amostras_por_bit=10, suave=False, sigma=1.0):
+    # Coluna 0 -> correlação com f_0, coluna 1 -> correlação com f_1
+    correlacoes = correlacionar_banco(sinal, _banco_fsk(f_1, f_0, amostras_por_bit, como_amostras(sinal).dtype), amostras_por_bit)
+
+    # Tons ortogonais de mesma energia E: cada correlação tem variância σ²·E
+    # e média E no tom enviado, o que reduz o LLR a (c_0 - c_1) / σ²
+    if suave:
+        return (correlacoes[:, 0] - correlacoes[:, 1]).astype(np.float64) / sigma ** 2
+
+    # Em caso de empate o bit é 1
+    return (correlacoes[:, 0] <= correlacoes[:, 1]).astype(int)
+
+# ==================== CONSTELAÇÕES M-PSK / M-QAM ==================
+def bits_para_simbolos(bits, bits_por_simbolo):
+    """
+    Agrupa os bits em símbolos (completando com 0 no fim) e lê cada grupo como inteiro, MSB primeiro.
+    """
+    bits = np.asarray(bits, dtype=np.int64).reshape(-1)
+    resto = len(bits) % bits_por_simbolo
+    if resto != 0:
+        bits = np.concatenate((bits, np.zeros(bits_por_simbolo - resto, dtype=np.int64)))
+    pesos = 1 << np.arange(bits_por_simbolo - 1, -1, -1)
+    return bits.reshape(-1, bits_por_simbolo) @ pesos
+
+
+def simbolos_para_bits(simbolos, bits_por_simbolo):
+    """
+    Operação inversa de bits_para_simbolos(): devolve os bits de cada símbolo, concatenados.
+    """
+    simbolos = np.asarray(simbolos, dtype=np.int64)
+    pesos = 1 << np.arange(bits_por_simbolo - 1, -1, -1)
+    return ((simbolos[:, np.newaxis] & pesos) != 0).astype(int).reshape(-1)
+
+
+def _gray_para_binario(g):
+    # Inverte o código Gray (vetorizado): b = g ^ (g >> 1) ^ (g >> 2) ^ ...
+    b = np.array(g, dtype=np.int64)
+    deslocamento = b >> 1
+    while np.any(deslocamento):
+        b ^= deslocamento
+        deslocamento >>= 1
+    return b
+
+
+def _base_iq(fc, amostras_por_simbolo):
+    # Portadoras de referência: linha 0 -> cos, linha 1 -> sen
+    def gerar():
+        return np.vstack((portadora(fc, np.pi / 2, amostras_por_simbolo), portadora(fc, 0.0, amostras_por_simbolo)))
+
+    return cache_formas_de_onda.obter(("iq", fc, amostras_por_simbolo), gerar)
+
+
+class Constelacao:
+    """
+    Constelação com mapeamento Gray. O símbolo é o grupo de bits lido como
+    inteiro (MSB primeiro) e pontos[simbolo] = (I, Q), sendo o sinal de cada
+    símbolo I·cos(2π·fc·t) + Q·sen(2π·fc·t).
+    """
+
+    def __init__(self, nome, pontos):
+        self.nome = nome
+        self.pontos = np.asarray(pontos, dtype=float)
+        self.pontos.setflags(write=False)
+        self.ordem = len(self.pontos)
+        self.bits_por_simbolo = int(np.log2(self.ordem))
+        if 2 ** self.bits_por_simbolo != self.ordem:
+            raise ValueError(f"Ordem da constelação deve ser potência de 2: {self.ordem}")
+
+        # Energia de cada ponto, usada na busca do ponto mais próximo
+        self._energias = (self.pontos ** 2).sum(axis=1)
+
+        # Máscara (bits_por_simbolo, ordem): o bit k do rótulo de cada ponto é 1
+        self._bit_um = simbolos_para_bits(np.arange(self.ordem), self.bits_por_simbolo).reshape(
+            self.ordem, self.bits_por_simbolo).T.astype(bool)
+
+    @classmethod
+    def psk(cls, ordem, nome=None):
+        """
+        M-PSK: o ponto na posição k do círculo recebe o rótulo Gray k ^ (k >> 1)
+        e a fase (2k + 1)·π/M, isto é, sen(2π·fc·t + fase).
+        """
+        posicoes = np.arange(ordem)
+        rotulos = posicoes ^ (posicoes >> 1)
+        fases = np.empty(ordem)
+        fases[rotulos] = (2 * posicoes + 1) * np.pi / ordem
 
-        portadora = np.sin(2 * np.pi * f * t)
-        sinal.extend(portadora)
+        # sen(ωt + φ) = sen(φ)·cos(ωt) + cos(φ)·sen(ωt)
+        return cls(nome or f"{ordem}PSK", np.column_stack((np.sin(fases), np.cos(fases))))
 
-    return np.array(sinal)
+    @classmethod
+    def qam(cls, ordem, nome=None):
+        """
+        M-QAM quadrada: a primeira metade dos bits escolhe Q (de +L a -L) e a
+        segunda metade escolhe I (de -L a +L), cada uma em código Gray, com
+        níveis ímpares ±1, ±3, ..., ±L.
+        """
+        bits_por_eixo = int(np.log2(ordem)) // 2
+        niveis_por_eixo = 1 << bits_por_eixo
+        if niveis_por_eixo ** 2 != ordem:
+            raise ValueError(f"QAM quadrada exige ordem 4^k: {ordem}")
 
-def demodulador_fsk (sinal, f_1 = 1000, f_0 = 2000, amostras_por_bit=10):
-    t = np.linspace(0, 1, amostras_por_bit, endpoint=False)
-    portadora_0 = np.sin(2 * np.pi * f_0 * t)
-    portadora_1 = np.sin(2 * np.pi * f_1 * t)
+        simbolos = np.arange(ordem)
+        nivel_q = _gray_para_binario(simbolos >> bits_por_eixo)
+        nivel_i = _gray_para_binario(simbolos & (niveis_por_eixo - 1))
 
-    n_bits = len(sinal) // amostras_por_bit
+        I = 2 * nivel_i - (niveis_por_eixo - 1)
+        Q = (niveis_por_eixo - 1) - 2 * nivel_q
+        return cls(nome or f"{ordem}QAM", np.column_stack((I, Q)))
 
-    bits = []
+    def indices(self, bits):
+        """
+        Agrupa os bits em símbolos (completando com 0 no fim) e devolve o índice de cada um.
+        """
+        return bits_para_simbolos(bits, self.bits_por_simbolo)
 
-    for i in range(n_bits):
-        bloco = sinal[i * amostras_por_bit:(i + 1) * amostras_por_bit]
-        correlacao_0 = np.sum(bloco * portadora_0)
-        correlacao_1 = np.sum(bloco * portadora_1)
+    def bits(self, indices):
+        """
+        Operação inversa de indices(): devolve os bits de cada símbolo, concatenados.
+        """
+        return simbolos_para_bits(indices, self.bits_por_simbolo)
 
-        if correlacao_0 > correlacao_1:
-            bits.append(0)
-        else:
-            bits.append(1)
+    def iq(self, bits):
+        """
+        Amplitudes (I, Q) de todos os símbolos de uma vez: matriz (n_simbolos, 2).
+        """
+        return self.pontos[self.indices(bits)]
+
+    def decidir(self, IQ):
+        """
+        Índice do ponto mais próximo de cada (I, Q) recebido.
+        |r - p|² = |r|² - 2 r·p + |p|², e |r|² não muda o argmin, então basta um produto matricial.
+        """
+        dist = self._energias - 2 * (np.asarray(IQ) @ self.pontos.T)
+        return np.argmin(dist, axis=1)
+
+    def llr(self, IQ, variancia=1.0):
+        """
+        LLR log(P(b=0)/P(b=1)) de cada bit, pela aproximação max-log:
+        (menor |r - p|² entre os pontos com o bit em 1 - menor entre os com o bit em 0) / (2·variância),
+        onde 'variancia' é a do ruído em cada eixo (I ou Q).
+
+        Retorna:
+        • np.ndarray: LLRs float64, bits_por_simbolo por símbolo, na ordem dos bits.
+        """
+        dist = self._energias - 2 * (np.asarray(IQ, dtype=np.float64) @ self.pontos.T)
+        llr = np.empty((len(dist), self.bits_por_simbolo))
+        for k, um in enumerate(self._bit_um):
+            llr[:, k] = dist[:, um].min(axis=1) - dist[:, ~um].min(axis=1)
+        return (llr / (2 * variancia)).reshape(-1)
+
+    def modular(self, bits, fc=2000, amostras_por_simbolo=50, dtype=np.float64, out=None):
+        dtype = np.dtype(out.dtype if out is not None else dtype)
+
+        # Tabela de símbolos: linha k = I_k * cos + Q_k * sen
+        def gerar():
+            return (self.pontos @ _base_iq(fc, amostras_por_simbolo)).astype(dtype)
+
+        tabela = cache_formas_de_onda.obter((self.nome, fc, amostras_por_simbolo, dtype), gerar)
+        return _selecionar_simbolos(tabela, self.indices(bits), out)
+
+    def demodular(self, sinal, fc=2000, amostras_por_simbolo=50, suave=False, sigma=1.0):
+        # Banco de projeção: a pseudo-inversa da base [cos, sen] devolve diretamente
+        # as amplitudes (I, Q) de cada símbolo, na mesma escala dos pontos
+        def gerar():
+            return np.linalg.pinv(_base_iq(fc, amostras_por_simbolo)).T
+
+        banco = cache_formas_de_onda.obter(("iq_projecao", fc, amostras_por_simbolo), gerar)
+        IQ = correlacionar_banco(sinal, banco, amostras_por_simbolo)
+
+        if suave:
+            # Cada projeção soma as amostras com pesos 'banco', então o ruído
+            # nela tem variância σ²·Σ banco² (média dos eixos I e Q)
+            variancia = sigma ** 2 * float(np.mean(np.sum(banco ** 2, axis=1)))
+            return self.llr(IQ, variancia)
+        return self.bits(self.decidir(IQ))
+
+
+CONSTELACOES = {
+    "BPSK": Constelacao.psk(2, "BPSK"),
+    "QPSK": Constelacao.psk(4, "QPSK"),
+    "8PSK": Constelacao.psk(8),
+    "16QAM": Constelacao.qam(16),
+    "64QAM": Constelacao.qam(64),
+    "256QAM": Constelacao.qam(256),
+}
+
+# ================== M-ARY FREQUENCY SHIFT KEYING (M-FSK) ==========
+# Nome -> número de tons
+TIPOS_MFSK = {
+    "4FSK": 4,
+    "8FSK": 8,
+    "16FSK": 16,
+}
 
-    return np.array(bits)
+def frequencias_mfsk(M, f_base=1, espacamento=1):
+    """
+    Tons do M-FSK em ciclos por símbolo: o símbolo k usa f_base + k·espacamento.
+    """
+    return f_base + espacamento * np.arange(M)
+
+def _banco_mfsk(M, f_base, espacamento, amostras_por_simbolo, dtype=np.float64):
+    dtype = np.dtype(dtype)
+
+    # Linha k -> tom do símbolo k
+    def gerar():
+        return np.vstack([portadora(f, 0.0, amostras_por_simbolo, dtype)
+                          for f in frequencias_mfsk(M, f_base, espacamento)])
+
+    return cache_formas_de_onda.obter(("mfsk", M, f_base, espacamento, amostras_por_simbolo, dtype), gerar)
+
+def modulador_mfsk(bits, M=4, f_base=1, espacamento=1, amostras_por_simbolo=50, dtype=np.float64, out=None):
+    bits_por_simbolo = int(np.log2(M))
+    tabela = _banco_mfsk(M, f_base, espacamento, amostras_por_simbolo, out.dtype if out is not None else dtype)
+    return _selecionar_simbolos(tabela, bits_para_simbolos(bits, bits_por_simbolo), out)
+
+def validar_tons_mfsk(M, f_base, espacamento, amostras_por_simbolo):
+    """
+    Levanta ValueError se algum tom ficar fora de (0, amostras_por_simbolo / 2)
+    ciclos por símbolo: a partir daí o tom não tem bin na FFT do bloco e a
+    portadora amostrada sofre aliasing.
+
+    Retorna:
+    • np.ndarray: Os tons (frequencias_mfsk).
+    """
+    frequencias = frequencias_mfsk(M, f_base, espacamento)
+    nyquist = amostras_por_simbolo / 2
+    if frequencias.min() <= 0 or frequencias.max() >= nyquist:
+        raise ValueError(f"Tons do {M}-FSK de {frequencias.min():g} a {frequencias.max():g} ciclos por símbolo "
+                         f"fora de (0, {nyquist:g}) com {amostras_por_simbolo} amostras por símbolo")
+    return frequencias
+
+def _referencias_mfsk(M, f_base, espacamento, amostras_por_simbolo, dtype=np.float64):
+    """
+    Correlatores dos tons fracionários, (2M, amostras): as M primeiras linhas
+    são os cossenos e as M últimas os senos de cada tom.
+    """
+    dtype = np.dtype(dtype)
+
+    def gerar():
+        t = np.linspace(0, 1, amostras_por_simbolo, endpoint=False)
+        argumento = 2 * np.pi * frequencias_mfsk(M, f_base, espacamento)[:, np.newaxis] * t
+        return np.vstack((np.cos(argumento), np.sin(argumento))).astype(dtype)
+
+    return cache_formas_de_onda.obter(("mfsk_ref", M, f_base, espacamento, amostras_por_simbolo, dtype), gerar)
+
+def _energias_mfsk(blocos, M, f_base, espacamento):
+    """
+    Energia de cada tom em cada símbolo, sem depender da fase (detecção não coerente).
+
+    Com tons inteiros (ciclos por símbolo), cada tom cai exatamente num bin da
+    FFT real do bloco, então uma única rfft por símbolo mede todos os tons e o
+    custo quase não cresce com M. Para tons fracionários, usa um banco de
+    correlatores cos/sen (o mesmo que um banco de filtros de Goertzel), do cache.
+    """
+    frequencias = frequencias_mfsk(M, f_base, espacamento)
+    if np.all(frequencias == np.round(frequencias)):
+        espectro = np.fft.rfft(blocos, axis=1)[:, frequencias.astype(int)]
+        return espectro.real ** 2 + espectro.imag ** 2
+
+    dtype = blocos.dtype if np.issubdtype(blocos.dtype, np.floating) else np.float64
+    projecoes = blocos @ _referencias_mfsk(M, f_base, espacamento, blocos.shape[1], dtype).T
+    return projecoes[:, :M] ** 2 + projecoes[:, M:] ** 2
+
+def demodulador_mfsk(sinal, M=4, f_base=1, espacamento=1, amostras_por_simbolo=50):
+    validar_tons_mfsk(M, f_base, espacamento, amostras_por_simbolo)
+    bits_por_simbolo = int(np.log2(M))
+    blocos = blocos_de_simbolos(sinal, amostras_por_simbolo)
+
+    # O tom de maior energia decide o símbolo
+    energias = _energias_mfsk(blocos, M, f_base, espacamento)
+    return simbolos_para_bits(np.argmax(energias, axis=1), bits_por_simbolo)
 
 # ================== QUADRATURE PHASE SHIFT KEYING (QPSK) ==========
+# Mapa de referência; CONSTELACOES["QPSK"] gera exatamente estas fases
 mapa_fase_qpsk = {
     (0, 0): np.pi / 4,   # 45°
     (0, 1): 3*np.pi / 4, # 135°
@@ -222,59 +591,14 @@ mapa_fase_qpsk = {
     (1, 0): 7*np.pi / 4  # 315°
 }
 
-def  modulador_qpsk(bits, fc=2000, amostras_por_bit=10):
-    bits = np.array(bits, dtype=int)
-
-    # Garante que o número de bits seja multiplo de 2
-    if len(bits) % 2 != 0:
-        bits = np.append(bits, [0])
-    
-    t = np.linspace(0, 1, amostras_por_bit, endpoint=False)
-    sinal = []
-
-    for i in range(0, len(bits), 2):
-        par = (bits[i], bits[i + 1])
-        fase = mapa_fase_qpsk[par]
-        portadora = np.sin(2 * np.pi * fc * t + fase)
-        sinal.extend(portadora)
-
-    return np.array(sinal)
-
-def demodulador_qpsk(sinal, fc=2000, amostras_por_simbolo=50):
-    # Preciso implemenar corretamente
-    # Gera vetor de tempo
-    t = np.linspace(0, 1, amostras_por_simbolo, endpoint=False)
-    
-    # Verifica quantos símbolos existem no sinal
-    n_simbolos = len(sinal) // amostras_por_simbolo
-    bits = []
+def  modulador_qpsk(bits, fc=2000, amostras_por_bit=10, dtype=np.float64, out=None):
+    return CONSTELACOES["QPSK"].modular(bits, fc, amostras_por_bit, dtype, out)
 
-    ref = {
-        (0, 0): np.sin(2*np.pi*fc*t + np.pi/4),      # 45°
-        (0, 1): np.sin(2*np.pi*fc*t + 3*np.pi/4),    # 135°
-        (1, 1): np.sin(2*np.pi*fc*t + 5*np.pi/4),    # 225°
-        (1, 0): np.sin(2*np.pi*fc*t + 7*np.pi/4)     # 315°
-    }
-    
-    for i in range(n_simbolos):
-        bloco = sinal[i * amostras_por_simbolo:(i + 1) * amostras_por_simbolo]
-
-        melhor_correlacao = None
-        melhor_bits = None
-
-        for bits_ref, onda_ref in ref.items():
-            # semelhança sinal recebido e sinal de referência
-            correlacao = np.sum(bloco * onda_ref)
-
-            if melhor_correlacao is None or correlacao > melhor_correlacao:
-                melhor_correlacao = correlacao
-                melhor_bits = bits_ref
-
-        bits.extend(melhor_bits)
-
-    return np.array(bits)
+def demodulador_qpsk(sinal, fc=2000, amostras_por_simbolo=50, suave=False, sigma=1.0):
+    return CONSTELACOES["QPSK"].demodular(sinal, fc, amostras_por_simbolo, suave, sigma)
 
 # ================== QUADRATURE AMPLITUDE MODULATION (16-QAM) ======
+# Mapa de referência; CONSTELACOES["16QAM"] gera exatamente estes pontos
 mapa_16qam = {
     (0,0,0,0): (-3,  3),
     (0,0,0,1): (-1,  3),
@@ -297,126 +621,237 @@ mapa_16qam = {
     (1,0,1,0): ( 3, -3),
 }
 
-def modulador_16qam(bits, fc=2000, amostras_por_simbolo=50):
-    bits = np.array(bits, dtype=int)
-
-    t = np.linspace(0, 1, amostras_por_simbolo, endpoint=False)
-    sinal = []
-
-    # Garante que o número de bits seja multiplo de 4, caso na seja, adiciona um 0 até ser
-    while len(bits) % 4 != 0:
-        bits = np.append(bits, 0)
-    
-    # Percorre o vetor de bits de 4 em 4. Cada bloco é um símbolo 16-QAM
-    for i in range(0, len(bits), 4):
-        # Tranforma o bloco em tupla para usar como chave no mapa
-        bloco = tuple(bits[i:i + 4])
-        # Obtem o par I, Q com as chaves obtidas no mapa
-        I, Q = mapa_16qam[bloco]
+def modulador_16qam(bits, fc=2000, amostras_por_simbolo=50, dtype=np.float64, out=None):
+    return CONSTELACOES["16QAM"].modular(bits, fc, amostras_por_simbolo, dtype, out)
 
-        # Gera as portadoras
-        portadora_I = I * np.cos(2 * np.pi * fc * t)
-        portadora_Q = Q * np.sin(2 * np.pi * fc * t)
+def demodulador_16qam(sinal, fc=2000, amostras_por_simbolo=50, suave=False, sigma=1.0):
+    return CONSTELACOES["16QAM"].demodular(sinal, fc, amostras_por_simbolo, suave, sigma)
 
-        # Gera o sinal como soma das portadoras IQ
-        s = portadora_I + portadora_Q
 
-        sinal.extend(s)
+# ===================== RESOLUÇÃO DAS MODULAÇÕES =====================
+# Nome vindo da GUI -> (codificador, decodificador) de linha
+CODIGOS_LINHA = {
+    "NRZ": (codificador_nrz_polar, decodificador_nrz_polar),
+    "Manchester": (codificador_manchester, decodificador_manchester),
+    "Bipolar": (codificador_bipolar, decodificador_bipolar),
+}
 
-    return np.array(sinal)
+# Frequências padrão em ciclos por símbolo (t vai de 0 a 1 em cada símbolo).
+# Precisam ficar abaixo de amostras_por_simbolo / 2: com 10 ou 50 amostras por
+# símbolo, 1000 ou 2000 ciclos caem sobre múltiplos da taxa de amostragem e a
+# portadora amostrada vira uma sequência de zeros.
+FC_PADRAO = 2
+F_1_PADRAO = 2
+F_0_PADRAO = 4
+
+
+def resolver_codigo_linha(tipo, amostras_por_bit, dtype=np.float64):
+    """
+    Devolve (codificar(bits, out=None), decodificar(sinal)) já com os parâmetros fixados.
+    """
+    if tipo not in CODIGOS_LINHA:
+        raise ValueError(f"Modulação digital desconhecida: {tipo}")
+    codificador, decodificador = CODIGOS_LINHA[tipo]
+    return (partial(codificador, amostras_por_bit=amostras_por_bit, dtype=np.dtype(dtype)),
+            partial(decodificador, amostras_por_bit=amostras_por_bit))
+
+
+def resolver_modem(tipo, amostras_por_simbolo, fc=FC_PADRAO, f_1=F_1_PADRAO, f_0=F_0_PADRAO,
+                   A_1=1.0, A_0=0.0, dtype=np.float64):
+    """
+    Resolve uma única vez o modulador/demodulador de 'tipo' com todos os parâmetros.
+
+    Retorna:
+    • (bits_por_simbolo, modular(bits, out=None), demodular(sinal))
+    """
+    dtype = np.dtype(dtype)
+    if tipo == "ASK":
+        return (1,
+                partial(modulador_ask, fc=fc, A_1=A_1, A_0=A_0, amostras_por_bit=amostras_por_simbolo, dtype=dtype),
+                partial(demodulador_ask, fc=fc, amostras_por_bit=amostras_por_simbolo, A_1=A_1, A_0=A_0))
+    elif tipo == "FSK":
+        return (1,
+                partial(modulador_fsk, f_1=f_1, f_0=f_0, amostras_por_bit=amostras_por_simbolo, dtype=dtype),
+                partial(demodulador_fsk, f_1=f_1, f_0=f_0, amostras_por_bit=amostras_por_simbolo))
+    elif tipo in TIPOS_MFSK:
+        M = TIPOS_MFSK[tipo]
+        # Valida já na montagem: um tom acima de Nyquist não teria bin na FFT do demodulador
+        validar_tons_mfsk(M, 1, 1, amostras_por_simbolo)
+        return (int(np.log2(M)),
+                partial(modulador_mfsk, M=M, amostras_por_simbolo=amostras_por_simbolo, dtype=dtype),
+                partial(demodulador_mfsk, M=M, amostras_por_simbolo=amostras_por_simbolo))
+    elif tipo in CONSTELACOES:
+        # QPSK, 16QAM, BPSK, 8PSK, 64QAM, 256QAM
+        c = CONSTELACOES[tipo]
+        return (c.bits_por_simbolo,
+                partial(c.modular, fc=fc, amostras_por_simbolo=amostras_por_simbolo, dtype=dtype),
+                partial(c.demodular, fc=fc, amostras_por_simbolo=amostras_por_simbolo))
+    else:
+        raise ValueError(f"Modulação analogica desconhecida: {tipo}")
 
-def demodulador_16qam(sinal, fc=2000, amostras_por_simbolo=50):
-    # Preciso implementar corretamente
-    t = np.linspace(0, 1, amostras_por_simbolo, endpoint=False)
-    n_simbolos = len(sinal) // amostras_por_simbolo
-    bits = []
 
-    # Portadoras de referencia
+class CamadaFisica:
+    def __init__(self, amostras_por_bit=10, dtype=np.float64, fc=FC_PADRAO, f_1=F_1_PADRAO, f_0=F_0_PADRAO):
+        self.amostras_por_bit = amostras_por_bit
+        # Tipo das amostras geradas (float32 reduz pela metade a memória dos sinais)
+        self.dtype = np.dtype(dtype)
+        # Frequências das portadoras, em ciclos por símbolo
+        self.fc = fc
+        self.f_1 = f_1
+        self.f_0 = f_0
+
+    def codificar_digital(self, bits, tipo, out=None):
+        """
+        Seleciona o codificador digital baseado na string 'tipo' vinda da GUI.
+        Com 'out', as amostras são escritas no buffer fornecido.
+        """
+        codificar, _ = resolver_codigo_linha(tipo, self.amostras_por_bit, self.dtype)
+        return codificar(bits, out=out)
 
-    cos_ref = np.cos(2 * np.pi * fc * t)
-    sen_ref = np.sin(2 * np.pi * fc * t)
+    def decodificar_digital(self, sinal, tipo):
+        """
+        Seleciona o decodificador digital baseado na string 'tipo'.
+        """
+        _, decodificar = resolver_codigo_linha(tipo, self.amostras_por_bit, self.dtype)
+        return decodificar(sinal)
 
-    for i in range(n_simbolos):
-        # extrai o bloco do sinal
-        bloco = sinal[i * amostras_por_simbolo:(i + 1) * amostras_por_simbolo]
+    def modular_analogico(self, bits=None, sinal_digital=None, tipo="ASK", out=None):
+        """
+        Modula a portadora 'tipo' com os bits do quadro, usando amostras_por_bit
+        amostras por símbolo. Levanta ValueError para tipos desconhecidos.
+        """
+        _, modular, _ = self._modem_analogico(tipo)
+        return modular(bits, out=out)
 
-        # Correlação
-        I_correlacao_cos = np.sum(bloco * cos_ref)
-        Q_correlacao_sen = np.sum(bloco * sen_ref)
+    def demodular_analogico(self, sinal_analogico, tipo, suave=False, sigma=1.0):
+        """
+        Demodula o sinal recebido com os mesmos parâmetros de modular_analogico.
 
-        melhor_dist = None
-        melhor_bits = None
+        Com 'suave', devolve os LLRs de cada bit (float64, positivo favorece
+        o bit 0) em vez dos bits. 'sigma' é o desvio padrão do ruído por
+        amostra; com o valor padrão os LLRs ficam apenas proporcionais aos
+        verdadeiros, o que basta para Viterbi e Chase.
+        """
+        _, _, demodular = self._modem_analogico(tipo)
+        if not suave:
+            return demodular(sinal_analogico)
+        if tipo in TIPOS_MFSK:
+            raise ValueError(f"Saída suave não disponível para {tipo}")
+        return demodular(sinal_analogico, suave=True, sigma=sigma)
+
+    def modular_lote(self, quadros_bits, tipo="ASK"):
+        """
+        Modula vários quadros como um único sinal contíguo.
+
+        Parâmetros:
+        • quadros_bits: Lista de arrays de bits (tamanhos quaisquer) ou matriz
+          (quadros x bits) para quadros de mesmo tamanho.
+        • tipo (str): Como em modular_analogico.
+
+        Retorna:
+        • (sinal, deslocamentos): O quadro i ocupa sinal[deslocamentos[i]:deslocamentos[i + 1]].
+          Cada quadro é completado até um número inteiro de símbolos, então
+          esse trecho é igual a modular_analogico(quadros_bits[i]) e os quadros
+          nunca dividem um símbolo; deslocamentos[-1] == len(sinal).
+        """
+        bits_por_simbolo, modular, _ = self._modem_analogico(tipo)
+
+        if isinstance(quadros_bits, np.ndarray) and quadros_bits.ndim == 2:
+            matriz = quadros_bits.astype(np.uint8, copy=False)
+            falta = (-matriz.shape[1]) % bits_por_simbolo
+            if falta:
+                matriz = np.concatenate((matriz, np.zeros((len(matriz), falta), dtype=np.uint8)), axis=1)
+            simbolos = np.full(len(matriz), matriz.shape[1] // bits_por_simbolo, dtype=np.int64)
+            bits = matriz.reshape(-1)
+        else:
+            quadros_bits = [np.asarray(q, dtype=np.uint8).reshape(-1) for q in quadros_bits]
+            tamanhos = np.array([len(q) for q in quadros_bits], dtype=np.int64)
+            simbolos = -(-tamanhos // bits_por_simbolo)
+            # Cada quadro começa no início do seu primeiro símbolo; o preenchimento fica em zero
+            inicios = np.concatenate(([0], np.cumsum(simbolos * bits_por_simbolo)))
+            bits = np.zeros(inicios[-1], dtype=np.uint8)
+            destino = np.arange(tamanhos.sum()) + np.repeat(inicios[:-1] - np.concatenate(([0], np.cumsum(tamanhos)[:-1])), tamanhos)
+            if len(quadros_bits):
+                bits[destino] = np.concatenate(quadros_bits)
+
+        deslocamentos = np.concatenate(([0], np.cumsum(simbolos))) * self.amostras_por_bit
+        return modular(bits), deslocamentos
+
+    def demodular_lote(self, sinal, deslocamentos, tipo="ASK", suave=False, sigma=1.0):
+        """
+        Demodula de uma vez um sinal gerado por modular_lote (depois do meio).
 
-        # Percorrer os símbolos no mapa
-        for bits_ref, (I_ref, Q_ref) in mapa_16qam.items():
+        Retorna:
+        • list[np.ndarray]: Os bits (ou LLRs, com 'suave') de cada quadro,
+          como vistas do resultado único; incluem o preenchimento do último
+          símbolo, como demodular_analogico.
+        """
+        bits_por_simbolo, _, _ = self._modem_analogico(tipo)
+        deslocamentos = np.asarray(deslocamentos, dtype=np.int64)
+        if len(deslocamentos) < 2:
+            return []
+        valores = self.demodular_analogico(np.asarray(sinal)[:deslocamentos[-1]], tipo, suave=suave, sigma=sigma)
+        cortes = deslocamentos // self.amostras_por_bit * bits_por_simbolo
+        return np.split(valores[:cortes[-1]], cortes[1:-1])
+
+    def _modem_analogico(self, tipo):
+        return resolver_modem(tipo, self.amostras_por_bit, self.fc, self.f_1, self.f_0, dtype=self.dtype)
+
+    def modular_stream(self, bits_iter, chunk_symbols=4096, tipo="ASK"):
+        """
+        Modula um fluxo de bits sem precisar da mensagem inteira em memória.
+
+        Parâmetros:
+        • bits_iter: Iterável de trechos de bits (listas/arrays de 0 e 1, de qualquer tamanho).
+        • chunk_symbols (int): Símbolos por bloco de amostras gerado.
+        • tipo (str): "ASK", "FSK" ou um nome de CONSTELACOES ("QPSK", "16QAM", ...).
+
+        Retorna:
+        • Gerador de blocos com chunk_symbols * amostras_por_bit amostras cada
+          (o último pode ser menor). Os bits que não completam um bloco ficam
+          guardados para o próximo trecho, então os símbolos nunca são partidos
+          entre blocos e a portadora mantém a fase de cada símbolo. A
+          concatenação dos blocos é igual a modular todos os bits de uma vez.
+        """
+        bits_por_simbolo, modular, _ = self._modem_analogico(tipo)
+        bits_por_bloco = chunk_symbols * bits_por_simbolo
+        pendentes = np.zeros(0, dtype=int)
 
-            # Calcula a distância euclidiana entre (I_rx, Q_rx) e (I, Q) de referência
-            dist = (I_correlacao_cos - I_ref)**2 + (Q_correlacao_sen - Q_ref)**2
+        for trecho in bits_iter:
+            trecho = np.atleast_1d(np.asarray(trecho, dtype=int)).reshape(-1)
+            pendentes = np.concatenate((pendentes, trecho))
 
-            if melhor_dist is None or dist < melhor_dist:
-                melhor_dist = dist
-                melhor_bits = bits_ref
+            inicio = 0
+            while len(pendentes) - inicio >= bits_por_bloco:
+                yield modular(pendentes[inicio:inicio + bits_por_bloco])
+                inicio += bits_por_bloco
+            pendentes = pendentes[inicio:].copy()
 
-        bits.extend(melhor_bits)
-                
-    return np.array(bits)
+        # Só o último bloco recebe o preenchimento de QPSK/16-QAM
+        if len(pendentes):
+            yield modular(pendentes)
 
+    def demodular_stream(self, samples_iter, tipo="ASK"):
+        """
+        Demodula um fluxo de amostras recebido em trechos de tamanho arbitrário.
 
-class CamadaFisica:
-    def __init__(self, amostras_por_bit=10):
-        self.amostras_por_bit = amostras_por_bit
+        Parâmetros:
+        • samples_iter: Iterável de trechos de amostras.
+        • tipo (str): "ASK", "FSK" ou um nome de CONSTELACOES ("QPSK", "16QAM", ...).
 
-    def codificar_digital(self, bits, tipo):
-        """
-        Seleciona o codificador digital baseado na string 'tipo' vinda da GUI.
+        Retorna:
+        • Gerador de arrays de bits, um por trecho que completa ao menos um
+          símbolo. Amostras de um símbolo incompleto aguardam o próximo trecho;
+          as que sobram no final do fluxo são descartadas, como em demodular_analogico.
         """
-        if tipo == "NRZ":
-            return codificador_nrz_polar(bits, self.amostras_por_bit)
-        elif tipo == "Manchester":
-            return codificador_manchester(bits, self.amostras_por_bit)
-        elif tipo == "Bipolar":
-            return codificador_bipolar(bits, self.amostras_por_bit)
-        else:
-            raise ValueError(f"Modulação digital desconhecida: {tipo}")
+        _, _, demodular = self._modem_analogico(tipo)
+        amostras = self.amostras_por_bit
+        resto = np.zeros(0, dtype=self.dtype)
 
-    def decodificar_digital(self, sinal, tipo):
-        """
-        Seleciona o decodificador digital baseado na string 'tipo'.
-        """
-        if tipo == "NRZ":
-            return decodificador_nrz_polar(sinal, self.amostras_por_bit)
-        elif tipo == "Manchester":
-            return decodificador_manchester(sinal, self.amostras_por_bit)
-        elif tipo == "Bipolar":
-            return decodificador_bipolar(sinal, self.amostras_por_bit)
-        else:
-            raise ValueError(f"Modulação digital desconhecida: {tipo}")
-    
-    def modular_analogico(self, bits=None, sinal_digital=None, tipo="ASK"):
-        # TODO: Implementar ASK, FSK, PSK, QAM
-        # Por enquanto retorna o próprio sinal digital para teste
-        if tipo == "ASK":
-            return modulador_ask(bits)
-        elif tipo == "FSK":
-            return modulador_fsk(bits)
-        elif tipo == "QPSK":
-            return modulador_qpsk(bits)
-        elif tipo == "16QAM":
-            return modulador_16qam(bits)
-        
-        else:
-            ValueError(f"Modulação analogica desconhecida: {tipo}")
-
-    def demodular_analogico(self, sinal_analogico, tipo):
-        # TODO: Implementar ASK, FSK, PSK, QAM
-        if tipo == "ASK":
-            return demodulador_ask(sinal_analogico)
-        elif tipo == "FSK":
-            return demodulador_fsk(sinal_analogico)
-        elif tipo == "QPSK":
-            return demodulador_qpsk(sinal_analogico)
-        elif tipo == "16QAM":
-            return demodulador_16qam(sinal_analogico)
-        
-        else:
-            ValueError(f"Modulação analogica desconhecida: {tipo}")
\ No newline at end of file
+        for trecho in samples_iter:
+            trecho = np.concatenate((resto, np.asarray(trecho, dtype=self.dtype).reshape(-1)))
+            completas = (len(trecho) // amostras) * amostras
+
+            if completas:
+                yield demodular(trecho[:completas])
+            resto = trecho[completas:].copy()
@@ -0,0 +1,260 @@
+import math
+
+import numpy as np
+
+import Enlace.errorCorrection as errorCorrection
+from CamadaEnlace import CONTROLES_ERRO_LOTE
+
+# Resultado da verificação de um quadro com erro
+DETECTADO = 0       # O verificador recusou o quadro
+CORRETO = 1         # Aceito com os dados originais (erro corrigido)
+NAO_DETECTADO = 2   # Aceito com dados errados (para Hamming, uma correção errada)
+
+# Elementos (linhas x bits) da matriz de erros montada por bloco
+_ELEMENTOS_POR_BLOCO = 1 << 23
+
+
+def _pares(n):
+    # Todas as combinações de 2 posições entre n, em ordem crescente
+    i, j = np.triu_indices(n, 1)
+    return np.column_stack((i, j))
+
+
+def _combinacoes(n, k):
+    """
+    Gera, em blocos, todas as combinações de k posições entre n (cada linha
+    em ordem crescente): o último par vem de np.triu_indices e só as
+    posições anteriores são percorridas em Python.
+    """
+    if k == 0:
+        yield np.zeros((1, 0), dtype=np.int64)
+    elif k == 1:
+        yield np.arange(n)[:, np.newaxis]
+    elif k == 2:
+        yield _pares(n)
+    else:
+        for i in range(n - k + 1):
+            for resto in _combinacoes(n - i - 1, k - 1):
+                yield np.column_stack((np.full(len(resto), i), resto + i + 1))
+
+
+def padroes_peso(n_bits, peso, max_padroes=None, rng=None, linhas_por_bloco=None):
+    """
+    Posições dos bits trocados em cada padrão de 'peso' erros num quadro de n_bits.
+
+    Parâmetros:
+    • max_padroes (int | None): Se C(n_bits, peso) passar disso, sorteia
+      max_padroes padrões (sem repetir posições dentro de um padrão) em vez
+      de enumerar todos.
+    • linhas_por_bloco (int): Padrões por bloco gerado.
+
+    Retorna:
+    • Gerador de matrizes (padrões x peso).
+    """
+    if linhas_por_bloco is None:
+        linhas_por_bloco = max(1, _ELEMENTOS_POR_BLOCO // max(n_bits, 1))
+    total = math.comb(n_bits, peso)
+
+    if max_padroes is not None and total > max_padroes:
+        rng = rng if rng is not None else np.random.default_rng()
+        for inicio in range(0, max_padroes, linhas_por_bloco):
+            m = min(linhas_por_bloco, max_padroes - inicio)
+            yield np.sort(np.argpartition(rng.random((m, n_bits)), peso - 1, axis=1)[:, :peso], axis=1)
+        return
+
+    # Junta os pedaços de _combinacoes em blocos de até linhas_por_bloco
+    pendentes, n_pendentes = [], 0
+    for pedaco in _combinacoes(n_bits, peso):
+        for inicio in range(0, len(pedaco), linhas_por_bloco):
+            parte = pedaco[inicio:inicio + linhas_por_bloco]
+            pendentes.append(parte)
+            n_pendentes += len(parte)
+            if n_pendentes >= linhas_por_bloco:
+                yield np.concatenate(pendentes)
+                pendentes, n_pendentes = [], 0
+    if pendentes:
+        yield np.concatenate(pendentes)
+
+
+def padroes_rajada(n_bits, comprimento, n_amostras, rng, linhas_por_bloco=None):
+    """
+    Rajadas de 'comprimento' bits sorteadas: início uniforme, primeiro e
+    último bits trocados e os do meio sorteados (a definição usual de rajada
+    para CRC).
+
+    Retorna:
+    • Gerador de matrizes de erro em bits (padrões x n_bits), uint8.
+    """
+    if linhas_por_bloco is None:
+        linhas_por_bloco = max(1, _ELEMENTOS_POR_BLOCO // max(n_bits, 1))
+    deslocamentos = np.arange(comprimento)
+    for inicio in range(0, n_amostras, linhas_por_bloco):
+        m = min(linhas_por_bloco, n_amostras - inicio)
+        rajada = rng.integers(0, 2, (m, comprimento), dtype=np.uint8)
+        rajada[:, 0] = rajada[:, -1] = 1
+        comeco = rng.integers(0, n_bits - comprimento + 1, m)
+        erros = np.zeros((m, n_bits), dtype=np.uint8)
+        erros[np.arange(m)[:, np.newaxis], comeco[:, np.newaxis] + deslocamentos] = rajada
+        yield erros
+
+
+def _matriz_de_posicoes(posicoes, n_bits):
+    erros = np.zeros((len(posicoes), n_bits), dtype=np.uint8)
+    erros[np.arange(len(posicoes))[:, np.newaxis], posicoes] = 1
+    return erros
+
+
+def _codigo_hamming(tipo):
+    if tipo == "Hamming":
+        return errorCorrection.CODIGOS_HAMMING["Hamming (7,4)"]
+    return errorCorrection.CODIGOS_HAMMING.get(tipo)
+
+
+def _classificar_hamming(codigo, recebidos, dados):
+    """
+    Como verificar() de cada linha, inclusive quando o erro atingiu o tamanho
+    anotado no trailer (que não é protegido): com o tamanho original as linhas
+    passam por verificar_lote; as demais são decodificadas com o tamanho
+    corrompido, como o receptor faria.
+    """
+    resultado = np.full(len(recebidos), DETECTADO, dtype=np.int8)
+    n_codificados = recebidos.shape[1] - errorCorrection.BYTES_TAMANHO
+    anotado = recebidos[:, n_codificados:].astype(np.int64) @ (256 ** np.arange(errorCorrection.BYTES_TAMANHO - 1, -1, -1))
+    original = 8 * dados.shape[1]
+
+    linhas = np.flatnonzero(anotado == original)
+    if len(linhas):
+        saida, validos = codigo.verificar_lote(recebidos[linhas])
+        corretos = (saida == dados[linhas]).all(axis=1)
+        resultado[linhas] = np.where(validos, np.where(corretos, CORRETO, NAO_DETECTADO), DETECTADO)
+
+    # Tamanhos que não cabem no quadro já são recusados (o resultado inicial)
+    cabem = (anotado != original) & (-(-anotado // codigo.k) * codigo.n <= 8 * n_codificados)
+    for valor in np.unique(anotado[cabem]):
+        linhas = np.flatnonzero(anotado == valor)
+        n_blocos = -(-int(valor) // codigo.k)
+        bits = np.unpackbits(recebidos[linhas, :n_codificados], axis=1)[:, :n_blocos * codigo.n]
+        saida, _, duplos = codigo.decodificar_bits(bits)
+        aceitos = ~duplos.reshape(len(linhas), n_blocos).any(axis=1)
+        if -(-int(valor) // 8) == dados.shape[1]:
+            saida = np.packbits(saida.reshape(len(linhas), -1)[:, :valor], axis=1)
+            corretos = (saida == dados[linhas]).all(axis=1)
+        else:
+            corretos = np.zeros(len(linhas), dtype=bool)
+        resultado[linhas] = np.where(aceitos, np.where(corretos, CORRETO, NAO_DETECTADO), DETECTADO)
+    return resultado
+
+
+def classificar(tipo, recebidos, dados):
+    """
+    Passa um lote de quadros recebidos pelo verificador em lote de 'tipo' e
+    compara a saída com os dados originais.
+
+    Parâmetros:
+    • tipo (str): Uma chave de CamadaEnlace.CONTROLES_ERRO_LOTE.
+    • recebidos (np.ndarray): Quadros codificados (com erros), um por linha.
+    • dados (np.ndarray): Dados originais de cada linha.
+
+    Retorna:
+    • np.ndarray: DETECTADO, CORRETO ou NAO_DETECTADO para cada linha.
+    """
+    codigo = _codigo_hamming(tipo)
+    if codigo is not None:
+        return _classificar_hamming(codigo, recebidos, dados)
+
+    _, verificar_lote = CONTROLES_ERRO_LOTE[tipo]
+    saida, validos = verificar_lote(recebidos)
+    corretos = (saida == dados).all(axis=1)
+    return np.where(validos, np.where(corretos, CORRETO, NAO_DETECTADO), DETECTADO).astype(np.int8)
+
+
+def analisar_cobertura(tipo, tamanho_dados=16, pesos=(1, 2, 3), rajadas=(8, 16, 32, 33), n_rajadas=20_000,
+                       max_padroes=None, n_dados=16, semente=0):
+    """
+    Aplica ao quadro codificado todos os padrões de 1, 2 e 3 erros (ou os
+    'pesos' pedidos) e rajadas sorteadas, e conta o que o verificador faz
+    com cada um.
+
+    Os padrões valem para todo o quadro transmitido (dados, bits de
+    controle e, em Hamming, o trailer com o tamanho). As linhas de cada bloco
+    usam n_dados quadros de dados aleatórios em rodízio: paridade, CRC e
+    Hamming são lineares e não dependem dos dados, mas o checksum depende.
+
+    Parâmetros:
+    • tipo (str): Uma chave de CamadaEnlace.CONTROLES_ERRO_LOTE.
+    • tamanho_dados (int): Bytes de dados por quadro.
+    • rajadas (tuple[int]): Comprimentos de rajada, com n_rajadas amostras cada.
+    • max_padroes (int | None): Limite de padrões por peso (acima dele, sorteia).
+
+    Retorna:
+    • list[dict]: Uma linha por classe de padrão ("1 bit", "2 bits", "rajada 16", ...)
+      com as contagens e as taxas de detecção, correção e erro não detectado.
+    """
+    if tipo not in CONTROLES_ERRO_LOTE:
+        raise ValueError(f"Controle de erro sem verificação em lote: {tipo}")
+    aplicar_lote, _ = CONTROLES_ERRO_LOTE[tipo]
+    rng = np.random.default_rng(np.random.SeedSequence(semente, spawn_key=(0xC0,)))
+
+    dados = rng.integers(0, 256, (n_dados, tamanho_dados), dtype=np.uint8)
+    codificados = aplicar_lote(dados)
+    n_bits = 8 * codificados.shape[1]
+
+    def contar(classe, blocos, exato):
+        contagens = np.zeros(3, dtype=np.int64)
+        for erros in blocos:
+            quais = np.arange(len(erros)) % n_dados
+            recebidos = codificados[quais] ^ np.packbits(erros, axis=1)
+            contagens += np.bincount(classificar(tipo, recebidos, dados[quais]), minlength=3)
+        total = int(contagens.sum())
+        return {
+            "controle_erro": tipo,
+            "classe": classe,
+            "bits_quadro": n_bits,
+            "padroes": total,
+            "exato": exato,
+            "detectados": int(contagens[DETECTADO]),
+            "corrigidos": int(contagens[CORRETO]),
+            "nao_detectados": int(contagens[NAO_DETECTADO]),
+            "taxa_deteccao": contagens[DETECTADO] / total if total else float("nan"),
+            "taxa_correcao": contagens[CORRETO] / total if total else float("nan"),
+            "taxa_nao_detectado": contagens[NAO_DETECTADO] / total if total else float("nan"),
+        }
+
+    resultados = []
+    for peso in pesos:
+        exato = max_padroes is None or math.comb(n_bits, peso) <= max_padroes
+        blocos = (_matriz_de_posicoes(posicoes, n_bits)
+                  for posicoes in padroes_peso(n_bits, peso, max_padroes, rng))
+        resultados.append(contar(f"{peso} bit{'s' if peso > 1 else ''}", blocos, exato))
+    for comprimento in rajadas:
+        if comprimento <= n_bits:
+            resultados.append(contar(f"rajada {comprimento}",
+                                     padroes_rajada(n_bits, comprimento, n_rajadas, rng), False))
+    return resultados
+
+
+def comparar_codigos(tipos, tamanho_dados=16, **opcoes):
+    """
+    analisar_cobertura para cada controle de erro, com as mesmas opções.
+    """
+    return [linha for tipo in tipos for linha in analisar_cobertura(tipo, tamanho_dados, **opcoes)]
+
+
+def imprimir_resultados(resultados):
+    colunas = ["controle_erro", "classe", "bits_quadro", "padroes", "taxa_deteccao", "taxa_correcao",
+               "taxa_nao_detectado"]
+    print(" | ".join(f"{c:>20}" for c in colunas))
+    for r in resultados:
+        celulas = [f"{r[c]:>20.6g}" if isinstance(r[c], float) else f"{r[c]!s:>20}" for c in colunas]
+        print(" | ".join(celulas))
+
+
+def main():
+    imprimir_resultados(comparar_codigos(
+        ["Bit de Paridade Par", "Checksum", "CRC-32", "Hamming (7,4)", "Hamming SECDED (8,4)"],
+        tamanho_dados=16,
+    ))
+
+
+if __name__ == "__main__":
+    main()
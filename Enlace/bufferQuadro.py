@@ -0,0 +1,144 @@
+class BufferQuadro:
+    """
+    Quadro da camada de enlace sobre um bytearray pré-alocado, com espaço
+    reservado antes (headroom) e depois (tailroom) dos dados.
+
+    O conteúdo do quadro é a janela memoria[inicio:fim]:
+    • prefixar()/anexar() gravam cabeçalhos e trailers direto na reserva,
+      sem recriar o quadro; só quando a reserva acaba o bytearray cresce.
+    • remover_cabecalho()/remover_cauda() só movem as bordas da janela e
+      devolvem o trecho removido como memoryview.
+    • dados() é uma memoryview da janela atual (sem cópia).
+
+    No receptor o buffer pode embrulhar os bytes recebidos sem reserva
+    (BufferQuadro.recebido), já que lá os campos só são removidos.
+    """
+
+    __slots__ = ("memoria", "inicio", "fim")
+
+    RESERVA_CABECALHO = 16
+    RESERVA_CAUDA = 16
+
+    def __init__(self, memoria, inicio=0, fim=None):
+        self.memoria = memoria
+        self.inicio = inicio
+        self.fim = len(memoria) if fim is None else fim
+
+    @classmethod
+    def de_dados(cls, dados, reserva_cabecalho=None, reserva_cauda=None):
+        """
+        Copia 'dados' (uma única vez) para um bytearray novo com as reservas.
+        """
+        if reserva_cabecalho is None:
+            reserva_cabecalho = cls.RESERVA_CABECALHO
+        if reserva_cauda is None:
+            reserva_cauda = cls.RESERVA_CAUDA
+        memoria = bytearray(reserva_cabecalho + len(dados) + reserva_cauda)
+        memoria[reserva_cabecalho:reserva_cabecalho + len(dados)] = dados
+        return cls(memoria, reserva_cabecalho, reserva_cabecalho + len(dados))
+
+    @classmethod
+    def recebido(cls, quadro):
+        """
+        Embrulha um quadro recebido sem copiá-lo (só para remoção de campos).
+        """
+        return cls(quadro)
+
+    def __len__(self):
+        return self.fim - self.inicio
+
+    @property
+    def headroom(self) -> int:
+        return self.inicio
+
+    @property
+    def tailroom(self) -> int:
+        return len(self.memoria) - self.fim
+
+    def dados(self) -> memoryview:
+        return memoryview(self.memoria)[self.inicio:self.fim]
+
+    def tobytes(self) -> bytes:
+        return bytes(self.memoria[self.inicio:self.fim])
+
+    def __bytes__(self):
+        return self.tobytes()
+
+    # ------------------------------------------------------------ transmissão
+    def _realocar(self, cabecalho, cauda):
+        # A reserva acabou: cresce com folga para os próximos campos
+        novo = BufferQuadro.de_dados(self.dados(), max(cabecalho, self.RESERVA_CABECALHO),
+                                     max(cauda, self.RESERVA_CAUDA))
+        self.memoria, self.inicio, self.fim = novo.memoria, novo.inicio, novo.fim
+
+    def reservar_cabecalho(self, n: int) -> memoryview:
+        """
+        Abre n bytes antes dos dados e devolve a memoryview para gravá-los.
+        """
+        if n > self.headroom:
+            self._realocar(n, 0)
+        self.inicio -= n
+        return memoryview(self.memoria)[self.inicio:self.inicio + n]
+
+    def reservar_cauda(self, n: int) -> memoryview:
+        """
+        Abre n bytes depois dos dados e devolve a memoryview para gravá-los.
+        """
+        if n > self.tailroom:
+            self._realocar(0, n)
+        self.fim += n
+        return memoryview(self.memoria)[self.fim - n:self.fim]
+
+    def prefixar(self, cabecalho):
+        n = len(cabecalho)
+        if n > self.inicio:
+            self._realocar(n, 0)
+        self.memoria[self.inicio - n:self.inicio] = cabecalho
+        self.inicio -= n
+        return self
+
+    def anexar(self, trailer):
+        n = len(trailer)
+        if n > len(self.memoria) - self.fim:
+            self._realocar(0, n)
+        self.memoria[self.fim:self.fim + n] = trailer
+        self.fim += n
+        return self
+
+    def substituir(self, dados):
+        """
+        Troca o conteúdo inteiro (para transformações que não são só cabeçalho
+        ou trailer, como Hamming ou inserção de bits).
+        """
+        novo = BufferQuadro.de_dados(dados, self.RESERVA_CABECALHO, self.RESERVA_CAUDA)
+        self.memoria, self.inicio, self.fim = novo.memoria, novo.inicio, novo.fim
+        return self
+
+    # ------------------------------------------------------------ recepção
+    def remover_cabecalho(self, n: int) -> memoryview:
+        if n > len(self):
+            raise ValueError(f"Quadro com {len(self)} bytes não tem cabeçalho de {n}")
+        self.inicio += n
+        return memoryview(self.memoria)[self.inicio - n:self.inicio]
+
+    def remover_cauda(self, n: int) -> memoryview:
+        if n > len(self):
+            raise ValueError(f"Quadro com {len(self)} bytes não tem trailer de {n}")
+        self.fim -= n
+        return memoryview(self.memoria)[self.fim:self.fim + n]
+
+    def limitar(self, inicio: int, fim: int):
+        """
+        Reduz a janela a dados()[inicio:fim] (posições relativas à janela atual).
+        """
+        if not 0 <= inicio <= fim <= len(self):
+            raise ValueError(f"Janela [{inicio}:{fim}] fora do quadro de {len(self)} bytes")
+        self.inicio, self.fim = self.inicio + inicio, self.inicio + fim
+        return self
+
+    def encontrar(self, valor: bytes) -> int:
+        """
+        Posição de 'valor' na janela (relativa a ela), ou -1; sem copiar.
+        """
+        posicao = self.memoria.find(valor, self.inicio, self.fim)
+        return -1 if posicao < 0 else posicao - self.inicio
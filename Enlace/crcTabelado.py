@@ -0,0 +1,448 @@
+import binascii
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+# Abaixo deste tamanho o laço slicing-by-8 em Python é mais rápido que o caminho NumPy
+_MINIMO_VETORIAL = 512
+# Bytes por bloco no caminho NumPy (uma tabela de contribuição por posição do byte no bloco)
+_BYTES_POR_BLOCO = 64
+# Os dados são processados em pedaços deste tamanho para limitar a memória temporária
+_PEDACO = 1 << 20
+
+# Tamanho padrão de cada pedaço no cálculo em paralelo
+_PEDACO_PARALELO = 4 << 20
+
+# Inverte a ordem dos bits de cada byte (usado para reaproveitar rotinas refletidas e vice-versa)
+_INVERTE_BITS = bytes(int(f"{v:08b}"[::-1], 2) for v in range(256))
+
+
+def _refletir(valor: int, largura: int) -> int:
+    # Inverte os bits de cada byte pela tabela e a ordem dos bytes na conversão
+    num_bytes = (largura + 7) // 8
+    valor &= (1 << largura) - 1
+    invertido = int.from_bytes(valor.to_bytes(num_bytes, "big").translate(_INVERTE_BITS), "little")
+    return invertido >> (8 * num_bytes - largura)
+
+
+def _crc32_zlib_refletido(registro: int, dados) -> int:
+    # zlib.crc32 complementa o registro na entrada e na saída; desfazendo isso sobra o registro puro
+    return zlib.crc32(dados, registro ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+
+def _crc32_zlib_direto(registro: int, dados) -> int:
+    # CRC não refletido = CRC refletido sobre os bytes com bits invertidos, com o registro invertido
+    registro = _refletir(registro, 32)
+    return _refletir(_crc32_zlib_refletido(registro, bytes(dados).translate(_INVERTE_BITS)), 32)
+
+
+def _crc16_hqx_direto(registro: int, dados) -> int:
+    # binascii.crc_hqx é o registro puro do CRC-16 0x1021 não refletido
+    return binascii.crc_hqx(dados, registro)
+
+
+def _crc16_hqx_refletido(registro: int, dados) -> int:
+    registro = _refletir(registro, 16)
+    return _refletir(binascii.crc_hqx(bytes(dados).translate(_INVERTE_BITS), registro), 16)
+
+
+# (largura, polinômio, refletido) -> rotina em C da biblioteca padrão que avança o registro
+_ACELERADORES = {
+    (32, 0x04C11DB7, True): _crc32_zlib_refletido,
+    (32, 0x04C11DB7, False): _crc32_zlib_direto,
+    (16, 0x1021, False): _crc16_hqx_direto,
+    (16, 0x1021, True): _crc16_hqx_refletido,
+}
+
+
+class MotorCRC:
+    """
+    Tabelas pré-calculadas de um CRC (modelo de Rocksoft: largura, polinômio,
+    valor inicial, reflexão e xor final).
+
+    O registro do CRC evolui de forma linear sobre GF(2), então:
+      • entradas pequenas usam slicing-by-8: 8 tabelas de contribuição, uma
+        por posição do byte no bloco, mais o operador "avançar 8 bytes";
+      • entradas grandes calculam de uma vez, com NumPy, a contribuição de
+        todos os blocos de 64 bytes e as juntam em árvore;
+      • anexar n bytes nulos é um operador linear, guardado como uma tabela
+        por byte do registro. É ele que junta contribuições calculadas
+        separadamente: CRC(A + B) = desloca(CRC(A), len(B)) ^ CRC(B).
+
+    Quando o polinômio coincide com o do zlib (CRC-32) ou do binascii
+    (CRC-16 0x1021), o registro é avançado por essas rotinas em C.
+
+    Os motores são compartilhados: use MotorCRC.obter(...) para reaproveitar as tabelas.
+    """
+
+    _motores = {}
+
+    @classmethod
+    def obter(cls, largura, polinomio, inicial=0, refletido=False, xor_final=0):
+        chave = (largura, polinomio, inicial, refletido, xor_final)
+        if chave not in cls._motores:
+            cls._motores[chave] = cls(*chave)
+        return cls._motores[chave]
+
+    def __init__(self, largura, polinomio, inicial=0, refletido=False, xor_final=0):
+        self._parametros = (largura, polinomio, inicial, refletido, xor_final)
+        if largura < 8 or largura > 64:
+            raise ValueError(f"Largura de CRC não suportada: {largura}")
+
+        self.largura = largura
+        self.polinomio = polinomio
+        self.refletido = refletido
+        self.xor_final = xor_final
+        self.mascara = (1 << largura) - 1
+        self.num_bytes = (largura + 7) // 8
+
+        # No algoritmo refletido o registro trabalha com o valor inicial invertido
+        self.inicial = _refletir(inicial, largura) if refletido else inicial
+
+        self._acelerador = _ACELERADORES.get((largura, polinomio, refletido))
+        self._tabela_byte = self._gerar_tabela_byte()
+
+        # Operadores "anexar n bytes nulos" já calculados (n -> tabelas)
+        valores = np.arange(256, dtype=np.uint64)
+        zeros = np.zeros(256, dtype=np.uint64)
+        um_byte = np.empty((self.num_bytes, 256), dtype=np.uint64)
+        for b in range(self.num_bytes):
+            um_byte[b] = self._passo_vetor(valores << np.uint64(8 * b), zeros)
+        self._deslocamentos = {1: um_byte}
+
+        # Contribuição de um byte isolado, partindo do registro zerado
+        ultimo = self._passo_vetor(zeros, valores)
+
+        # Slicing-by-8: o byte na posição i do bloco é seguido de 7 - i bytes
+        self._fatias_py = [self._contribuicao_posicao(ultimo, 7 - i).tolist() for i in range(8)]
+        self._um_byte_py = [tabela.tolist() for tabela in um_byte]
+        self._avancar8_py = [tabela.tolist() for tabela in self.deslocamento(8)]
+
+        # Caminho NumPy: tabelas das 64 posições concatenadas, indexadas por posição * 256 + byte
+        tipo_tabela = np.uint32 if largura <= 32 else np.uint64
+        self._tabelas_bloco = np.concatenate([
+            self._contribuicao_posicao(ultimo, _BYTES_POR_BLOCO - 1 - i) for i in range(_BYTES_POR_BLOCO)
+        ]).astype(tipo_tabela)
+        self._base_indices = (np.arange(_BYTES_POR_BLOCO) * 256).astype(np.uint16)
+
+    def parametros(self):
+        """
+        (largura, polinomio, inicial, refletido, xor_final), aceitos por MotorCRC.obter.
+        """
+        return self._parametros
+
+    # ------------------------------------------------------------------ tabelas
+    def _gerar_tabela_byte(self):
+        tabela = np.empty(256, dtype=np.uint64)
+        if self.refletido:
+            poli = _refletir(self.polinomio, self.largura)
+            for v in range(256):
+                r = v
+                for _ in range(8):
+                    r = (r >> 1) ^ poli if r & 1 else r >> 1
+                tabela[v] = r
+        else:
+            topo = 1 << (self.largura - 1)
+            for v in range(256):
+                r = v << (self.largura - 8)
+                for _ in range(8):
+                    r = ((r << 1) ^ self.polinomio) if r & topo else (r << 1)
+                    r &= self.mascara
+                tabela[v] = r
+        return tabela
+
+    def _passo_vetor(self, r, byte):
+        """
+        Processa um byte em cada elemento de 'r' (arrays uint64).
+        """
+        if self.refletido:
+            return (r >> np.uint64(8)) ^ self._tabela_byte[(r ^ byte) & np.uint64(0xFF)]
+        topo = (r >> np.uint64(self.largura - 8)) ^ byte
+        return ((r << np.uint64(8)) & np.uint64(self.mascara)) ^ self._tabela_byte[topo & np.uint64(0xFF)]
+
+    def _contribuicao_posicao(self, ultimo, bytes_seguintes):
+        # Contribuição de um byte seguido de 'bytes_seguintes' bytes quaisquer
+        if bytes_seguintes == 0:
+            return ultimo
+        return self._aplicar(self.deslocamento(bytes_seguintes), ultimo)
+
+    # ------------------------------------------------------- operadores lineares
+    def _aplicar(self, operador, registros):
+        """
+        Aplica um operador linear (uma tabela por byte do registro) a um array de registros.
+        """
+        registros = np.asarray(registros, dtype=np.uint64)
+        resultado = np.zeros_like(registros)
+        for b in range(self.num_bytes):
+            resultado ^= operador[b][(registros >> np.uint64(8 * b)) & np.uint64(0xFF)]
+        return resultado
+
+    def _compor(self, segundo, primeiro):
+        # (segundo ∘ primeiro): basta aplicar 'segundo' às tabelas de 'primeiro'
+        return np.stack([self._aplicar(segundo, tabela) for tabela in primeiro])
+
+    def deslocamento(self, n_bytes):
+        """
+        Operador que leva o registro de antes para depois de n_bytes bytes nulos.
+        """
+        if n_bytes in self._deslocamentos:
+            return self._deslocamentos[n_bytes]
+
+        if n_bytes == 0:
+            resultado = np.stack([np.arange(256, dtype=np.uint64) << np.uint64(8 * b)
+                                  for b in range(self.num_bytes)])
+        else:
+            # Exponenciação por quadrados a partir do operador de 1 byte
+            resultado = None
+            potencia = self._deslocamentos[1]
+            passo = 1
+            restante = n_bytes
+            while True:
+                if restante & 1:
+                    resultado = potencia if resultado is None else self._compor(potencia, resultado)
+                restante >>= 1
+                if not restante:
+                    break
+                passo *= 2
+                if passo not in self._deslocamentos:
+                    self._deslocamentos[passo] = self._compor(potencia, potencia)
+                potencia = self._deslocamentos[passo]
+
+        self._deslocamentos[n_bytes] = resultado
+        return resultado
+
+    def deslocar(self, registro: int, n_bytes: int) -> int:
+        """
+        Registro após anexar n_bytes bytes nulos.
+        """
+        return int(self._aplicar(self.deslocamento(n_bytes), np.uint64(registro)))
+
+    # --------------------------------------------------------------- processamento
+    def processar(self, registro: int, dados) -> int:
+        """
+        Avança o registro sobre 'dados' (bytes, bytearray, memoryview ou array uint8).
+        """
+        if isinstance(dados, np.ndarray):
+            dados = np.ascontiguousarray(dados, dtype=np.uint8).reshape(-1)
+
+        if self._acelerador is not None:
+            return self._acelerador(registro, dados)
+
+        if not isinstance(dados, np.ndarray):
+            dados = np.frombuffer(dados, dtype=np.uint8)
+
+        if len(dados) < _MINIMO_VETORIAL:
+            return self._processar_serial(registro, dados.tobytes())
+
+        for inicio in range(0, len(dados), _PEDACO):
+            pedaco = dados[inicio:inicio + _PEDACO]
+            registro = self.deslocar(registro, len(pedaco)) ^ self.contribuicao(pedaco)
+        return registro
+
+    def _processar_serial(self, registro: int, dados: bytes) -> int:
+        f0, f1, f2, f3, f4, f5, f6, f7 = self._fatias_py
+        avancar = list(enumerate(self._avancar8_py))
+        um_byte = list(enumerate(self._um_byte_py))
+        n_blocos = len(dados) // 8
+
+        # Slicing-by-8: cada byte do bloco consulta a tabela da sua posição
+        blocos = iter(dados[:n_blocos * 8])
+        for b0, b1, b2, b3, b4, b5, b6, b7 in zip(blocos, blocos, blocos, blocos, blocos, blocos, blocos, blocos):
+            novo = f0[b0] ^ f1[b1] ^ f2[b2] ^ f3[b3] ^ f4[b4] ^ f5[b5] ^ f6[b6] ^ f7[b7]
+            for k, tabela in avancar:
+                novo ^= tabela[(registro >> (8 * k)) & 0xFF]
+            registro = novo
+
+        # Bytes que não completam um bloco: um de cada vez
+        for byte in dados[n_blocos * 8:]:
+            novo = f7[byte]
+            for k, tabela in um_byte:
+                novo ^= tabela[(registro >> (8 * k)) & 0xFF]
+            registro = novo
+
+        return registro
+
+    def contribuicao(self, dados) -> int:
+        """
+        Registro resultante de 'dados' partindo do registro zerado, calculado com NumPy.
+
+        Bytes nulos no início não alteram esse valor, então os dados são
+        completados à esquerda até um múltiplo de 64 bytes. Cada bloco vira
+        uma única consulta às tabelas de posição seguida de um XOR por linha,
+        e os blocos são juntados em árvore, dois a dois.
+        """
+        dados = np.asarray(dados, dtype=np.uint8).reshape(1, -1)
+        return int(self.contribuicoes(dados)[0])
+
+    def contribuicoes(self, matriz) -> np.ndarray:
+        """
+        contribuicao() de cada linha de uma matriz (quadros de mesmo tamanho), de uma vez.
+
+        Retorna:
+        • np.ndarray: Um registro (uint64) por linha.
+        """
+        matriz = np.asarray(matriz, dtype=np.uint8)
+        falta = (-matriz.shape[1]) % _BYTES_POR_BLOCO
+        if falta:
+            matriz = np.concatenate((np.zeros((len(matriz), falta), dtype=np.uint8), matriz), axis=1)
+        if matriz.shape[1] == 0:
+            return np.zeros(len(matriz), dtype=np.uint64)
+
+        indices = matriz.reshape(len(matriz), -1, _BYTES_POR_BLOCO) + self._base_indices
+        registros = np.bitwise_xor.reduce(np.take(self._tabelas_bloco, indices), axis=2).astype(np.uint64)
+
+        tamanho = _BYTES_POR_BLOCO
+        while registros.shape[1] > 1:
+            if registros.shape[1] % 2:
+                # Um bloco nulo à esquerda não muda o resultado e deixa a contagem par
+                registros = np.concatenate((np.zeros((len(registros), 1), dtype=np.uint64), registros), axis=1)
+            registros = self._aplicar(self.deslocamento(tamanho), registros[:, 0::2]) ^ registros[:, 1::2]
+            tamanho *= 2
+
+        return registros[:, 0]
+
+    def calcular_lote(self, matriz) -> np.ndarray:
+        """
+        CRC final de cada linha de uma matriz uint8 (N quadros de mesmo tamanho).
+
+        Em vez de N chamadas pequenas, todas as linhas passam juntas pelas
+        tabelas de posição; o valor inicial entra deslocado pelo tamanho da linha.
+        """
+        matriz = np.asarray(matriz, dtype=np.uint8)
+        if matriz.ndim != 2:
+            raise ValueError("calcular_lote espera uma matriz (quadros x bytes)")
+        registros = np.empty(len(matriz), dtype=np.uint64)
+        # Limita a memória das consultas às tabelas (4 a 8 bytes por byte de entrada)
+        linhas = max(1, _PEDACO // max(1, matriz.shape[1]))
+        for inicio in range(0, len(matriz), linhas):
+            registros[inicio:inicio + linhas] = self.contribuicoes(matriz[inicio:inicio + linhas])
+        registros ^= np.uint64(self.deslocar(self.inicial, matriz.shape[1]))
+        return (registros ^ np.uint64(self.xor_final)) & np.uint64(self.mascara)
+
+    def combinar(self, registro: int, contribuicao: int, n_bytes: int) -> int:
+        """
+        Junta o registro de um prefixo A com a contribuição (registro partindo
+        de zero) de um trecho B de n_bytes: é o registro de A + B.
+        """
+        return self.deslocar(registro, n_bytes) ^ contribuicao
+
+    def finalizar(self, registro: int) -> int:
+        return (registro ^ self.xor_final) & self.mascara
+
+
+class CRC:
+    """
+    CRC incremental no estilo hashlib:
+
+        c = CRC.preset("CRC-32/IEEE")
+        c.update(b"parte 1"); c.update(b"parte 2")
+        c.valor()   # int
+        c.digest()  # bytes (big-endian, como no trailer do quadro)
+    """
+
+    def __init__(self, largura=32, polinomio=0x04C11DB7, inicial=0, refletido=False, xor_final=0, nome=None):
+        self.nome = nome
+        self.motor = MotorCRC.obter(largura, polinomio, inicial, refletido, xor_final)
+        self._registro = self.motor.inicial
+
+    @classmethod
+    def preset(cls, nome):
+        if nome not in PRESETS_CRC:
+            raise ValueError(f"CRC desconhecido: {nome}")
+        return cls(nome=nome, **PRESETS_CRC[nome])
+
+    def update(self, chunk):
+        self._registro = self.motor.processar(self._registro, chunk)
+        return self
+
+    def update_paralelo(self, chunk, max_workers=None, tamanho_pedaco=_PEDACO_PARALELO, processos=False):
+        """
+        Como update(), mas divide 'chunk' em pedaços calculados num pool.
+
+        Cada pedaço é processado a partir do registro zerado, de forma
+        independente, e as contribuições são juntadas em ordem com
+        MotorCRC.combinar. O resultado é idêntico ao de update().
+
+        Parâmetros:
+        • max_workers (int | None): Tamanho do pool (padrão do executor).
+        • tamanho_pedaco (int): Bytes por tarefa.
+        • processos (bool): ProcessPoolExecutor em vez de threads. As threads
+          já escalam quando o trabalho pesado (zlib, NumPy) solta o GIL; os
+          processos pagam a cópia de cada pedaço para o trabalhador.
+        """
+        visao = memoryview(chunk).cast("B")
+        if len(visao) <= tamanho_pedaco:
+            return self.update(visao)
+
+        pedacos = [visao[i:i + tamanho_pedaco] for i in range(0, len(visao), tamanho_pedaco)]
+        parametros = self.motor.parametros()
+
+        if processos:
+            # memoryview não é serializável: cada pedaço vai como bytes
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                contribuicoes = list(pool.map(_contribuicao_do_pedaco, [parametros] * len(pedacos),
+                                              [bytes(p) for p in pedacos]))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                contribuicoes = list(pool.map(_contribuicao_do_pedaco, [parametros] * len(pedacos), pedacos))
+
+        for pedaco, contribuicao in zip(pedacos, contribuicoes):
+            self._registro = self.motor.combinar(self._registro, contribuicao, len(pedaco))
+        return self
+
+    def valor(self) -> int:
+        return self.motor.finalizar(self._registro)
+
+    def digest(self) -> bytes:
+        return self.valor().to_bytes(self.motor.num_bytes, byteorder="big")
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self):
+        novo = CRC.__new__(CRC)
+        novo.nome = self.nome
+        novo.motor = self.motor
+        novo._registro = self._registro
+        return novo
+
+    def reset(self):
+        self._registro = self.motor.inicial
+
+
+# Parâmetros no modelo de Rocksoft (o "check" de cada um é o CRC de b"123456789")
+PRESETS_CRC = {
+    # CRC-8/SMBUS, check 0xF4
+    "CRC-8": dict(largura=8, polinomio=0x07),
+    # CRC-16/CCITT-FALSE, check 0x29B1
+    "CRC-16/CCITT": dict(largura=16, polinomio=0x1021, inicial=0xFFFF),
+    # IEEE 802.3 / zlib, check 0xCBF43926
+    "CRC-32/IEEE": dict(largura=32, polinomio=0x04C11DB7, inicial=0xFFFFFFFF, refletido=True, xor_final=0xFFFFFFFF),
+    # Castagnoli (iSCSI, SCTP), check 0xE3069283
+    "CRC-32C": dict(largura=32, polinomio=0x1EDC6F41, inicial=0xFFFFFFFF, refletido=True, xor_final=0xFFFFFFFF),
+}
+
+
+def calcular_crc(dados, nome="CRC-32/IEEE") -> int:
+    """
+    CRC de 'dados' com um dos PRESETS_CRC.
+    """
+    return CRC.preset(nome).update(dados).valor()
+
+
+def _contribuicao_do_pedaco(parametros, pedaco) -> int:
+    # Executado no pool: cada processo monta (uma vez) o seu próprio motor
+    return MotorCRC.obter(*parametros).processar(0, pedaco)
+
+
+def combinar_crc(crc_a: int, crc_b: int, tamanho_b: int, nome="CRC-32/IEEE") -> int:
+    """
+    CRC de A + B a partir dos CRCs finais de A e de B (como zlib.crc32_combine).
+
+    Com registro inicial I e xor final X, o registro de B partindo de zero é
+    crc_b ^ X ^ desloca(I, tamanho_b), o que leva a
+    crc(A + B) = desloca(crc_a ^ X ^ I, tamanho_b) ^ crc_b.
+    """
+    motor = CRC.preset(nome).motor
+    return motor.deslocar(crc_a ^ motor.xor_final ^ motor.inicial, tamanho_b) ^ crc_b
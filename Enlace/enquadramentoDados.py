@@ -1,171 +1,476 @@
-import Utils
+import re
 
+import numpy as np
 
-def enquadrar_contagem_caracteres(dado: bytes) -> bytes:
+from Bits import BitBuffer
+
+
+# ===================== INTEIROS NOS CABEÇALHOS =====================
+# Formatos de inteiro aceitos nos cabeçalhos: nome -> bytes (None = varint)
+FORMATOS_INTEIRO = {
+    "u8": 1,
+    "u16": 2,
+    "u32": 4,
+    "varint": None,
+}
+
+
+def codificar_inteiro(valor: int, formato: str = "varint") -> bytes:
+    """
+    Inteiro sem sinal em big-endian de tamanho fixo ("u8", "u16", "u32") ou
+    em varint (LEB128: 7 bits por byte, o bit mais alto indica continuação).
+
+    Exceção:
+    • ValueError: Formato desconhecido, valor negativo ou que não cabe no formato.
+    """
+    if formato not in FORMATOS_INTEIRO:
+        raise ValueError(f"Formato de inteiro desconhecido: {formato}")
+    if valor < 0:
+        raise ValueError(f"Inteiro negativo no cabeçalho: {valor}")
+
+    tamanho = FORMATOS_INTEIRO[formato]
+    if tamanho is not None:
+        if valor >> (8 * tamanho):
+            raise ValueError(f"{valor} não cabe em {formato}")
+        return valor.to_bytes(tamanho, byteorder='big')
+
+    saida = bytearray()
+    while True:
+        parte = valor & 0x7F
+        valor >>= 7
+        if valor:
+            saida.append(parte | 0x80)
+        else:
+            saida.append(parte)
+            return bytes(saida)
+
+
+def decodificar_inteiro(dados: bytes, inicio: int = 0, formato: str = "varint"):
+    """
+    Lê um inteiro gravado por codificar_inteiro a partir de dados[inicio].
+
+    Retorna:
+    • (valor, fim): O inteiro e a posição do primeiro byte após ele.
+
+    Exceção:
+    • ValueError: Formato desconhecido ou dados insuficientes.
+    """
+    if formato not in FORMATOS_INTEIRO:
+        raise ValueError(f"Formato de inteiro desconhecido: {formato}")
+
+    tamanho = FORMATOS_INTEIRO[formato]
+    if tamanho is not None:
+        fim = inicio + tamanho
+        if fim > len(dados):
+            raise ValueError("Cabeçalho incompleto")
+        return int.from_bytes(dados[inicio:fim], byteorder='big'), fim
+
+    valor = 0
+    deslocamento = 0
+    for posicao in range(inicio, len(dados)):
+        valor |= (dados[posicao] & 0x7F) << deslocamento
+        if not dados[posicao] & 0x80:
+            return valor, posicao + 1
+        deslocamento += 7
+        # Acima de 64 bits só pode ser lixo (quadro corrompido)
+        if deslocamento > 63:
+            break
+    raise ValueError("Varint incompleto ou inválido")
+
+
+# Flag e escape padrão da inserção de bytes
+FLAG = b'\x7E'
+ESC = b'\x7D'
+
+
+# ===================== CONTAGEM DE CARACTERES =====================
+def enquadrar_contagem_caracteres(dado: bytes, formato: str = "varint") -> bytes:
 
     """
     Enquadramento por contagem de caracteres.
 
     Dinâmica:
-        Remove o primeiro byte (que indica o tamanho do quadro) e retorna o restante.
+        Coloca antes do payload o tamanho total do quadro (cabeçalho + payload).
+
+    O tamanho é gravado como varint por padrão, então quadros com menos de
+    128 bytes continuam com um único byte de cabeçalho e não há limite de
+    tamanho. Com "u8", "u16" ou "u32" o cabeçalho tem tamanho fixo.
 
     Parâmetros:
     • bytes: Apenas o payload (dados da camada de aplicação).
+    • formato (str): Um dos FORMATOS_INTEIRO.
 
     Retorna:
-    • quadro (bytes): Quadro com o byte de tamanho seguido do payload.
+    • quadro (bytes): Quadro com o tamanho seguido do payload.
+    """
+    return cabecalho_contagem(len(dado), formato) + dado
+
+
+def cabecalho_contagem(tamanho_carga: int, formato: str = "varint") -> bytes:
     """
-    
-    tamanho = len(dado) + 1
-    tamanho_byte = tamanho.to_bytes(1, byteorder='big')
-    quadro = tamanho_byte + dado
-    return quadro
+    Cabeçalho da contagem de caracteres para uma carga de 'tamanho_carga' bytes.
+    """
+    # O tamanho inclui o próprio cabeçalho; no varint o cabeçalho pode crescer
+    # um byte ao somar o seu tamanho, então repete até estabilizar
+    tamanho_cabecalho = 1
+    while True:
+        cabecalho = codificar_inteiro(tamanho_carga + tamanho_cabecalho, formato)
+        if len(cabecalho) == tamanho_cabecalho:
+            return cabecalho
+        tamanho_cabecalho = len(cabecalho)
 
 
-def desenquadrar_contagem_caracteres(quadro: bytes) -> bytes:
+def desenquadrar_contagem_caracteres(quadro: bytes, formato: str = "varint") -> bytes:
     """
     Desfaz o enquadramento por contagem de caracteres.
 
     Dinâmica:
-        Remove o primeiro byte (que indica o tamanho do quadro) e retorna o restante.
+        Lê o tamanho do quadro no cabeçalho e retorna o payload que ele delimita.
 
     Parâmetros:
-    • quadro (bytes): Quadro com o byte de tamanho seguido do payload.
+    • quadro (bytes): Quadro com o tamanho seguido do payload (bytes a mais
+      depois do quadro, como o preenchimento da modulação, são ignorados).
+    • formato (str): O mesmo usado no enquadramento.
 
     Retorna:
     • bytes: Apenas o payload (dados da camada de aplicação).
+
+    Exceção:
+    • ValueError: Se o tamanho anotado não for coerente com o quadro recebido.
+    """
+    inicio, fim = limites_contagem(quadro, formato)
+    return bytes(quadro[inicio:fim])
+
+
+def limites_contagem(quadro, formato: str = "varint"):
     """
-    return quadro[1:]  # Remove primeiro byte
+    Retorna:
+    • (inicio, fim): Posição da carga dentro de um quadro de contagem de caracteres.
 
+    Exceção:
+    • ValueError: Se o tamanho anotado não for coerente com o quadro recebido.
+    """
+    tamanho, inicio = decodificar_inteiro(quadro, 0, formato)
+    if tamanho < inicio or tamanho > len(quadro):
+        raise ValueError(f"Contagem de caracteres inválida: {tamanho} (quadro com {len(quadro)} bytes)")
+    return inicio, tamanho
 
 
-def enquadrar_flag_insercao_byte(dado: bytes, flag=b'\x7E', esc=b'\x7D') -> bytes:
+def enquadrar_flag_insercao_byte(dado: bytes, flag=FLAG, esc=ESC) -> bytes:
     """
     Enquadramento por inserção de bytes.
 
     Dinâmica:
         - Adiciona uma flag no início e no final da mensagem.
-        - Se a flag aparece na mensagem, insere caractere de escape antes.
         - Se o escape aparece na mensagem, duplica o escape.
+        - Se a flag aparece na mensagem, insere caractere de escape antes.
+
+    Cada substituição é uma única passada de bytes.replace (O(n)). O escape
+    é tratado primeiro para que os escapes inseridos antes das flags não
+    sejam duplicados.
 
     Retorna:
     • bytes: Quadro enquadrado.
     """
-    if flag in dado:
-        esc_pos = Utils.findall(esc, dado)
-        for pos in range(len(esc_pos)):
-            offset = len(esc) * pos
-            dado = dado[:(esc_pos[pos] + offset)] + esc + dado[(esc_pos[pos] + offset):]
-
-        flag_pos = Utils.findall(flag, dado)
-        for pos in range(len(flag_pos)):
-            offset = len(esc) * pos
-            dado = dado[:(flag_pos[pos] + offset)] + esc + dado[(flag_pos[pos] + offset):]
-
+    dado = bytes(dado).replace(esc, esc + esc).replace(flag, esc + flag)
     return flag + dado + flag
 
 
-def desenquadrar_flag_insercao_byte(quadro: bytes, flag=b'\x7E', esc=b'\x7D') -> bytes:
+def desenquadrar_flag_insercao_byte(quadro: bytes, flag=FLAG, esc=ESC) -> bytes:
     """
     Desenquadramento por inserção de bytes.
 
     Remove flags e processa os caracteres de escape restaurando o conteúdo original.
     """
-    if not (quadro.startswith(flag) and quadro.endswith(flag)):
+    if not (quadro.startswith(flag) and quadro.endswith(flag)) or len(quadro) < 2 * len(flag):
         raise ValueError("Flags de início/fim ausentes")
 
-    quadro = quadro[len(flag):-len(flag)]
+    quadro = bytes(quadro[len(flag):-len(flag)])
 
-    resultado = bytearray()
-    i = 0
-    n = len(quadro)
+    # Um escape no fim só é incompleto se não for o segundo de um par
+    sem_escapes_finais = quadro.rstrip(esc)
+    if ((len(quadro) - len(sem_escapes_finais)) // len(esc)) % 2:
+        raise ValueError("Escape incompleto no fim do quadro")
 
-    while i < n:
-        if quadro[i:i+1] == esc:
-            if i + 1 >= n:
-                raise ValueError("Escape incompleto no fim do quadro")
-            resultado.append(quadro[i+1])
-            i += 2
-        else:
-            resultado.append(quadro[i])
-            i += 1
+    # Cada escape é trocado pelo byte que ele protege, numa única passada
+    return _padrao_escape(esc).sub(rb"\1", quadro)
 
-    return bytes(resultado)
 
+def _padrao_escape(esc):
+    if esc not in _PADROES_ESCAPE:
+        _PADROES_ESCAPE[esc] = re.compile(re.escape(esc) + b"(.)", re.DOTALL)
+    return _PADROES_ESCAPE[esc]
 
-def enquadrar_flag_insercao_bit(dado: bytes) -> bytes:
+
+_PADROES_ESCAPE = {}
+
+
+class DesenquadradorBytes:
     """
-    Enquadra usando bit stuffing com FLAG 0x7E (01111110).
-    Atenção: O último byte do quadro pode ficar incompleto.
+    Desenquadrador incremental para inserção de bytes.
+
+    alimentar() aceita trechos de qualquer tamanho (um quadro pode chegar
+    partido em vários trechos, ou vários quadros num só) e devolve os
+    quadros que se fecharam, já sem flags e escapes. Só as posições de flag
+    e de escape são visitadas em Python; os bytes comuns entre elas são
+    copiados por fatias.
+
+    Cada flag fecha o quadro em andamento e abre o próximo, então tanto
+    "F d1 F d2 F" quanto "F d1 F F d2 F" produzem d1 e d2. Quadros vazios
+    (flags seguidas) e bytes antes da primeira flag são descartados.
     """
-    FLAG = b'\x7E'
 
-    # Converte o objeto bytes em uma única string de bits
-    bit_str = ''.join(f'{byte:08b}' for byte in dado)
+    def __init__(self, flag=FLAG, esc=ESC):
+        if len(flag) != 1 or len(esc) != 1:
+            raise ValueError("O desenquadrador incremental exige flag e escape de um byte")
+        self.flag = flag[0]
+        self.esc = esc[0]
+        self._especiais = re.compile(b"[" + re.escape(flag) + re.escape(esc) + b"]")
+        self._dentro = False
+        self._escape = False
+        self._atual = bytearray()
+
+    def alimentar(self, trecho) -> list:
+        """
+        Processa mais um trecho recebido.
+
+        Retorna:
+        • list[bytes]: Quadros completos encontrados (pode ser vazia).
+        """
+        trecho = bytes(trecho)
+        quadros = []
+        inicio = 0
+
+        for achado in self._especiais.finditer(trecho):
+            posicao = achado.start()
+            if self._escape:
+                self._escape = False
+                # O byte logo após o escape é literal, mesmo sendo flag ou escape
+                if posicao == inicio:
+                    continue
+
+            if trecho[posicao] == self.esc:
+                if self._dentro:
+                    self._atual += trecho[inicio:posicao]
+                    self._escape = True
+                inicio = posicao + 1
+                continue
+
+            # Flag: fecha o quadro atual (se houver) e abre o próximo
+            if self._dentro:
+                self._atual += trecho[inicio:posicao]
+                if self._atual:
+                    quadros.append(bytes(self._atual))
+                self._atual.clear()
+            self._dentro = True
+            inicio = posicao + 1
+
+        if self._escape and inicio < len(trecho):
+            self._escape = False
+        if self._dentro:
+            self._atual += trecho[inicio:]
+        return quadros
+
+    def reiniciar(self):
+        """
+        Descarta o quadro parcial e volta a procurar uma flag.
+        """
+        self._dentro = False
+        self._escape = False
+        self._atual.clear()
+
+
+# Flag HDLC 01111110 (0x7E) como array de bits
+FLAG_BITS = BitBuffer.de_bytes(b'\x7E').bits()
+_PESOS_BYTE = 1 << np.arange(7, -1, -1)
+
+
+def _sequencias_de_uns(bits):
+    """
+    Início e comprimento de cada sequência de 1s consecutivos.
+    """
+    bordas = np.diff(np.concatenate(([0], bits, [0])).astype(np.int8))
+    inicios = np.flatnonzero(bordas == 1)
+    fins = np.flatnonzero(bordas == -1)
+    return inicios, fins - inicios
 
-    bits_preenchidos = []
-    cont_1bit = 0
 
-    for bit in bit_str:
-        bits_preenchidos.append(bit)
-        
-        if bit == '1':
-            cont_1bit += 1
-        else:
-            cont_1bit = 0
+def inserir_bits(bits) -> np.ndarray:
+    """
+    Bit stuffing: insere um 0 após cada cinco 1s consecutivos.
 
-        # Regra de Stuffing: Insere '0' após o quinto '1' consecutivo
-        if cont_1bit == 5:
-            bits_preenchidos.append('0')
-            cont_1bit = 0
-            
-    bit_string_final = ''.join(bits_preenchidos)
-    
-    bytes_preenchidos = bytes(
-        int(bit_string_final[i:i+8], 2)
-        for i in range(0, len(bit_string_final), 8)
-    )
+    Numa sequência de L uns que começa em i, os zeros entram depois das
+    posições i+4, i+9, ..., ou seja, L // 5 inserções por sequência.
+    """
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    inicios, comprimentos = _sequencias_de_uns(bits)
+    quantos = comprimentos // 5
 
-    return FLAG + bytes_preenchidos + FLAG
+    # Posições (no array original) antes das quais um 0 é inserido
+    sequencia = np.repeat(np.arange(len(inicios)), quantos)
+    ordem = np.arange(len(sequencia)) - np.repeat(np.cumsum(quantos) - quantos, quantos)
+    posicoes = inicios[sequencia] + 5 * (ordem + 1)
+    return np.insert(bits, posicoes, 0)
 
 
-def desenquadrar_flag_insercao_bit(quadro: bytes) -> bytes:
+def remover_bits(bits) -> np.ndarray:
     """
-    Desfaz o bit stuffing removendo a FLAG 0x7E e removendo os bits inseridos.
+    Desfaz o bit stuffing: remove o 0 que segue cada cinco 1s consecutivos.
+
+    Exceção:
+    • ValueError: Se houver seis ou mais 1s seguidos (flag ou abort no meio
+      dos dados) ou se faltar o 0 inserido após cinco 1s.
     """
-    FLAG = b'\x7E'
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    inicios, comprimentos = _sequencias_de_uns(bits)
+    if np.any(comprimentos > 5):
+        raise ValueError("Seis ou mais bits 1 seguidos dentro do quadro")
+
+    removidos = inicios[comprimentos == 5] + 5
+    if len(removidos) and removidos[-1] >= len(bits):
+        raise ValueError("Bit de stuffing ausente no fim do quadro")
+    return np.delete(bits, removidos)
 
-    if quadro[:1] != FLAG or quadro[-1:] != FLAG:
-        raise ValueError("FLAG de delimitação ausente")
 
-    quadro = quadro[1:-1]
+def localizar_flags(bits) -> np.ndarray:
+    """
+    Posições (em bits) de todas as ocorrências de 01111110 no fluxo, em
+    qualquer alinhamento, inclusive flags que compartilham o 0 final.
+    """
+    bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+    if len(bits) < 8:
+        return np.zeros(0, dtype=np.int64)
+    janelas = np.lib.stride_tricks.sliding_window_view(bits, 8)
+    return np.flatnonzero(janelas @ _PESOS_BYTE == 0x7E)
 
-    bit_str = ''.join(f'{byte:08b}' for byte in quadro)
 
-    bits_desenquadrados = []
-    cont_1bit = 0
-    i = 0
+def enquadrar_bits_insercao(dado: bytes) -> np.ndarray:
+    """
+    Enquadra com bit stuffing e devolve o quadro exato em bits:
+    FLAG + dados com stuffing + FLAG, sem preenchimento.
+    """
+    bits = BitBuffer.de_bytes(dado).bits()
+    return np.concatenate((FLAG_BITS, inserir_bits(bits), FLAG_BITS))
 
-    while i < len(bit_str):
-        bit = bit_str[i]
-        bits_desenquadrados.append(bit)
 
-        if bit == '1':
-            cont_1bit += 1
-            if cont_1bit == 5:
-                i += 1
-                cont_1bit = 0
-        else:
-            cont_1bit = 0
+def _carga_entre_flags(bits):
+    # Devolve os bytes da carga, ou None se o trecho não for um quadro válido
+    try:
+        carga = remover_bits(bits)
+    except ValueError:
+        return None
+    if len(carga) == 0 or len(carga) % 8 != 0:
+        return None
+    return BitBuffer.de_bits(carga).tobytes()
 
-        i += 1
 
-    while len(bits_desenquadrados) % 8 != 0:
-        bits_desenquadrados.pop()
+def enquadrar_flag_insercao_bit(dado: bytes) -> bytes:
+    """
+    Enquadra usando bit stuffing com FLAG 0x7E (01111110).
+
+    O quadro em bits (enquadrar_bits_insercao) é empacotado em bytes; os
+    bits que completam o último byte vêm depois da flag final e são
+    ignorados pelo desenquadrador, que localiza a flag bit a bit.
+    """
+    return BitBuffer.de_bits(enquadrar_bits_insercao(dado)).tobytes()
+
+
+def desenquadrar_flag_insercao_bit(quadro: bytes) -> bytes:
+    """
+    Desfaz o bit stuffing removendo a FLAG 0x7E e removendo os bits inseridos.
 
-    dados = bytes(
-        int(''.join(bits_desenquadrados[i:i+8]), 2)
-        for i in range(0, len(bits_desenquadrados), 8)
-    )
+    A flag de abertura deve estar no início do quadro; a de fechamento é a
+    próxima ocorrência de 01111110 em qualquer posição de bit.
+    """
+    bits = BitBuffer.de_bytes(quadro).bits()
+    flags = localizar_flags(bits)
+
+    if len(flags) == 0 or flags[0] != 0:
+        raise ValueError("FLAG de delimitação ausente")
+    fechamentos = flags[flags >= 8]
+    if len(fechamentos) == 0:
+        raise ValueError("FLAG de delimitação ausente")
+
+    carga = remover_bits(bits[8:fechamentos[0]])
+    if len(carga) % 8 != 0:
+        raise ValueError("Quadro com número de bits que não forma bytes inteiros")
+    return BitBuffer.de_bits(carga).tobytes()
+
+
+class DesenquadradorBits:
+    """
+    Desenquadrador incremental para um fluxo contínuo de bits (bit stuffing).
+
+    alimentar() recebe trechos de bits de qualquer tamanho, procura flags
+    em qualquer posição de bit e devolve as cargas completas entre flags
+    consecutivas. Trechos entre flags que não formam um quadro válido
+    (vazios, com seis 1s seguidos ou sem bytes inteiros) são descartados e
+    contados em 'descartados'.
+    """
 
-    return dados
+    def __init__(self):
+        # Trechos já varridos (a partir da flag de abertura, se houver) e o total de bits neles
+        self._trechos = []
+        self._n_pendentes = 0
+        # Já encontrou uma flag (e os trechos começam nela)
+        self._aberto = False
+        self.descartados = 0
+
+    def _cauda(self, n: int) -> np.ndarray:
+        # Últimos n bits já varridos, juntando só os trechos necessários
+        partes, faltam = [], n
+        for trecho in reversed(self._trechos):
+            if faltam <= 0:
+                break
+            partes.append(trecho[-faltam:])
+            faltam -= len(partes[-1])
+        return np.concatenate(partes[::-1]) if partes else np.zeros(0, dtype=np.uint8)
+
+    def alimentar(self, bits) -> list:
+        """
+        Processa mais um trecho do fluxo.
+
+        Só o trecho novo e os 7 bits anteriores (onde pode começar uma flag
+        partida entre trechos) são varridos; o quadro aberto fica numa lista
+        de trechos, juntada uma única vez quando a flag de fechamento chega.
+
+        Retorna:
+        • list[bytes]: Cargas dos quadros que se fecharam neste trecho.
+        """
+        novo = np.array(bits, dtype=np.uint8).reshape(-1)
+        cauda = self._cauda(7)
+        flags = localizar_flags(np.concatenate((cauda, novo))) + (self._n_pendentes - len(cauda))
+        self._trechos.append(novo)
+        self._n_pendentes += len(novo)
+
+        # Flags sobrepostas (01111110111111 0) só valem se não começarem dentro da anterior
+        validas = [0] if self._aberto else []
+        for posicao in flags.tolist():
+            if not validas or posicao >= validas[-1] + 7:
+                validas.append(posicao)
+
+        quadros = []
+        if not validas:
+            # Sem flag: guarda só os últimos 7 bits, que podem ser o começo de uma
+            self._trechos = [self._cauda(7)]
+            self._n_pendentes = len(self._trechos[0])
+            return quadros
+        self._aberto = True
+        if len(validas) == 1 and validas[0] == 0:
+            return quadros
+
+        fluxo = np.concatenate(self._trechos)
+        for abertura, fechamento in zip(validas, validas[1:]):
+            trecho = fluxo[abertura + 8:fechamento]
+            if len(trecho) == 0:
+                continue
+            carga = _carga_entre_flags(trecho)
+            if carga is None:
+                self.descartados += 1
+            else:
+                quadros.append(carga)
+
+        # Mantém a partir da última flag, que abre o próximo quadro
+        self._trechos = [fluxo[validas[-1]:].copy()]
+        self._n_pendentes = len(self._trechos[0])
+        return quadros
@@ -1,167 +1,525 @@
-def hamming(dado: bytes) -> bytes:
+import numpy as np
+
+from Bits import BitBuffer
+
+# Bytes no final do quadro com o número de bits originais (big-endian)
+BYTES_TAMANHO = 4
+
+
+class CodigoHamming:
+    """
+    Código de Hamming (n, k) na disposição clássica: as paridades ficam nas
+    posições 1, 2, 4, 8, ... do bloco e os dados nas demais, em ordem.
+
+    O codificador e o decodificador trabalham com matrizes sobre GF(2):
+      • G (k × n): bloco = dados · G (mod 2), todos os blocos de uma vez;
+      • H (r × n): síndrome = bloco · Hᵀ (mod 2). A coluna j de H é a
+        posição j + 1 em binário, e a tabela síndrome → posição do erro é
+        pré-calculada.
+
+    Com 'estendido' (SECDED) um bit de paridade geral é anexado ao fim de
+    cada bloco: erros simples são corrigidos e erros duplos são detectados.
     """
-    Codifica os dados usando o código de Hamming (suporta qualquer tamanho configurável).
+
+    def __init__(self, r: int, estendido: bool = False):
+        if r < 2:
+            raise ValueError(f"Hamming exige ao menos 2 bits de paridade: {r}")
+
+        self.r = r
+        self.estendido = estendido
+        self.n_base = (1 << r) - 1
+        self.k = self.n_base - r
+        self.n = self.n_base + 1 if estendido else self.n_base
+
+        posicoes = np.arange(1, self.n_base + 1)
+        eh_paridade = (posicoes & (posicoes - 1)) == 0
+        self.posicoes_dados = np.flatnonzero(~eh_paridade)
+        self.posicoes_paridade = np.flatnonzero(eh_paridade)
+
+        # H: coluna j = binário de (j + 1); linha i testa o bit 2^i da posição
+        self.H = ((posicoes[np.newaxis, :] >> np.arange(r)[:, np.newaxis]) & 1).astype(np.uint8)
+
+        # G: cada dado vai para a sua posição e entra nas paridades que a cobrem
+        self.G = np.zeros((self.k, self.n_base), dtype=np.uint8)
+        self.G[np.arange(self.k), self.posicoes_dados] = 1
+        self.G[:, self.posicoes_paridade] = self.H[:, self.posicoes_dados].T
+
+        # Peso de cada linha de H na síndrome inteira (bit i -> 2^i)
+        self._pesos_sindrome = (1 << np.arange(r)).astype(np.int64)
+
+        # Síndrome -> índice do bit com erro no bloco (-1 = sem erro)
+        self.tabela_sindrome = np.full(1 << r, -1, dtype=np.int64)
+        for indice in range(self.n_base):
+            sindrome = int(self.H[:, indice] @ self._pesos_sindrome)
+            self.tabela_sindrome[sindrome] = indice
+
+    @property
+    def nome(self):
+        if self.estendido:
+            return f"Hamming SECDED ({self.n},{self.k})"
+        return f"Hamming ({self.n},{self.k})"
+
+    def __repr__(self):
+        return f"CodigoHamming(r={self.r}, estendido={self.estendido})"
+
+    def codificar_bits(self, bits) -> np.ndarray:
+        """
+        Codifica bits (múltiplo de k) em blocos de n bits.
+
+        Retorna:
+        • np.ndarray: Matriz (n_blocos, n) uint8.
+        """
+        dados = np.asarray(bits, dtype=np.uint8).reshape(-1, self.k)
+        # Somas de até k termos em uint8: o estouro (mod 256) preserva a paridade
+        blocos = (dados @ self.G) & 1
+        if self.estendido:
+            geral = np.bitwise_xor.reduce(blocos, axis=1)
+            blocos = np.concatenate((blocos, geral[:, np.newaxis]), axis=1)
+        return blocos
+
+    def decodificar_bits(self, blocos):
+        """
+        Corrige e extrai os dados de uma matriz (n_blocos, n).
+
+        Retorna:
+        • (dados, corrigidos, duplos): bits de dados (n_blocos · k), máscara
+          dos blocos corrigidos e dos blocos com erro duplo detectado (SECDED).
+        """
+        blocos = np.array(blocos, dtype=np.uint8).reshape(-1, self.n)
+        base = blocos[:, :self.n_base]
+
+        sindromes = ((base @ self.H.T) & 1).astype(np.int64) @ self._pesos_sindrome
+        posicao_erro = self.tabela_sindrome[sindromes]
+
+        if self.estendido:
+            paridade_geral = np.bitwise_xor.reduce(blocos, axis=1).astype(bool)
+            # Síndrome não nula com paridade geral correta: dois bits trocados
+            duplos = (sindromes != 0) & ~paridade_geral
+            # Paridade geral errada: erro simples. Com síndrome nula ele está no
+            # próprio bit extra e não há nada a corrigir nos dados
+            corrigir = paridade_geral & (sindromes != 0)
+            corrigidos = paridade_geral
+        else:
+            duplos = np.zeros(len(blocos), dtype=bool)
+            corrigir = sindromes != 0
+            corrigidos = corrigir
+
+        linhas = np.flatnonzero(corrigir)
+        base[linhas, posicao_erro[linhas]] ^= 1
+
+        return base[:, self.posicoes_dados].reshape(-1), corrigidos, duplos
+
+    def _palavra_mais_proxima(self, blocos):
+        """
+        Decisão dura de cada bloco (n_blocos, n) para uma palavra-código válida:
+        corrige o erro indicado pela síndrome e refaz a paridade geral (SECDED).
+        """
+        blocos = np.array(blocos, dtype=np.uint8).reshape(-1, self.n)
+        base = blocos[:, :self.n_base]
+        sindromes = ((base @ self.H.T) & 1).astype(np.int64) @ self._pesos_sindrome
+        linhas = np.flatnonzero(sindromes)
+        base[linhas, self.tabela_sindrome[sindromes[linhas]]] ^= 1
+        if self.estendido:
+            blocos[:, -1] = np.bitwise_xor.reduce(base, axis=1)
+        return blocos
+
+    def decodificar_llr(self, llr, n_bits=None, menos_confiaveis=2):
+        """
+        Decodificação suave (Chase-II) a partir dos LLRs de cada bit
+        (positivo favorece 0), todos os blocos de uma vez.
+
+        Em cada bloco os 'menos_confiaveis' bits de menor |LLR| são
+        invertidos em todas as 2^p combinações; cada tentativa passa pelo
+        decodificador por síndrome, e vence a palavra-código com a menor
+        soma de |LLR| nas posições em que discorda da decisão dura.
+
+        Retorna:
+        • np.ndarray: Bits de dados (uint8), cortados em n_bits se informado.
+        """
+        llr = np.asarray(llr, dtype=np.float64).reshape(-1, self.n)
+        confianca = np.abs(llr)
+        duro = (llr < 0).astype(np.uint8)
+        p = min(menos_confiaveis, self.n)
+
+        # Padrões de teste: todas as combinações dos p bits menos confiáveis
+        padroes = ((np.arange(1 << p)[:, np.newaxis] >> np.arange(p)) & 1).astype(np.uint8)
+        fracos = np.argsort(confianca, axis=1)[:, :p]
+
+        tentativas = np.repeat(duro[:, np.newaxis, :], len(padroes), axis=1)
+        linhas = np.arange(len(llr))[:, np.newaxis, np.newaxis]
+        testes = np.arange(len(padroes))[np.newaxis, :, np.newaxis]
+        tentativas[linhas, testes, fracos[:, np.newaxis, :]] ^= padroes[np.newaxis, :, :]
+
+        candidatas = self._palavra_mais_proxima(tentativas.reshape(-1, self.n)).reshape(tentativas.shape)
+        custo = ((candidatas != duro[:, np.newaxis, :]) * confianca[:, np.newaxis, :]).sum(axis=2)
+        melhores = candidatas[np.arange(len(llr)), np.argmin(custo, axis=1)]
+
+        dados = melhores[:, self.posicoes_dados].reshape(-1)
+        return dados if n_bits is None else dados[:n_bits]
+
+    def codificar(self, dado: bytes) -> bytes:
+        """
+        Bytes -> blocos de Hamming empacotados + BYTES_TAMANHO bytes com o
+        número de bits originais (big-endian).
+        """
+        bits = BitBuffer.de_bytes(dado).bits()
+        total_bits_orig = len(bits)
+
+        # Padding 0 apenas para completar o último bloco de dados
+        padding = (-total_bits_orig) % self.k
+        bits = np.concatenate((bits, np.zeros(padding, dtype=np.uint8)))
+
+        codificado = BitBuffer.de_bits(self.codificar_bits(bits).reshape(-1)).tobytes()
+        return codificado + total_bits_orig.to_bytes(BYTES_TAMANHO, byteorder="big")
+
+    def verificar(self, quadro: bytes) -> bytes:
+        """
+        Corrige os blocos, remove as paridades e o padding.
+
+        Exceção:
+        • ValueError: Se o tamanho anotado não couber no quadro ou se um erro
+          duplo for detectado (SECDED).
+        """
+        if len(quadro) < BYTES_TAMANHO:
+            return b''
+
+        total_bits_orig = int.from_bytes(quadro[-BYTES_TAMANHO:], byteorder="big")
+        bits = BitBuffer.de_bytes(quadro, 8 * (len(quadro) - BYTES_TAMANHO)).bits()
+
+        n_blocos = -(-total_bits_orig // self.k)
+        if n_blocos * self.n > len(bits):
+            raise ValueError("Erro de Hamming: tamanho anotado maior que o quadro.")
+
+        dados, _, duplos = self.decodificar_bits(bits[:n_blocos * self.n])
+        if duplos.any():
+            raise ValueError("Erro de Hamming: erro duplo detectado.")
+
+        return BitBuffer.de_bits(dados[:total_bits_orig]).tobytes()
+
+    def _bytes_codificados(self, n_bytes: int) -> int:
+        # Tamanho da parte codificada de codificar() para n_bytes de dados
+        return -(-(-(-8 * n_bytes // self.k) * self.n) // 8)
+
+    def codificar_lote(self, matriz) -> np.ndarray:
+        """
+        codificar() de cada linha de uma matriz uint8 (quadros de mesmo tamanho),
+        com todos os blocos do lote codificados numa única multiplicação.
+        """
+        matriz = np.asarray(matriz, dtype=np.uint8)
+        n_quadros, total_bits_orig = len(matriz), 8 * matriz.shape[1]
+        bits = np.unpackbits(matriz, axis=1)
+        padding = (-total_bits_orig) % self.k
+        bits = np.concatenate((bits, np.zeros((n_quadros, padding), dtype=np.uint8)), axis=1)
+
+        codificado = np.packbits(self.codificar_bits(bits).reshape(n_quadros, -1), axis=1)
+        tamanho = np.frombuffer(total_bits_orig.to_bytes(BYTES_TAMANHO, byteorder="big"), dtype=np.uint8)
+        return np.concatenate((codificado, np.broadcast_to(tamanho, (n_quadros, BYTES_TAMANHO))), axis=1)
+
+    def verificar_lote(self, matriz):
+        """
+        verificar() de cada linha de uma matriz uint8 (quadros de mesmo tamanho).
+
+        Linhas do mesmo tamanho podem vir de dados com tamanhos diferentes
+        (o último bloco é completado), então vale o tamanho anotado mais comum
+        entre os compatíveis com as linhas. Quadros com outro tamanho anotado
+        são marcados inválidos (CamadaEnlace os verifica um a um), assim como
+        os que têm erro duplo detectado (SECDED).
+
+        Retorna:
+        • (np.ndarray, np.ndarray): Dados de cada linha e máscara dos quadros válidos.
+        """
+        matriz = np.asarray(matriz, dtype=np.uint8)
+        n_quadros = len(matriz)
+        if matriz.shape[1] < BYTES_TAMANHO:
+            return matriz[:, :0], np.ones(n_quadros, dtype=bool)
+
+        n_codificados = matriz.shape[1] - BYTES_TAMANHO
+        # Tamanhos de dados (em bytes) que geram exatamente n_codificados bytes
+        menor = max(0, (8 * (n_codificados - 1) * self.k // self.n - self.k) // 8)
+        candidatos = [8 * b for b in range(menor, n_codificados * self.k // self.n + 2)
+                      if self._bytes_codificados(b) == n_codificados]
+
+        anotado = matriz[:, n_codificados:].astype(np.int64) @ (256 ** np.arange(BYTES_TAMANHO - 1, -1, -1))
+        compativeis = anotado[np.isin(anotado, candidatos)]
+        if len(compativeis) == 0:
+            return matriz[:, :0], np.zeros(n_quadros, dtype=bool)
+        valores, contagens = np.unique(compativeis, return_counts=True)
+        total_bits_orig = int(valores[np.argmax(contagens)])
+        n_blocos = -(-total_bits_orig // self.k)
+        bits = np.unpackbits(matriz[:, :n_codificados], axis=1)[:, :n_blocos * self.n]
+
+        dados, _, duplos = self.decodificar_bits(bits)
+        dados = dados.reshape(n_quadros, -1)[:, :total_bits_orig]
+        validos = (anotado == total_bits_orig) & ~duplos.reshape(n_quadros, n_blocos).any(axis=1)
+        return np.packbits(dados, axis=1), validos
+
+
+# Nome -> código (os nomes são os mesmos usados em CamadaEnlace.CONTROLES_ERRO)
+CODIGOS_HAMMING = {
+    codigo.nome: codigo
+    for codigo in [CodigoHamming(r, estendido) for estendido in (False, True) for r in (3, 4, 5)]
+}
+
+
+def hamming(dado: bytes, codigo: str = "Hamming (7,4)") -> bytes:
+    """
+    Codifica os dados usando o código de Hamming.
 
     Parâmetros:
     • dado (bytes): Dados de entrada a serem codificados.
+    • codigo (str): Um dos CODIGOS_HAMMING: (7,4), (15,11), (31,26) e as
+      variantes SECDED (8,4), (16,11), (32,26).
 
     Retorna:
-    • bytes: Dados codificados com código Hamming.
+    • bytes: Dados codificados com código Hamming, seguidos de 4 bytes com o
+      número de bits originais.
     """
+    return CODIGOS_HAMMING[codigo].codificar(dado)
+
 
-    def calcular_bits_paridade_necessarios(bd: int) -> int:
-        bp = 0
-        while (2 ** bp) < (bd + bp + 1):
-            bp += 1
-        return bp
-
-    def calcular_bits_paridade(bits_completos: list, posicoes_paridade: list) -> list:
-        paridades = []
-        for pos_p in posicoes_paridade:
-            xor = 0
-            for i in range(len(bits_completos)):
-                if (i + 1) & pos_p:  # inclui a própria posição de paridade no cálculo
-                    xor ^= bits_completos[i]
-            paridades.append(xor)
-        return paridades
-
-    # ==============================================================
-    BITS_DADOS_POR_BLOCO = 4          # Alterar aqui para 4, 8, 11, 16, 26, etc.
-    # ==============================================================
-
-    bp = calcular_bits_paridade_necessarios(BITS_DADOS_POR_BLOCO)
-    n = BITS_DADOS_POR_BLOCO + bp      # tamanho total do bloco codificado
-
-    # Converte todos os dados para uma lista unica de bits
-    todos_bits_dados = []
-    for byte in dado:
-        for j in range(7, -1, -1):               
-            todos_bits_dados.append((byte >> j) & 1)
-
-    # Calcula quantos bits validos temos
-    total_bits_orig = len(todos_bits_dados)
-    
-    # Adiciona padding 0 apenas para completar o ultimo bloco de dados (não de codificação!)
-    padding_necessario = (BITS_DADOS_POR_BLOCO - (total_bits_orig % BITS_DADOS_POR_BLOCO)) % BITS_DADOS_POR_BLOCO
-    todos_bits_dados.extend([0] * padding_necessario)
-
-    resultado_bits = []
-
-    # posiçoes 1,2,4,8,...
-    posicoes_paridade = [1 << i for i in range(bp)]  
-
-    i = 0
-    while i < len(todos_bits_dados):
-        # Cria bloco vazio
-        bloco = [0] * n
-
-        # Insere bits de dados nas posições não-paridade
-        pos_dado = 0
-        for pos in range(1, n + 1):
-            if pos not in posicoes_paridade:
-                bloco[pos - 1] = todos_bits_dados[i + pos_dado]
-                pos_dado += 1
-
-        # Calcula e insere paridades
-        paridades = calcular_bits_paridade(bloco, posicoes_paridade)
-        for pos_p, valor in zip(posicoes_paridade, paridades):
-            bloco[pos_p - 1] = valor
-
-        resultado_bits.extend(bloco)
-        i += BITS_DADOS_POR_BLOCO
-
-    # Converte para bytes
-    bytes_codificados = bytearray()
-    for i in range(0, len(resultado_bits), 8):
-        byte = 0
-        for j in range(min(8, len(resultado_bits) - i)):
-            byte |= resultado_bits[i + j] << (7 - j)
-        bytes_codificados.append(byte)
-
-    # Adiciona 2 bytes no final com o numero de bits validos originais
-    # Isso permite ao decodificador saber exatamente onde parar
-    bytes_codificados.append((total_bits_orig >> 8) & 0xFF)
-    bytes_codificados.append(total_bits_orig & 0xFF)
-
-    return bytes(bytes_codificados)
-
-
-def verifica_hamming(quadro: bytes) -> bytes:
+def verifica_hamming(quadro: bytes, codigo: str = "Hamming (7,4)") -> bytes:
     """
     Verifica e corrige os dados codificados com o código de Hamming.
-    Os últimos 2 bytes do quadro contêm o número total de bits originais.
+    Os últimos 4 bytes do quadro contêm o número total de bits originais.
 
     Parâmetros:
         quadro (bytes): Dados codificados com Hamming.
+        codigo (str): O mesmo código usado na codificação.
 
     Retorna:
         bytes: Dados corrigidos e decodificados (sem bits de paridade).
     """
+    return CODIGOS_HAMMING[codigo].verificar(quadro)
+
+
+class CodigoConvolucional:
+    """
+    Código convolucional de taxa 1/n (por padrão o K=7, geradores 171/133
+    em octal), com puncionamento opcional e decodificador de Viterbi.
 
-    def calcular_bits_paridade_necessarios(bd: int) -> int:
-        bp = 0
-        while (2 ** bp) < (bd + bp + 1):
-            bp += 1
-        return bp
-
-    # ==============================================================
-    BITS_DADOS_POR_BLOCO = 4
-    # ==============================================================
-
-    bp = calcular_bits_paridade_necessarios(BITS_DADOS_POR_BLOCO)
-    n = BITS_DADOS_POR_BLOCO + bp
-
-    if len(quadro) < 2:
-        return b''
-
-    total_bits_orig = quadro[-2] | (quadro[-1] << 8)
-    quadro_bits = quadro[:-2]  # remove os 2 bytes de metadado
-
-    # Converte para lista de bits
-    bits = []
-    for byte in quadro_bits:
-        for j in range(7, -1, -1):
-            bits.append((byte >> j) & 1)
-
-    posicoes_paridade = [1 << i for i in range(bp)]
-    dados_extraidos = []
-
-    for inicio in range(0, len(bits), n):
-        bloco = bits[inicio:inicio + n]
-        if len(bloco) < n:
-            break
-
-        # Calcula sindrome
-        sindrome = 0
-        for pos_p in posicoes_paridade:
-            xor = 0
-            for i in range(n):
-                if (i + 1) & pos_p:
-                    xor ^= bloco[i]
-            if xor:
-                sindrome |= pos_p
-
-        # Corrige se necessario
-        if 1 <= sindrome <= n:
-            bloco[sindrome - 1] ^= 1
-
-        # Extrai apenas bits de dados
-        for i in range(n):
-            if (i + 1) not in posicoes_paridade:
-                dados_extraidos.append(bloco[i])
-
-        if len(dados_extraidos) >= total_bits_orig:
-            break
-
-    # Remove padding que pode ter sido adicionado
-    dados_extraidos = dados_extraidos[:total_bits_orig]
-
-    # Converte de volta para bytes
-    resultado = bytearray()
-    for i in range(0, len(dados_extraidos), 8):
-        byte = 0
-        for j in range(min(8, len(dados_extraidos) - i)):
-            byte |= dados_extraidos[i + j] << (7 - j)
-        resultado.append(byte)
-
-    return bytes(resultado)
\ No newline at end of file
+    O registro tem K bits: o bit atual no mais significativo, seguido dos
+    K-1 anteriores (o estado). Cada gerador, em octal, marca as derivações
+    do registro, com o bit mais significativo sendo o atraso zero. O quadro
+    é terminado com K-1 zeros, então a treliça começa e termina no estado 0.
+
+    Valores de entrada do decodificador são LLRs: positivo favorece o bit
+    0 e negativo o bit 1. Decisões duras são convertidas para ±1, e as
+    posições removidas pelo puncionamento entram como 0 (apagamento).
+    """
+
+    # Passos do somar-comparar-selecionar entre rastreios e quantos passos
+    # antes do fim do bloco ainda não são entregues (bem acima dos 5·K usuais,
+    # que não bastam para as versões puncionadas)
+    PASSOS_POR_BLOCO = 256
+    PROFUNDIDADE_RASTREIO = 96
+
+    def __init__(self, geradores=(0o171, 0o133), K=7, puncionamento=None, nome=None):
+        self.geradores = tuple(geradores)
+        self.K = K
+        self.n_saidas = len(self.geradores)
+        self.n_estados = 1 << (K - 1)
+        self.nome = nome
+
+        # Derivações de cada gerador, do atraso 0 ao atraso K-1 (para np.convolve)
+        self._derivacoes = np.array([[(g >> (K - 1 - j)) & 1 for j in range(K)] for g in self.geradores],
+                                    dtype=np.uint8)
+
+        # Matriz de puncionamento (n_saidas × período); 1 = bit transmitido
+        if puncionamento is None:
+            puncionamento = np.ones((self.n_saidas, 1), dtype=np.uint8)
+        self.puncionamento = np.asarray(puncionamento, dtype=bool)
+        if self.puncionamento.shape[0] != self.n_saidas:
+            raise ValueError("A matriz de puncionamento deve ter uma linha por gerador")
+        self.taxa = self.puncionamento.shape[1] / int(self.puncionamento.sum())
+
+        # Treliça: o estado s' chega de s = ((s' << 1) & máscara) | x, x ∈ {0, 1},
+        # e o registro completo nessa transição é (s' << 1) | x
+        destinos = np.arange(self.n_estados)
+        registros = (destinos[:, np.newaxis] << 1) | np.arange(2)
+        self._antecessores = registros & (self.n_estados - 1)
+        self._bit_entrada = (destinos >> (K - 2)).astype(np.uint8)
+
+        saidas = np.array([[[bin(int(r) & g).count("1") & 1 for g in self.geradores] for r in linha]
+                           for linha in registros], dtype=np.float64)
+        # Bit 0 -> +1, bit 1 -> -1; a métrica do ramo é a correlação com os LLRs
+        self._sinais = (1 - 2 * saidas).reshape(self.n_estados * 2, self.n_saidas)
+
+    def __repr__(self):
+        return f"CodigoConvolucional({self.nome or self.geradores!r}, taxa={self.taxa:.3f})"
+
+    def _mascara(self, n_passos):
+        periodo = self.puncionamento.shape[1]
+        repeticoes = -(-n_passos // periodo)
+        # Ordem de transmissão: as saídas de cada passo, passo a passo
+        return np.tile(self.puncionamento, (1, repeticoes))[:, :n_passos].T.reshape(-1)
+
+    def _transmitidos(self, n_passos: int) -> int:
+        # Bits que sobram do puncionamento em n_passos passos da treliça
+        periodo = self.puncionamento.shape[1]
+        completos, resto = divmod(n_passos, periodo)
+        return int(completos * self.puncionamento.sum() + self.puncionamento[:, :resto].sum())
+
+    def _mascara_trecho(self, inicio: int, n_passos: int):
+        # Como _mascara, para os passos inicio .. inicio + n_passos - 1
+        colunas = (inicio + np.arange(n_passos)) % self.puncionamento.shape[1]
+        return self.puncionamento[:, colunas].T.reshape(-1)
+
+    def tamanho_codificado(self, n_bits: int) -> int:
+        """
+        Bits transmitidos para n_bits de dados (já com a terminação).
+        """
+        return self._transmitidos(n_bits + self.K - 1)
+
+    def codificar_bits(self, bits) -> np.ndarray:
+        """
+        Bits de dados -> bits codificados, terminados e puncionados.
+        """
+        bits = np.asarray(bits, dtype=np.uint8).reshape(-1)
+        entrada = np.concatenate((bits, np.zeros(self.K - 1, dtype=np.uint8)))
+        saidas = np.stack([np.convolve(entrada, d)[:len(entrada)] & 1 for d in self._derivacoes], axis=1)
+        return saidas.reshape(-1)[self._mascara(len(entrada))].astype(np.uint8)
+
+    def decodificar(self, valores, n_bits: int, suave: bool = True) -> np.ndarray:
+        """
+        Decodificador de Viterbi com rastreio em janela deslizante.
+
+        As métricas dos ramos são calculadas a cada bloco de PASSOS_POR_BLOCO
+        passos, e só ficam guardadas as decisões do bloco e das últimas
+        PROFUNDIDADE_RASTREIO: ao fim de cada bloco o rastreio parte do melhor
+        estado e entrega os bits mais antigos que essa profundidade (a essa
+        distância os sobreviventes já convergiram). Assim a memória de trabalho
+        não cresce com o quadro. Quadros de até PASSOS_POR_BLOCO passos têm um
+        único rastreio, a partir do estado 0.
+
+        Parâmetros:
+        • valores: LLRs (suave=True) ou bits 0/1 (suave=False), de um quadro
+          ou de um lote com formato (n_quadros, tamanho_codificado).
+        • n_bits (int): Bits de dados de cada quadro.
+
+        Retorna:
+        • np.ndarray: Bits decodificados (uint8), no mesmo formato de entrada.
+        """
+        valores = np.asarray(valores)
+        lote = valores.ndim == 2
+        valores = np.atleast_2d(valores)
+        n_quadros = len(valores)
+
+        n_passos = n_bits + self.K - 1
+        esperado = self._transmitidos(n_passos)
+        if valores.shape[1] != esperado:
+            raise ValueError(f"Esperados {esperado} valores codificados, recebidos {valores.shape[1]}")
+
+        profundidade = self.PROFUNDIDADE_RASTREIO
+        metricas = np.full((n_quadros, self.n_estados), -np.inf)
+        metricas[:, 0] = 0.0
+        decisoes = np.empty((profundidade + self.PASSOS_POR_BLOCO, n_quadros, self.n_estados), dtype=np.uint8)
+        bits = np.empty((n_quadros, n_passos), dtype=np.uint8)
+        # decisoes[:guardadas] são as dos passos base .. base + guardadas - 1
+        base = guardadas = posicao = 0
+
+        for inicio in range(0, n_passos, self.PASSOS_POR_BLOCO):
+            n = min(self.PASSOS_POR_BLOCO, n_passos - inicio)
+
+            # Desfaz o puncionamento do bloco: posições não transmitidas ficam com LLR 0
+            mascara = self._mascara_trecho(inicio, n)
+            trecho = valores[:, posicao:posicao + int(mascara.sum())].astype(np.float64)
+            posicao += trecho.shape[1]
+            if not suave:
+                trecho = 1 - 2 * trecho
+            completos = np.zeros((n_quadros, len(mascara)))
+            completos[:, mascara] = trecho
+
+            # Métricas dos ramos do bloco: (quadros, passos, estados, 2)
+            ramos = (completos.reshape(n_quadros, n, self.n_saidas) @ self._sinais.T).reshape(
+                n_quadros, n, self.n_estados, 2)
+
+            # Somar-comparar-selecionar em todos os estados (e quadros) a cada passo
+            for t in range(n):
+                candidatos = metricas[:, self._antecessores] + ramos[:, t]
+                escolha = candidatos[..., 1] > candidatos[..., 0]
+                decisoes[guardadas + t] = escolha
+                metricas = np.where(escolha, candidatos[..., 1], candidatos[..., 0])
+                metricas -= metricas.max(axis=1, keepdims=True)
+            guardadas += n
+
+            if inicio + n < n_passos and guardadas > profundidade:
+                entregues = guardadas - profundidade
+                self._rastrear(decisoes[:guardadas], metricas.argmax(axis=1), bits[:, base:base + entregues])
+                decisoes[:profundidade] = decisoes[entregues:guardadas]
+                base += entregues
+                guardadas = profundidade
+
+        # Último rastreio a partir do estado 0 (terminação)
+        self._rastrear(decisoes[:guardadas], np.zeros(n_quadros, dtype=np.int64), bits[:, base:])
+
+        bits = bits[:, :n_bits]
+        return bits if lote else bits[0]
+
+    def _rastrear(self, decisoes, estado, saida):
+        """
+        Percorre as decisões de trás para frente a partir de 'estado' (um por
+        quadro) e grava em saida[:, t] os bits dos saida.shape[1] primeiros passos.
+        """
+        quadros = np.arange(len(estado))
+        for t in range(len(decisoes) - 1, -1, -1):
+            if t < saida.shape[1]:
+                saida[:, t] = self._bit_entrada[estado]
+            estado = self._antecessores[estado, decisoes[t, quadros, estado]]
+
+    def codificar(self, dado: bytes) -> bytes:
+        """
+        Bytes -> bits codificados empacotados + BYTES_TAMANHO bytes com o
+        número de bits originais (big-endian).
+        """
+        bits = BitBuffer.de_bytes(dado).bits()
+        codificado = BitBuffer.de_bits(self.codificar_bits(bits)).tobytes()
+        return codificado + len(bits).to_bytes(BYTES_TAMANHO, byteorder="big")
+
+    def verificar(self, quadro: bytes) -> bytes:
+        """
+        Decodifica (decisão dura) um quadro gerado por codificar().
+
+        Exceção:
+        • ValueError: Se o tamanho anotado não couber no quadro.
+        """
+        if len(quadro) < BYTES_TAMANHO:
+            return b''
+
+        total_bits_orig = int.from_bytes(quadro[-BYTES_TAMANHO:], byteorder="big")
+        bits = BitBuffer.de_bytes(quadro, 8 * (len(quadro) - BYTES_TAMANHO)).bits()
+
+        # Taxa < 1: o quadro tem sempre mais bits que os dados (evita montar máscaras enormes
+        # quando o próprio tamanho anotado chegou corrompido)
+        if total_bits_orig > len(bits) or self.tamanho_codificado(total_bits_orig) > len(bits):
+            raise ValueError("Erro convolucional: tamanho anotado maior que o quadro.")
+
+        dados = self.decodificar(bits[:self.tamanho_codificado(total_bits_orig)], total_bits_orig, suave=False)
+        return BitBuffer.de_bits(dados).tobytes()
+
+
+# Padrões de puncionamento usuais do código K=7 (171, 133)
+CODIGOS_CONVOLUCIONAIS = {
+    "Convolucional 1/2": CodigoConvolucional(nome="Convolucional 1/2"),
+    "Convolucional 2/3": CodigoConvolucional(puncionamento=[[1, 1], [1, 0]], nome="Convolucional 2/3"),
+    "Convolucional 3/4": CodigoConvolucional(puncionamento=[[1, 1, 0], [1, 0, 1]], nome="Convolucional 3/4"),
+}
+
+
+def convolucional(dado: bytes, codigo: str = "Convolucional 1/2") -> bytes:
+    """
+    Codifica os dados com um dos CODIGOS_CONVOLUCIONAIS.
+
+    Retorna:
+    • bytes: Bits codificados empacotados, seguidos de 4 bytes com o número de bits originais.
+    """
+    return CODIGOS_CONVOLUCIONAIS[codigo].codificar(dado)
+
+
+def verifica_convolucional(quadro: bytes, codigo: str = "Convolucional 1/2") -> bytes:
+    """
+    Decodifica com Viterbi (decisão dura) um quadro gerado por convolucional().
+
+    Retorna:
+        bytes: Dados decodificados.
+    """
+    return CODIGOS_CONVOLUCIONAIS[codigo].verificar(quadro)
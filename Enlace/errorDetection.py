@@ -1,4 +1,8 @@
-import Utils
+import numpy as np
+
+from Bits import BitBuffer, contar_uns_por_linha
+from Enlace.crcTabelado import CRC
+from Enlace.somaVerificacao import soma_preset
 
 def bit_de_paridade_par(quadro: bytes) -> bytes:
     """
@@ -15,11 +19,8 @@ def bit_de_paridade_par(quadro: bytes) -> bytes:
     Retorna:
         bytes: Quadro com o bit de paridade par.
     """
-    # Converte para bits e remove espaços
-    bits = Utils.byte_formarter(quadro).replace(" ", "")
-
     # Se número de '1' for ímpar → adiciona bit 1
-    if bits.count("1") % 2 != 0:
+    if BitBuffer.de_bytes(quadro).contar_uns() % 2 != 0:
         return quadro + b"\x01"
     else:
         return quadro + b"\x00"
@@ -38,11 +39,8 @@ def verifica_bit_de_paridade_par(quadro: bytes) -> bytes:
     Exceção:
         ValueError: Se o número de bits '1' for ímpar (erro detectado).
     """
-    # Converte para bits
-    bits = Utils.byte_formarter(quadro).replace(" ", "")
-
     # Número de '1' deve ser PAR
-    if bits.count("1") % 2 != 0:
+    if BitBuffer.de_bytes(quadro).contar_uns() % 2 != 0:
         raise ValueError("Erro de paridade! Número ímpar de bits 1.")
 
     # Remove último byte (bit de paridade)
@@ -52,25 +50,16 @@ def checksum(quadro: bytes) -> bytes:
     """
     Calcula o Checksum
 
+    Soma em complemento de um de 8 bits (o vai-um volta ao bit menos
+    significativo), calculada por redução em Enlace.somaVerificacao.
+
     Parâmetro:
         quadro (bytes): Quadro contendo o byte
 
     Retorna:
         bytes: Quadro original + 1 byte checksum
     """
-    soma = 0
-    
-    for byte in quadro:
-        soma += byte
-        
-        # Se a soma passar de 8 bits, o bit de "carry" deve ser somado de volta no bit menos significativo.
-        while soma > 0xFF:
-            soma = (soma & 0xFF) + (soma >> 8)
-
-    # Calcula o complemento (inverte os bits) e garante a máscara 0xFF
-    checksum_val = ~soma & 0xFF
-
-    return quadro + checksum_val.to_bytes(1, byteorder='big')
+    return bytes(quadro) + soma_preset("Checksum-8").update(quadro).digest()
 
 def verifica_checksum(quadro: bytes) -> bytes:
     """
@@ -87,26 +76,50 @@ def verifica_checksum(quadro: bytes) -> bytes:
     Retorna:
         bytes: Quadro contendo o byte
     """
-    soma = 0
-    
-    for byte in quadro:
-        soma += byte
-        while soma > 0xFF:
-            soma = (soma & 0xFF) + (soma >> 8)
-            
     # Complemento do resultado final
-    resultado = ~soma & 0xFF
-
-    if resultado != 0:
+    if soma_preset("Checksum-8").update(quadro).valor() != 0:
         raise ValueError("Erro de Checksum detectado!")
         
     # Retorna os dados removendo o byte de checksum do final
     return quadro[:-1]
 
+def soma_por_nome(quadro: bytes, nome: str = "Internet") -> bytes:
+    """
+    Anexa ao quadro uma soma de verificação de Enlace.somaVerificacao.PRESETS_SOMA
+    ("Internet" da RFC 1071, "Fletcher-16", "Fletcher-32", "Adler-32").
+
+    Retorna:
+        bytes: O quadro original concatenado com a soma (big-endian).
+    """
+    return bytes(quadro) + soma_preset(nome).update(quadro).digest()
+
+
+def verifica_soma_por_nome(quadro: bytes, nome: str = "Internet") -> bytes:
+    """
+    Verifica um quadro gerado por soma_por_nome e remove a soma.
+
+    Exceção:
+        ValueError: Se a soma calculada não coincidir com a recebida (erro detectado).
+    """
+    calculadora = soma_preset(nome)
+    if len(quadro) < calculadora.num_bytes:
+        raise ValueError(f"Erro de {nome} detectado! Quadro menor que a soma.")
+
+    visao = memoryview(quadro)
+    fim_dados = len(quadro) - calculadora.num_bytes
+    if calculadora.update(visao[:fim_dados]).digest() != visao[fim_dados:]:
+        raise ValueError(f"Erro de {nome} detectado!")
+
+    return bytes(visao[:fim_dados])
+
 def crc(quadro: bytes, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7) -> bytes:
     """
     Calcula o código CRC-32 (IEEE 802.3) ao quadro de dados.
 
+    O cálculo é feito pelo motor tabelado de Enlace.crcTabelado (registro
+    iniciado em zero, sem reflexão e sem xor final), com o mesmo resultado
+    do algoritmo bit a bit.
+
     Parâmetros:
         quadro (bytes): Dados originais da camada de enlace.
         tamanho_do_edc (int): Tamanho do código de verificação em bits (Padrão: 32).
@@ -115,22 +128,7 @@ def crc(quadro: bytes, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7) ->
     Retorna:
         bytes: O quadro original concatenado com os bytes do CRC calculado.
     """
-    crc = 0
-    mask = (1 << tamanho_do_edc) - 1 # Máscara para manter 32 bits (0xFFFFFFFF)
-
-    for byte in quadro:
-        crc ^= (byte << (tamanho_do_edc - 8)) # Alinha o byte ao MSB
-        for _ in range(8):
-            if crc & (1 << (tamanho_do_edc - 1)): # Verifica bit mais significativo
-                crc = (crc << 1) ^ polinomio
-            else:
-                crc <<= 1
-            crc &= mask # Garante que não exceda 32 bits
-
-    num_bytes_crc = (tamanho_do_edc + 7) // 8
-    crc_bytes = crc.to_bytes(num_bytes_crc, byteorder='big')
-
-    return quadro + crc_bytes
+    return bytes(quadro) + CRC(tamanho_do_edc, polinomio).update(quadro).digest()
 
 
 def verifica_crc(quadro: bytes, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7) -> bytes:
@@ -148,19 +146,139 @@ def verifica_crc(quadro: bytes, tamanho_do_edc: int = 32, polinomio: int = 0x04C
     Exceção:
         ValueError: Se o CRC calculado não coincidir com o CRC recebido (erro detectado).
     """
-    # 1. Descobre quantos bytes são do CRC
-    num_bytes_crc = (tamanho_do_edc + 7) // 8
+    return _verificar_com(CRC(tamanho_do_edc, polinomio), quadro)
+
+
+def crc_paralelo(quadro: bytes, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7,
+                 max_workers=None, tamanho_pedaco: int = 4 << 20, processos: bool = False) -> bytes:
+    """
+    Mesmo resultado de crc(), mas quadros grandes são divididos em pedaços
+    cujos CRCs são calculados num pool de threads (ou de processos) e
+    juntados pela combinação de CRCs sobre GF(2).
+
+    Parâmetros:
+        quadro (bytes): Dados originais da camada de enlace.
+        tamanho_do_edc, polinomio: Como em crc().
+        max_workers (int | None): Tamanho do pool.
+        tamanho_pedaco (int): Bytes por tarefa; quadros menores são calculados direto.
+        processos (bool): Usa um pool de processos em vez de threads.
+
+    Retorna:
+        bytes: O quadro original concatenado com os bytes do CRC calculado.
+    """
+    calculadora = CRC(tamanho_do_edc, polinomio).update_paralelo(
+        quadro, max_workers=max_workers, tamanho_pedaco=tamanho_pedaco, processos=processos)
+    return bytes(quadro) + calculadora.digest()
+
+
+def crc_por_nome(quadro: bytes, nome: str = "CRC-32/IEEE") -> bytes:
+    """
+    Anexa ao quadro o CRC de um dos presets de Enlace.crcTabelado.PRESETS_CRC
+    ("CRC-8", "CRC-16/CCITT", "CRC-32/IEEE", "CRC-32C").
+
+    Retorna:
+        bytes: O quadro original concatenado com o CRC (big-endian).
+    """
+    return bytes(quadro) + CRC.preset(nome).update(quadro).digest()
+
+
+def verifica_crc_por_nome(quadro: bytes, nome: str = "CRC-32/IEEE") -> bytes:
+    """
+    Verifica um quadro gerado por crc_por_nome e remove o CRC.
+
+    Exceção:
+        ValueError: Se o CRC calculado não coincidir com o CRC recebido (erro detectado).
+    """
+    return _verificar_com(CRC.preset(nome), quadro)
 
-    # 2. Separa o Dado Original do CRC que veio junto
-    dados_apenas = quadro[:-num_bytes_crc]
-    crc_recebido = quadro[-num_bytes_crc:]
 
-    #Recalcula o CRC usando APENAS os dados
-    quadro_esperado = crc(dados_apenas, tamanho_do_edc, polinomio)
-    
-    crc_calculado = quadro_esperado[-num_bytes_crc:]
+def _verificar_com(calculadora: CRC, quadro: bytes) -> bytes:
+    num_bytes_crc = calculadora.motor.num_bytes
+    if len(quadro) < num_bytes_crc:
+        raise ValueError("Erro de CRC detectado! Quadro menor que o CRC.")
 
-    if crc_recebido != crc_calculado:
+    # O CRC é calculado direto sobre a parte de dados, sem remontar o quadro
+    visao = memoryview(quadro)
+    fim_dados = len(quadro) - num_bytes_crc
+    if calculadora.update(visao[:fim_dados]).digest() != visao[fim_dados:]:
         raise ValueError("Erro de CRC detectado!")
 
-    return dados_apenas
+    return bytes(visao[:fim_dados])
+
+
+# ===================== LOTES =====================
+# Versões para N quadros de mesmo tamanho, dados como matriz uint8 (um quadro
+# por linha). Cada função calcula o lote inteiro com operações NumPy sobre a
+# matriz; as de verificação devolvem (dados, validos) em vez de levantar
+# ValueError, já que cada quadro do lote pode ter um resultado diferente.
+
+def _colunas_big_endian(valores, num_bytes) -> np.ndarray:
+    # Valores (uint64) -> matriz com num_bytes colunas, o byte mais significativo primeiro
+    return np.asarray(valores, dtype=">u8").view(np.uint8).reshape(-1, 8)[:, 8 - num_bytes:]
+
+
+def _soma_complemento_8_lote(matriz) -> np.ndarray:
+    total = matriz.sum(axis=1, dtype=np.uint64)
+    soma = np.where(total == 0, 0, 1 + (total.astype(np.int64) - 1) % 0xFF)
+    return (~soma & 0xFF).astype(np.uint8)
+
+
+def bit_de_paridade_par_lote(matriz) -> np.ndarray:
+    """
+    bit_de_paridade_par de cada linha. Retorna a matriz com uma coluna a mais.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    paridade = (contar_uns_por_linha(matriz) % 2).astype(np.uint8)
+    return np.concatenate((matriz, paridade[:, np.newaxis]), axis=1)
+
+
+def verifica_bit_de_paridade_par_lote(matriz):
+    """
+    Retorna:
+        (np.ndarray, np.ndarray): Linhas sem o byte de paridade e máscara dos quadros válidos.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    return matriz[:, :-1], contar_uns_por_linha(matriz) % 2 == 0
+
+
+def checksum_lote(matriz) -> np.ndarray:
+    """
+    checksum de cada linha. Retorna a matriz com uma coluna a mais.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    return np.concatenate((matriz, _soma_complemento_8_lote(matriz)[:, np.newaxis]), axis=1)
+
+
+def verifica_checksum_lote(matriz):
+    """
+    Retorna:
+        (np.ndarray, np.ndarray): Linhas sem o checksum e máscara dos quadros válidos.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    return matriz[:, :-1], _soma_complemento_8_lote(matriz) == 0
+
+
+def crc_lote(matriz, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7, nome: str = None) -> np.ndarray:
+    """
+    crc (ou crc_por_nome, se 'nome' for dado) de cada linha. Retorna a matriz
+    com as colunas do CRC (big-endian) ao final.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    motor = (CRC.preset(nome) if nome else CRC(tamanho_do_edc, polinomio)).motor
+    valores = motor.calcular_lote(matriz)
+    return np.concatenate((matriz, _colunas_big_endian(valores, motor.num_bytes)), axis=1)
+
+
+def verifica_crc_lote(matriz, tamanho_do_edc: int = 32, polinomio: int = 0x04C11DB7, nome: str = None):
+    """
+    Retorna:
+        (np.ndarray, np.ndarray): Linhas sem o CRC e máscara dos quadros válidos.
+    """
+    matriz = np.asarray(matriz, dtype=np.uint8)
+    motor = (CRC.preset(nome) if nome else CRC(tamanho_do_edc, polinomio)).motor
+    if matriz.shape[1] < motor.num_bytes:
+        return matriz[:, :0], np.zeros(len(matriz), dtype=bool)
+
+    dados = matriz[:, :matriz.shape[1] - motor.num_bytes]
+    esperado = _colunas_big_endian(motor.calcular_lote(dados), motor.num_bytes)
+    return dados, (esperado == matriz[:, dados.shape[1]:]).all(axis=1)
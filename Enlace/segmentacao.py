@@ -0,0 +1,131 @@
+from collections import OrderedDict
+
+from Enlace.enquadramentoDados import FORMATOS_INTEIRO, codificar_inteiro, decodificar_inteiro
+
+
+def _limite_id(formato: str) -> int:
+    # Os ids dão a volta antes de estourar o formato (no varint, em 32 bits)
+    if formato == "varint":
+        return 1 << 32
+    return 1 << (8 * FORMATOS_INTEIRO[formato])
+
+
+class Segmentador:
+    """
+    Divide mensagens grandes em segmentos numerados que cabem na MTU.
+
+    Cada segmento é: id_mensagem | índice | total | carga, com os três
+    campos no formato escolhido (um de FORMATOS_INTEIRO: "varint", "u8",
+    "u16" ou "u32"). A MTU limita o
+    segmento inteiro (cabeçalho + carga); o controle de erro e o
+    enquadramento aplicados depois somam os seus próprios bytes.
+    """
+
+    def __init__(self, mtu: int = 1024, formato: str = "varint"):
+        if formato not in FORMATOS_INTEIRO:
+            raise ValueError(f"Formato de cabeçalho desconhecido: {formato}")
+        if mtu <= 3 * (FORMATOS_INTEIRO[formato] or 1):
+            raise ValueError(f"MTU {mtu} não comporta o cabeçalho {formato}")
+
+        self.mtu = mtu
+        self.formato = formato
+        self._proximo_id = 0
+
+    def segmentar(self, mensagem: bytes) -> list:
+        """
+        Retorna:
+        • list[bytes]: Segmentos da mensagem, em ordem. Uma mensagem vazia
+          gera um único segmento sem carga.
+        """
+        mensagem = memoryview(bytes(mensagem))
+        id_mensagem = self._proximo_id
+        self._proximo_id = (self._proximo_id + 1) % _limite_id(self.formato)
+
+        # O total de segmentos nunca passa de len(mensagem) + 1, então esse
+        # valor dá o maior tamanho possível dos campos índice e total
+        prefixo = codificar_inteiro(id_mensagem, self.formato)
+        campo_max = len(codificar_inteiro(len(mensagem) + 1, self.formato)) if self.formato == "varint" \
+            else FORMATOS_INTEIRO[self.formato]
+        carga_max = self.mtu - len(prefixo) - 2 * campo_max
+        if carga_max <= 0:
+            raise ValueError(f"MTU {self.mtu} não comporta o cabeçalho desta mensagem")
+        total = max(1, -(-len(mensagem) // carga_max))
+
+        total_bytes = codificar_inteiro(total, self.formato)
+        return [
+            prefixo + codificar_inteiro(indice, self.formato) + total_bytes
+            + mensagem[indice * carga_max:(indice + 1) * carga_max]
+            for indice in range(total)
+        ]
+
+
+class Remontador:
+    """
+    Reconstrói as mensagens a partir dos segmentos de um Segmentador.
+
+    Aceita segmentos fora de ordem, duplicados e de mensagens intercaladas.
+    As mensagens incompletas ficam guardadas até chegarem os segmentos que
+    faltam (ou até descartar_pendentes()). Os ids das últimas max_concluidas
+    mensagens entregues são lembrados, e segmentos atrasados delas são
+    descartados em vez de entregar a mensagem de novo ou abrir uma pendência
+    que nunca se completa. A janela fica abaixo de metade dos ids do formato,
+    para que um id reutilizado depois da volta seja aceito.
+    """
+
+    def __init__(self, formato: str = "varint", max_pendentes: int = 64, max_concluidas: int = 64):
+        if formato not in FORMATOS_INTEIRO:
+            raise ValueError(f"Formato de cabeçalho desconhecido: {formato}")
+        self.formato = formato
+        self.max_pendentes = max_pendentes
+        # id_mensagem -> (total, {indice: carga})
+        self._pendentes = {}
+        # Ids entregues recentemente, do mais antigo ao mais novo
+        self._concluidas = OrderedDict()
+        self.max_concluidas = min(max_concluidas, _limite_id(formato) // 2)
+
+    def receber(self, segmento: bytes):
+        """
+        Processa um segmento.
+
+        Retorna:
+        • bytes | None: A mensagem completa quando este segmento a fecha
+          (None também para duplicatas de mensagens já entregues).
+
+        Exceção:
+        • ValueError: Cabeçalho inválido ou incoerente com os segmentos anteriores.
+        """
+        id_mensagem, fim = decodificar_inteiro(segmento, 0, self.formato)
+        indice, fim = decodificar_inteiro(segmento, fim, self.formato)
+        total, fim = decodificar_inteiro(segmento, fim, self.formato)
+        if total == 0 or indice >= total:
+            raise ValueError(f"Segmento {indice} de {total} inválido")
+        if id_mensagem in self._concluidas:
+            return None
+
+        if id_mensagem not in self._pendentes:
+            if len(self._pendentes) >= self.max_pendentes:
+                # Descarta a mensagem pendente mais antiga
+                del self._pendentes[next(iter(self._pendentes))]
+            self._pendentes[id_mensagem] = (total, {})
+
+        total_esperado, partes = self._pendentes[id_mensagem]
+        if total != total_esperado:
+            raise ValueError(f"Mensagem {id_mensagem}: total de segmentos mudou de {total_esperado} para {total}")
+        partes[indice] = bytes(segmento[fim:])
+
+        if len(partes) < total:
+            return None
+        del self._pendentes[id_mensagem]
+        self._concluidas[id_mensagem] = None
+        if len(self._concluidas) > self.max_concluidas:
+            self._concluidas.popitem(last=False)
+        return b"".join(partes[i] for i in range(total))
+
+    def pendentes(self) -> dict:
+        """
+        Segmentos recebidos de cada mensagem incompleta: {id: (recebidos, total)}.
+        """
+        return {id_mensagem: (len(partes), total) for id_mensagem, (total, partes) in self._pendentes.items()}
+
+    def descartar_pendentes(self):
+        self._pendentes.clear()
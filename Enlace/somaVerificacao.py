@@ -0,0 +1,193 @@
+import copy
+import zlib
+
+import numpy as np
+
+# Palavras por redução NumPy: mantém as somas ponderadas dentro de uint64
+_PEDACO = 1 << 20
+
+# Pesos 0, 1, 2, ... das somas de Fletcher (criados sob demanda)
+_pesos = np.arange(0, dtype=np.uint64)
+
+
+def _obter_pesos(n: int) -> np.ndarray:
+    global _pesos
+    if len(_pesos) < n:
+        _pesos = np.arange(max(n, 4096), dtype=np.uint64)
+    return _pesos[:n]
+
+
+def _palavras(dados, largura: int, ordem: str) -> np.ndarray:
+    if largura == 1:
+        return np.frombuffer(dados, dtype=np.uint8)
+    return np.frombuffer(dados, dtype=np.dtype(f"{'>' if ordem == 'big' else '<'}u{largura}"))
+
+
+class _SomaIncremental:
+    """
+    Base das somas de verificação, no estilo hashlib (como Enlace.crcTabelado.CRC):
+
+        s = soma_preset("Fletcher-32")
+        s.update(b"parte 1"); s.update(b"parte 2")
+        s.valor()   # int
+        s.digest()  # bytes (big-endian, como no trailer do quadro)
+
+    Os dados são somados em palavras de 'largura' bytes; os bytes que sobram
+    de um update ficam guardados até o próximo (e são completados com zeros
+    no fim), então o resultado não depende de como a entrada foi dividida.
+    """
+
+    largura = 1
+    ordem = "big"
+    num_bytes = 1
+
+    def __init__(self, nome=None):
+        self.nome = nome
+        self._resto = b""
+        self.reset()
+
+    def update(self, chunk):
+        dados = memoryview(chunk).cast("B")
+        if self._resto:
+            falta = self.largura - len(self._resto)
+            self._resto += bytes(dados[:falta])
+            dados = dados[falta:]
+            if len(self._resto) < self.largura:
+                return self
+            self._acumular(self._resto)
+            self._resto = b""
+
+        inteiras = len(dados) - len(dados) % self.largura
+        for inicio in range(0, inteiras, _PEDACO * self.largura):
+            self._acumular(dados[inicio:min(inteiras, inicio + _PEDACO * self.largura)])
+        self._resto = bytes(dados[inteiras:])
+        return self
+
+    def _estado_final(self):
+        if not self._resto:
+            return self
+        completo = copy.copy(self)
+        completo._resto = b""
+        completo._acumular(self._resto.ljust(self.largura, b"\x00"))
+        return completo
+
+    def digest(self) -> bytes:
+        return self.valor().to_bytes(self.num_bytes, byteorder="big")
+
+    def hexdigest(self) -> str:
+        return self.digest().hex()
+
+    def copy(self):
+        return copy.copy(self)
+
+
+class SomaComplemento(_SomaIncremental):
+    """
+    Soma em complemento de um (com "vai-um" de volta no bit menos
+    significativo) e complemento do resultado.
+
+    • largura=2, ordem="big": Internet checksum da RFC 1071.
+    • largura=1: o checksum de 8 bits original de errorDetection.checksum.
+
+    A soma com vai-um circular é a soma módulo 2^n - 1, exceto que um total
+    não nulo múltiplo de 2^n - 1 vale 2^n - 1 (o "zero negativo"); por isso
+    a redução é feita de uma vez, sem dobrar o vai-um a cada palavra.
+    """
+
+    def __init__(self, largura=2, ordem="big", nome=None):
+        self.largura = largura
+        self.ordem = ordem
+        self.num_bytes = largura
+        self._modulo = (1 << (8 * largura)) - 1
+        super().__init__(nome)
+
+    def reset(self):
+        self._soma = 0
+        self._resto = b""
+
+    def _acumular(self, dados):
+        self._soma += int(_palavras(dados, self.largura, self.ordem).sum(dtype=np.uint64))
+
+    def soma(self) -> int:
+        """
+        Soma em complemento de um (antes do complemento final).
+        """
+        total = self._estado_final()._soma
+        return 0 if total == 0 else 1 + (total - 1) % self._modulo
+
+    def valor(self) -> int:
+        return ~self.soma() & self._modulo
+
+
+class Fletcher(_SomaIncremental):
+    """
+    Somas de Fletcher: A = a_inicial + Σ w_i e B = Σ A_i, ambas módulo
+    'modulo', sobre palavras w de 'largura' bytes. O valor é (B << bits_soma) | A.
+
+    • Fletcher-16: bytes, módulo 255.
+    • Fletcher-32: palavras de 16 bits little-endian, módulo 65535.
+    • Adler-32: bytes, módulo 65521, A começa em 1 (o zlib calcula esse).
+
+    Um pedaço de n palavras muda o estado como
+        A' = A + Σ w_i
+        B' = B + n·A + Σ (n - i)·w_i = B + n·A + n·Σ w_i - Σ i·w_i
+    o que se faz com uma soma e um produto escalar por pedaço.
+    """
+
+    def __init__(self, largura=1, modulo=255, a_inicial=0, ordem="little", nome=None):
+        self.largura = largura
+        self.ordem = ordem
+        self.modulo = modulo
+        self.a_inicial = a_inicial
+        self.bits_soma = 16 if modulo > 255 else 8
+        self.num_bytes = 2 * self.bits_soma // 8
+        self._zlib = largura == 1 and modulo == 65521 and a_inicial == 1
+        super().__init__(nome)
+
+    def reset(self):
+        self._a = self.a_inicial
+        self._b = 0
+        self._resto = b""
+
+    def _acumular(self, dados):
+        if self._zlib:
+            valor = zlib.adler32(dados, (self._b << 16) | self._a)
+            self._a, self._b = valor & 0xFFFF, valor >> 16
+            return
+
+        palavras = _palavras(dados, self.largura, self.ordem).astype(np.uint64)
+        n = len(palavras)
+        soma = int(palavras.sum())
+        ponderada = int(np.dot(palavras, _obter_pesos(n)))
+        self._b = (self._b + n * self._a + n * soma - ponderada) % self.modulo
+        self._a = (self._a + soma) % self.modulo
+
+    def valor(self) -> int:
+        final = self._estado_final()
+        return (final._b << self.bits_soma) | final._a
+
+
+# Nome -> (classe, parâmetros). O "check" de cada um em b"123456789":
+# Checksum-8 0x21, Internet 0xF62A, Fletcher-16 0x1EDE, Fletcher-32 0xDF09D509, Adler-32 0x091E01DE
+PRESETS_SOMA = {
+    "Checksum-8": (SomaComplemento, {"largura": 1}),
+    "Internet": (SomaComplemento, {"largura": 2, "ordem": "big"}),
+    "Fletcher-16": (Fletcher, {"largura": 1, "modulo": 255}),
+    "Fletcher-32": (Fletcher, {"largura": 2, "modulo": 65535, "ordem": "little"}),
+    "Adler-32": (Fletcher, {"largura": 1, "modulo": 65521, "a_inicial": 1}),
+}
+
+
+def soma_preset(nome: str):
+    """
+    Retorna:
+    • Uma soma incremental nova (SomaComplemento ou Fletcher) do preset 'nome'.
+    """
+    if nome not in PRESETS_SOMA:
+        raise ValueError(f"Soma de verificação desconhecida: {nome}")
+    classe, parametros = PRESETS_SOMA[nome]
+    return classe(nome=nome, **parametros)
+
+
+def calcular_soma(dados, nome: str = "Internet") -> int:
+    return soma_preset(nome).update(dados).valor()
@@ -5,6 +5,7 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 from Utils import bits_list_formatter
+from Bits import BitBuffer
 
 from Transmissor import Transmissor
 from Receptor import Receptor
@@ -155,9 +156,9 @@ class App(ctk.CTk):
             
             #RX
             # texto_recuperado, bits_rx_raw = self.rx.decodificar(sinal_com_ruido, mod_digital, enquadramento, tipo_erro)
-            texto_recuperado, bits_rx_raw = self.rx.decodificar(sinal_com_ruido, mod_digital, mod_portadora, enquadramento, tipo_erro)
+            texto_recuperado, bits_rx_raw = self.rx.decodificar(sinal_com_ruido, mod_digital, enquadramento, tipo_erro, mod_portadora)
 
-            bits_recebidos = list(bits_rx_raw)
+            bits_recebidos = BitBuffer.de_bits(bits_rx_raw)
 
             # ATUALIZA GUI (GRÁFICOS E LABELS)
             # self.atualizar_graficos(mod_digital, mod_portadora, sinal_com_ruido, bits_enviados)
@@ -175,8 +176,7 @@ class App(ctk.CTk):
             self.bits_recebidos_texto.configure(state="normal")
             self.bits_recebidos_texto.delete("1.0", "end")
             
-            str_bits = "".join(map(str, bits_recebidos))
-            str_bits = " ".join([str_bits[i:i+8] for i in range(0, len(str_bits), 8)])
+            str_bits = bits_recebidos.formatar()
 
             self.bits_recebidos_texto.insert("1.0", str_bits)
             self.bits_recebidos_texto.configure(state="disabled")
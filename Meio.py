@@ -1,12 +1,147 @@
 import numpy as np
 
+GERADORES_DE_BITS = {
+    "PCG64": np.random.PCG64,
+    "Philox": np.random.Philox,
+}
+
+
+def sigma_para_snr(sinal, snr_db):
+    """
+    Desvio padrão do ruído que resulta na SNR (em dB) pedida, medida
+    pela potência média por amostra do sinal.
+    """
+    potencia = float(np.mean(np.square(sinal, dtype=np.float64))) if len(sinal) else 0.0
+    return np.sqrt(potencia / (10 ** (snr_db / 10)))
+
+
+def sigma_para_esn0(sinal, esn0_db, amostras_por_simbolo):
+    """
+    Desvio padrão do ruído que resulta na Es/N0 (em dB) pedida.
+
+    Es é a energia média de um símbolo (soma de s² nas suas amostras) e, para
+    ruído real amostrado, N0/2 = σ², logo σ = sqrt(Es / (2 · 10^(Es/N0 / 10))).
+    """
+    potencia = float(np.mean(np.square(sinal, dtype=np.float64))) if len(sinal) else 0.0
+    energia_simbolo = potencia * amostras_por_simbolo
+    return np.sqrt(energia_simbolo / (2 * 10 ** (esn0_db / 10)))
+
+
 class MeioDeComunicacao:
-    def transmitir(self, sinal, sigma):
+    def __init__(self, dtype=np.float64, semente=None, gerador="PCG64", trabalhador=None):
+        """
+        Canal AWGN com gerador de números aleatórios próprio.
+
+        Parâmetros:
+        • dtype: Tipo das amostras entregues ao receptor.
+        • semente (int | None): Semente da simulação. Com a mesma semente (e o
+          mesmo 'trabalhador') o ruído gerado é sempre o mesmo.
+        • gerador (str): "PCG64" ou "Philox".
+        • trabalhador (int | None): Índice do processo/thread. Cada índice
+          recebe um fluxo independente derivado da mesma semente.
+        """
+        if gerador not in GERADORES_DE_BITS:
+            raise ValueError(f"Gerador desconhecido: {gerador}")
+
+        self.dtype = np.dtype(dtype)
+        self.semente = semente
+        self.trabalhador = trabalhador
+
+        spawn_key = () if trabalhador is None else (trabalhador,)
+        sequencia = np.random.SeedSequence(semente, spawn_key=spawn_key)
+        self.rng = np.random.Generator(GERADORES_DE_BITS[gerador](sequencia))
+
+        # Buffer de ruído reaproveitado entre chamadas (cresce quando necessário)
+        self._ruido = {}
+
+    @classmethod
+    def para_trabalhadores(cls, semente, n_trabalhadores, **kwargs):
+        """
+        Cria um canal por trabalhador, todos derivados de uma única semente.
+        Num pool de processos, cada processo pode criar apenas o seu com
+        MeioDeComunicacao(semente=semente, trabalhador=indice).
+        """
+        return [cls(semente=semente, trabalhador=i, **kwargs) for i in range(n_trabalhadores)]
+
+    def _buffer_de_ruido(self, n, dtype):
+        buffer = self._ruido.get(dtype)
+        if buffer is None or len(buffer) < n:
+            buffer = np.empty(n, dtype=dtype)
+            self._ruido[dtype] = buffer
+        return buffer[:n]
+
+    def _resolver_sigma(self, sinal, sigma, snr_db, esn0_db, amostras_por_simbolo):
+        if snr_db is not None:
+            return sigma_para_snr(sinal, snr_db)
+        if esn0_db is not None:
+            if amostras_por_simbolo is None:
+                raise ValueError("Es/N0 exige amostras_por_simbolo")
+            return sigma_para_esn0(sinal, esn0_db, amostras_por_simbolo)
+        if sigma is None:
+            raise ValueError("Informe sigma, snr_db ou esn0_db")
+        return sigma
+
+    def transmitir(self, sinal, sigma=None, out=None, snr_db=None, esn0_db=None, amostras_por_simbolo=None):
         """
         Aplica ruído gaussiano ao sinal.
-        Sigma (σ) é o desvio padrão do ruído.
+        Sigma (σ) é o desvio padrão do ruído; alternativamente ele pode ser
+        derivado de snr_db ou de esn0_db (este último com amostras_por_simbolo).
+
+        Com 'out', o sinal ruidoso é escrito no buffer do chamador (pode ser o
+        próprio 'sinal', para somar o ruído no lugar). O ruído é gerado num
+        buffer interno reaproveitado, então chamadas repetidas não alocam.
         """
+        sigma = self._resolver_sigma(sinal, sigma, snr_db, esn0_db, amostras_por_simbolo)
+
+        if out is None:
+            out = np.array(sinal, dtype=self.dtype)
+        elif out is not sinal:
+            np.copyto(out, sinal)
+
         if sigma > 0:
-            ruido = np.random.normal(0, sigma, len(sinal))
-            return sinal + ruido
-        return sinal
\ No newline at end of file
+            self._somar_ruido(out, sigma)
+        return out
+
+    def transmitir_lote(self, sinais, sigma=None, out=None, snr_db=None, esn0_db=None, amostras_por_simbolo=None):
+        """
+        Aplica ruído a vários quadros de mesmo tamanho numa única chamada.
+
+        Parâmetros:
+        • sinais: Matriz (n_quadros, n_amostras).
+        • sigma: Escalar ou um valor por quadro (array de n_quadros).
+        • out: Buffer opcional com o mesmo formato de 'sinais'.
+
+        Retorna:
+        • Matriz (n_quadros, n_amostras) com ruído.
+        """
+        sinais = np.asarray(sinais)
+        if sigma is None:
+            sigma = np.array([
+                self._resolver_sigma(quadro, None, snr_db, esn0_db, amostras_por_simbolo) for quadro in sinais
+            ])
+
+        if out is None:
+            out = np.array(sinais, dtype=self.dtype)
+        elif out is not sinais:
+            np.copyto(out, sinais)
+
+        sigma = np.asarray(sigma, dtype=out.dtype)
+        if sigma.ndim == 0:
+            if sigma > 0:
+                self._somar_ruido(out, sigma)
+            return out
+
+        # Um desvio padrão por quadro: gera todo o ruído de uma vez e escala por linha
+        ruido = self._buffer_de_ruido(out.size, out.dtype).reshape(out.shape)
+        self.rng.standard_normal(out=ruido, dtype=out.dtype)
+        ruido *= sigma[:, np.newaxis]
+        out += ruido
+        return out
+
+    def _somar_ruido(self, out, sigma):
+        ruido = self._buffer_de_ruido(out.size, out.dtype)
+        self.rng.standard_normal(out=ruido, dtype=out.dtype)
+        ruido *= sigma
+        # Soma no formato de 'out': out.reshape(-1) de uma vista não contígua
+        # seria uma cópia, e o ruído não chegaria ao buffer do chamador
+        np.add(out, ruido.reshape(out.shape), out=out)
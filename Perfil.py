@@ -0,0 +1,101 @@
+import numpy as np
+
+from Bits import BitBuffer
+
+import CamadaFisica
+import CamadaEnlace
+
+
+class LinkProfile:
+    """
+    Perfil de enlace pré-compilado.
+
+    Valida as escolhas (código de linha, portadora, enquadramento e controle
+    de erro) e todos os parâmetros numéricos uma única vez, e guarda as
+    funções já resolvidas. Depois disso, transmitir() e receber() apenas
+    chamam as funções ligadas, sem comparar strings a cada quadro.
+    """
+
+    def __init__(self, codigo_linha="NRZ", portadora="ASK", enquadramento="Contagem de Caracteres",
+                 controle_erro="Bit de Paridade Par", amostras_por_bit=50, fc=CamadaFisica.FC_PADRAO,
+                 f_1=CamadaFisica.F_1_PADRAO, f_0=CamadaFisica.F_0_PADRAO, A_1=1.0, A_0=0.0, dtype=np.float64):
+        if not isinstance(amostras_por_bit, (int, np.integer)) or amostras_por_bit < 2:
+            raise ValueError(f"amostras_por_bit deve ser um inteiro >= 2: {amostras_por_bit}")
+        if codigo_linha == "Manchester" and amostras_por_bit % 2 != 0:
+            raise ValueError("Manchester exige amostras_por_bit par")
+
+        # Acima de amostras/2 ciclos por símbolo a portadora amostrada sofre aliasing
+        nyquist = amostras_por_bit / 2
+        if portadora == "FSK":
+            frequencias = {"f_1": f_1, "f_0": f_0}
+        elif portadora in CamadaFisica.TIPOS_MFSK:
+            frequencias = {"tom mais alto": CamadaFisica.frequencias_mfsk(CamadaFisica.TIPOS_MFSK[portadora])[-1]}
+        else:
+            frequencias = {"fc": fc}
+        for nome, valor in frequencias.items():
+            if not 0 < valor < nyquist:
+                raise ValueError(f"{nome}={valor} fora de (0, {nyquist}) ciclos por símbolo")
+        if portadora == "FSK" and f_1 == f_0:
+            raise ValueError("FSK exige f_1 != f_0")
+
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError(f"dtype deve ser float32 ou float64: {dtype}")
+
+        self.codigo_linha = codigo_linha
+        self.portadora = portadora
+        self.enquadramento = enquadramento
+        self.controle_erro = controle_erro
+        self.amostras_por_bit = amostras_por_bit
+        self.fc = fc
+        self.f_1 = f_1
+        self.f_0 = f_0
+        self.A_1 = A_1
+        self.A_0 = A_0
+        self.dtype = dtype
+
+        # Cada resolver levanta ValueError para nomes desconhecidos
+        self.codificar_linha, self.decodificar_linha = CamadaFisica.resolver_codigo_linha(
+            codigo_linha, amostras_por_bit, dtype)
+        self.bits_por_simbolo, self.modular, self.demodular = CamadaFisica.resolver_modem(
+            portadora, amostras_por_bit, fc, f_1, f_0, A_1, A_0, dtype)
+        self.enquadrar, self.desenquadrar = CamadaEnlace.resolver_enquadramento(enquadramento)
+        self.aplicar_controle, self.verificar_controle = CamadaEnlace.resolver_controle_erro(controle_erro)
+
+    def __repr__(self):
+        return (f"LinkProfile({self.codigo_linha!r}, {self.portadora!r}, {self.enquadramento!r}, "
+                f"{self.controle_erro!r}, amostras_por_bit={self.amostras_por_bit})")
+
+    def montar_quadro(self, dados: bytes) -> np.ndarray:
+        """
+        Dados -> (Erro) -> (Enquadramento) -> bits do quadro (uint8 0/1).
+        """
+        quadro = self.enquadrar(self.aplicar_controle(dados))
+        return BitBuffer.de_bytes(quadro).bits()
+
+    def transmitir(self, dados: bytes, out=None):
+        """
+        Fluxo completo do transmissor.
+
+        Retorna:
+        • (sinal_modulado, quadro_bits). 'out' recebe o sinal modulado, se fornecido.
+        """
+        quadro_bits = self.montar_quadro(dados)
+        return self.modular(quadro_bits, out=out), quadro_bits
+
+    def sinal_digital(self, quadro_bits, out=None):
+        """
+        Sinal em banda base do código de linha (usado apenas para visualização).
+        """
+        return self.codificar_linha(quadro_bits, out=out)
+
+    def receber(self, sinal) -> bytes:
+        """
+        Fluxo completo do receptor: Sinal -> Bits -> Bytes -> (Desenquadramento) -> (Verificação).
+        Erros detectados pelo controle de erro propagam como ValueError.
+        """
+        bits = self.demodular(sinal)
+        # Símbolos de preenchimento da modulação podem deixar alguns bits a mais no fim
+        bits = np.asarray(bits[:len(bits) // 8 * 8], dtype=np.uint8)
+        quadro = BitBuffer.de_bits(bits).tobytes()
+        return self.verificar_controle(self.desenquadrar(quadro))
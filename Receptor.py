@@ -1,62 +1,69 @@
 import numpy as np
+from Bits import BitBuffer
 from CamadaFisica import CamadaFisica
 from CamadaEnlace import CamadaEnlace
+from Enlace.bufferQuadro import BufferQuadro
 
 class Receptor:
-    def __init__(self, amostras_por_bit=50):
-        self.fisica = CamadaFisica(amostras_por_bit)
+    def __init__(self, amostras_por_bit=50, dtype=np.float64):
+        self.fisica = CamadaFisica(amostras_por_bit, dtype)
         self.enlace = CamadaEnlace()
 
     def bits_para_bytes(self, bits_array):
-        """Converte array de bits (0 e 1) de volta para bytes"""
-        bits_str = "".join(str(int(b)) for b in bits_array)
-        
-        # Padding se necessário
-        resto = len(bits_str) % 8
-        if resto != 0:
-            bits_str += "0" * (8 - resto)
-            
-        bytes_lista = []
-        for i in range(0, len(bits_str), 8):
-            byte_str = bits_str[i:i+8]
-            bytes_lista.append(int(byte_str, 2))
-            
-        return bytes(bytes_lista)
+        """Converte array de bits (0 e 1) de volta para bytes (o último byte é completado com zeros)"""
+        return BitBuffer.de_bits(bits_array).tobytes()
 
     def decodificar(self, sinal, mod_digital, tipo_enquadramento, tipo_erro="Bit de Paridade Par", mod_portadora="ASK"):
         """
         Fluxo: Sinal -> Demodulação -> Bits -> Bytes -> (Desenquadramento) -> (Verificação) -> Texto
         """
+        dados, erro, bits_recebidos = self.decodificar_bytes(sinal, mod_digital, tipo_enquadramento, tipo_erro, mod_portadora)
+        if erro is not None:
+            return erro, bits_recebidos
+
+        # 5. Aplicação: Bytes -> Texto
         try:
+            texto_final = str(dados, 'utf-8')
+            return texto_final, bits_recebidos
+        except UnicodeDecodeError:
+             return f"[Erro: Bytes inválidos para texto]", bits_recebidos
 
-            bits_demodulados = self.fisica.demodular_analogico(sinal, tipo=mod_portadora)
+    def decodificar_bytes(self, sinal, mod_digital, tipo_enquadramento, tipo_erro="Bit de Paridade Par", mod_portadora="ASK"):
+        """
+        Como decodificar(), mas entrega os bytes da aplicação (dados binários).
 
-            # 1. Camada Física: Decodifica o sinal digital -> Bits
-            bits_recebidos = self.fisica.decodificar_digital(bits_demodulados, mod_digital)
+        Retorna:
+        • (dados, erro, bits_recebidos): 'dados' é None quando o quadro foi
+          recusado, e então 'erro' traz a mensagem que decodificar() exibiria.
+        """
+        try:
+            # 1. Camada Física: Demodula a portadora -> Bits
+            # (a codificação de linha só gera o sinal digital exibido; a portadora é modulada
+            # diretamente pelos bits do quadro, então os bits demodulados já são os do quadro)
+            bits_recebidos = self.fisica.demodular_analogico(sinal, tipo=mod_portadora)
             
             # 2. Interface Física-Enlace: Bits -> Bytes
-            bytes_quadro = self.bits_para_bytes(bits_recebidos)
+            # (símbolos de preenchimento da modulação podem deixar alguns bits a mais no fim)
+            bytes_quadro = self.bits_para_bytes(bits_recebidos[:len(bits_recebidos) // 8 * 8])
+
+            # Cabeçalhos, flags e trailers são removidos movendo as bordas do buffer, sem cópias
+            quadro = BufferQuadro.recebido(bytes_quadro)
 
             # 3. Camada de Enlace: Desenquadramento
             try:
-                dados_enquadrados = self.enlace.desenquadrar(bytes_quadro, tipo_enquadramento)
+                self.enlace.desenquadrar_buffer(quadro, tipo_enquadramento)
             except Exception as e:
-                return f"[Erro de Enquadramento: {e}]", bits_recebidos
+                return None, f"[Erro de Enquadramento: {e}]", bits_recebidos
 
             # 4. Camada de Enlace: Verificação de Erros
             try:
-                dados_limpos = self.enlace.verificar_deteccao_correcao(dados_enquadrados, tipo_erro)
+                self.enlace.verificar_deteccao_correcao_buffer(quadro, tipo_erro)
             except ValueError as ve:
-                return f"[Erro detectado ({tipo_erro}): {ve}]", bits_recebidos
+                return None, f"[Erro detectado ({tipo_erro}): {ve}]", bits_recebidos
             except Exception as e:
-                return f"[Erro desconhecido na verificação: {e}]", bits_recebidos
+                return None, f"[Erro desconhecido na verificação: {e}]", bits_recebidos
 
-            # 5. Aplicação: Bytes -> Texto
-            try:
-                texto_final = dados_limpos.decode('utf-8')
-                return texto_final, bits_recebidos
-            except UnicodeDecodeError:
-                 return f"[Erro: Bytes inválidos para texto]", bits_recebidos
+            return quadro.tobytes(), None, bits_recebidos
 
         except Exception as e:
-            return f"{e}", []
\ No newline at end of file
+            return None, f"{e}", []
@@ -0,0 +1,268 @@
+"""
+Execução sem interface gráfica: Transmissor -> MeioDeComunicacao -> Receptor.
+
+    python -m Simulador entrada.bin -o saida.bin --portadora QPSK --controle-erro CRC-32 --sigma 0.5
+    echo "texto" | python -m Simulador --saida - --resumo resumo.json
+    python -m Simulador --texto "Olá" --enquadramento "Inserção de Bytes" --exigir-identico
+
+A entrada é dividida em quadros de --bytes-por-quadro bytes, cada um passa
+pelo fluxo completo e os dados entregues pelo receptor são gravados na
+saída. O resumo em JSON traz vazão, BER, FER e as contagens de quadros.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+
+# Sem display: o CamadaFisica importa o pyplot, que não deve procurar um backend gráfico
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+
+import CamadaFisica
+import CamadaEnlace
+from Meio import MeioDeComunicacao, GERADORES_DE_BITS
+from Perfil import LinkProfile
+from Receptor import Receptor
+from Transmissor import Transmissor
+from Varredura import contar_erros_de_bit
+
+PORTADORAS = ["ASK", "FSK", *CamadaFisica.CONSTELACOES, *CamadaFisica.TIPOS_MFSK]
+
+# Códigos de saída
+SUCESSO = 0
+SAIDA_DIFERENTE = 1
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m Simulador",
+        description="Transmite arquivos (ou a entrada padrão) pelo simulador TX -> meio -> RX, sem interface gráfica.",
+    )
+    parser.add_argument("entradas", nargs="*",
+                        help="Arquivos de entrada ('-' para a entrada padrão; padrão: entrada padrão)")
+    parser.add_argument("--texto", help="Transmite este texto em vez de arquivos")
+    parser.add_argument("-o", "--saida",
+                        help="Onde gravar os dados recuperados ('-' para a saída padrão; um diretório "
+                             "com várias entradas). Sem esta opção nada é gravado")
+    parser.add_argument("--resumo", default="-",
+                        help="Arquivo do resumo JSON (padrão: saída padrão, ou a de erro se --saida for '-')")
+
+    enlace = parser.add_argument_group("enlace")
+    enlace.add_argument("--enquadramento", default="Contagem de Caracteres", choices=list(CamadaEnlace.ENQUADRAMENTOS))
+    enlace.add_argument("--controle-erro", default="Bit de Paridade Par", choices=list(CamadaEnlace.CONTROLES_ERRO))
+    enlace.add_argument("--bytes-por-quadro", type=int, default=1024, help="Bytes de dados por quadro")
+    enlace.add_argument("--quadro-recusado", default="omitir", choices=["omitir", "zeros"],
+                        help="Na saída, omite os quadros recusados ou os substitui por zeros; com 'zeros', os "
+                             "quadros aceitos com outro tamanho também são cortados ou completados com zeros, "
+                             "mantendo o alinhamento com a entrada")
+
+    fisica = parser.add_argument_group("física")
+    fisica.add_argument("--codigo-linha", default="NRZ", choices=list(CamadaFisica.CODIGOS_LINHA))
+    fisica.add_argument("--portadora", default="ASK", choices=PORTADORAS)
+    fisica.add_argument("--amostras-por-bit", type=int, default=50)
+    fisica.add_argument("--fc", type=float, default=CamadaFisica.FC_PADRAO, help="Portadora (ciclos por símbolo)")
+    fisica.add_argument("--f1", type=float, default=CamadaFisica.F_1_PADRAO, help="Frequência do bit 1 no FSK")
+    fisica.add_argument("--f0", type=float, default=CamadaFisica.F_0_PADRAO, help="Frequência do bit 0 no FSK")
+    fisica.add_argument("--dtype", default="float64", choices=["float32", "float64"])
+
+    meio = parser.add_argument_group("meio")
+    ruido = meio.add_mutually_exclusive_group()
+    ruido.add_argument("--sigma", type=float, help="Desvio padrão do ruído (padrão: 0, sem ruído)")
+    ruido.add_argument("--snr-db", type=float, help="Ruído pela SNR em dB")
+    ruido.add_argument("--esn0-db", type=float, help="Ruído pela Es/N0 em dB")
+    meio.add_argument("--semente", type=int, help="Semente do ruído (reprodutível)")
+    meio.add_argument("--gerador", default="PCG64", choices=list(GERADORES_DE_BITS))
+
+    parser.add_argument("--exigir-identico", action="store_true",
+                        help=f"Sai com código {SAIDA_DIFERENTE} se algum dado recuperado diferir da entrada (para CI)")
+    return parser
+
+
+class Simulacao:
+    """
+    Transmissor, meio e receptor montados uma vez com as opções da linha de comando.
+    """
+
+    def __init__(self, opcoes):
+        # O perfil valida a combinação (nomes, Nyquist, Manchester com amostras pares, ...)
+        LinkProfile(opcoes.codigo_linha, opcoes.portadora, opcoes.enquadramento, opcoes.controle_erro,
+                    opcoes.amostras_por_bit, opcoes.fc, opcoes.f1, opcoes.f0, dtype=opcoes.dtype)
+        if opcoes.bytes_por_quadro < 1:
+            raise ValueError(f"bytes_por_quadro deve ser >= 1: {opcoes.bytes_por_quadro}")
+
+        self.opcoes = opcoes
+        self.transmissor = Transmissor(opcoes.amostras_por_bit, opcoes.dtype)
+        self.receptor = Receptor(opcoes.amostras_por_bit, opcoes.dtype)
+        for fisica in (self.transmissor.fisica, self.receptor.fisica):
+            fisica.fc, fisica.f_1, fisica.f_0 = opcoes.fc, opcoes.f1, opcoes.f0
+        self.meio = MeioDeComunicacao(opcoes.dtype, semente=opcoes.semente, gerador=opcoes.gerador)
+
+        if opcoes.snr_db is None and opcoes.esn0_db is None:
+            self.ruido = {"sigma": opcoes.sigma or 0.0}
+        else:
+            self.ruido = {"snr_db": opcoes.snr_db, "esn0_db": opcoes.esn0_db,
+                          "amostras_por_simbolo": opcoes.amostras_por_bit}
+
+    def transmitir_quadro(self, dados: bytes):
+        """
+        Retorna:
+        • (recebido, erro, erros_de_bit, bits_no_canal): 'recebido' é None se o receptor recusou o quadro.
+        """
+        o = self.opcoes
+        _, sinal, bits_tx = self.transmissor.processar_bytes(dados, o.codigo_linha, o.portadora, o.enquadramento,
+                                                            o.controle_erro)
+        sinal = self.meio.transmitir(sinal, out=sinal, **self.ruido)
+        recebido, erro, bits_rx = self.receptor.decodificar_bytes(sinal, o.codigo_linha, o.enquadramento,
+                                                                 o.controle_erro, o.portadora)
+        # Só os bits do quadro: o preenchimento do último símbolo não conta como erro
+        return recebido, erro, contar_erros_de_bit(bits_tx, np.asarray(bits_rx)[:len(bits_tx)]), len(bits_tx)
+
+    def processar(self, dados: bytes):
+        """
+        Transmite 'dados' quadro a quadro.
+
+        Retorna:
+        • (recuperado, resumo): Os bytes entregues e as estatísticas da transmissão.
+        """
+        tamanho = self.opcoes.bytes_por_quadro
+        partes, erros = [], collections.Counter()
+        corretos = recusados = errados = bytes_corretos = erros_de_bit = bits_no_canal = 0
+
+        inicio = time.perf_counter()
+        for posicao in range(0, len(dados), tamanho):
+            original = dados[posicao:posicao + tamanho]
+            recebido, erro, erros_quadro, bits_quadro = self.transmitir_quadro(original)
+            erros_de_bit += erros_quadro
+            bits_no_canal += bits_quadro
+
+            if recebido is None:
+                recusados += 1
+                # As mensagens trazem valores do quadro; agrupa pelo tipo ("Erro detectado (CRC-32)", ...)
+                erros[erro.strip("[]").split(":")[0]] += 1
+                if self.opcoes.quadro_recusado == "zeros":
+                    partes.append(bytes(len(original)))
+                continue
+            if recebido == original:
+                corretos += 1
+                bytes_corretos += len(original)
+            else:
+                errados += 1
+                if self.opcoes.quadro_recusado == "zeros":
+                    # Erros não detectados podem mudar o tamanho do quadro entregue
+                    recebido = recebido[:len(original)].ljust(len(original), b"\0")
+            partes.append(recebido)
+        tempo = time.perf_counter() - inicio
+
+        recuperado = b"".join(partes)
+        quadros = corretos + recusados + errados
+        resumo = {
+            "bytes_entrada": len(dados),
+            "bytes_recuperados": len(recuperado),
+            "identico": recuperado == dados,
+            "quadros": quadros,
+            "quadros_corretos": corretos,
+            "quadros_recusados": recusados,
+            "quadros_errados_aceitos": errados,
+            "bytes_corretos": bytes_corretos,
+            "fer": (recusados + errados) / quadros if quadros else 0.0,
+            "bits_no_canal": bits_no_canal,
+            "erros_de_bit": erros_de_bit,
+            "ber": erros_de_bit / bits_no_canal if bits_no_canal else 0.0,
+            # Bits de carga entregues corretamente por bit transmitido no canal
+            "goodput": 8 * bytes_corretos / bits_no_canal if bits_no_canal else 0.0,
+            "tempo_s": tempo,
+            "vazao_bps": 8 * len(dados) / tempo if tempo > 0 else 0.0,
+            "erros_por_tipo": dict(erros),
+        }
+        return recuperado, resumo
+
+
+def _ler(entrada):
+    if entrada == "-":
+        return sys.stdin.buffer.read()
+    with open(entrada, "rb") as arquivo:
+        return arquivo.read()
+
+
+def _gravar(destino, dados):
+    if destino == "-":
+        sys.stdout.buffer.write(dados)
+        sys.stdout.buffer.flush()
+        return
+    with open(destino, "wb") as arquivo:
+        arquivo.write(dados)
+
+
+def _destino(saida, entrada, varias):
+    if saida is None or not varias:
+        return saida
+    os.makedirs(saida, exist_ok=True)
+    nome = "stdin" if entrada == "-" else os.path.basename(entrada)
+    return os.path.join(saida, nome)
+
+
+def _totalizar(resumos):
+    total = {chave: sum(r[chave] for r in resumos)
+             for chave in ("bytes_entrada", "bytes_recuperados", "quadros", "quadros_corretos", "quadros_recusados",
+                           "quadros_errados_aceitos", "bytes_corretos", "bits_no_canal", "erros_de_bit", "tempo_s")}
+    total["identico"] = all(r["identico"] for r in resumos)
+    total["fer"] = (total["quadros_recusados"] + total["quadros_errados_aceitos"]) / total["quadros"] if total["quadros"] else 0.0
+    total["ber"] = total["erros_de_bit"] / total["bits_no_canal"] if total["bits_no_canal"] else 0.0
+    total["goodput"] = 8 * total["bytes_corretos"] / total["bits_no_canal"] if total["bits_no_canal"] else 0.0
+    total["vazao_bps"] = 8 * total["bytes_entrada"] / total["tempo_s"] if total["tempo_s"] > 0 else 0.0
+    erros = collections.Counter()
+    for r in resumos:
+        erros.update(r["erros_por_tipo"])
+    total["erros_por_tipo"] = dict(erros)
+    return total
+
+
+def main(argv=None):
+    parser = criar_parser()
+    opcoes = parser.parse_args(argv)
+    if opcoes.texto is not None and opcoes.entradas:
+        parser.error("use arquivos de entrada ou --texto, não ambos")
+
+    try:
+        simulacao = Simulacao(opcoes)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if opcoes.texto is not None:
+        entradas = [("--texto", opcoes.texto.encode("utf-8"))]
+    else:
+        entradas = [(entrada, None) for entrada in (opcoes.entradas or ["-"])]
+    varias = len(entradas) > 1
+    if varias and opcoes.saida == "-":
+        parser.error("com várias entradas, --saida deve ser um diretório")
+
+    resumos = []
+    for entrada, dados in entradas:
+        if dados is None:
+            dados = _ler(entrada)
+        recuperado, resumo = simulacao.processar(dados)
+        destino = _destino(opcoes.saida, entrada, varias)
+        if destino is not None:
+            _gravar(destino, recuperado)
+        resumos.append({"entrada": entrada, "saida": destino, **resumo})
+
+    configuracao = {chave: valor for chave, valor in vars(opcoes).items()
+                    if chave not in ("entradas", "texto", "saida", "resumo", "exigir_identico")}
+    relatorio = json.dumps({"configuracao": configuracao, "arquivos": resumos, "total": _totalizar(resumos)},
+                           ensure_ascii=False, indent=2)
+    if opcoes.resumo == "-":
+        print(relatorio, file=sys.stderr if opcoes.saida == "-" else sys.stdout)
+    else:
+        with open(opcoes.resumo, "w", encoding="utf-8") as arquivo:
+            arquivo.write(relatorio + "\n")
+
+    if opcoes.exigir_identico and not all(r["identico"] for r in resumos):
+        return SAIDA_DIFERENTE
+    return SUCESSO
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,46 @@
 import numpy as np
+from Bits import BitBuffer
 from CamadaFisica import CamadaFisica
 from CamadaEnlace import CamadaEnlace
+from Enlace.bufferQuadro import BufferQuadro
 
 class Transmissor:
-    def __init__(self, amostras_por_bit=50):
-        self.fisica = CamadaFisica(amostras_por_bit)
+    def __init__(self, amostras_por_bit=50, dtype=np.float64):
+        self.fisica = CamadaFisica(amostras_por_bit, dtype)
         self.enlace = CamadaEnlace()
 
     def bytes_para_bits(self, dados_bytes):
         """Converte bytes para array de bits (0 e 1) para a camada física"""
-        bits = []
-        for byte in dados_bytes:
-            bin_str = f'{byte:08b}'
-            bits.extend([int(b) for b in bin_str])
-        return np.array(bits)
+        return BitBuffer.de_bytes(dados_bytes).bits()
 
-    def processar(self, texto, mod_digital, mod_portadora, tipo_enquadramento, tipo_erro="Bit de Paridade Par"):
+    def processar(self, texto, mod_digital, mod_portadora, tipo_enquadramento, tipo_erro="Bit de Paridade Par", out=None):
         """
         Fluxo: Texto -> Bytes -> (Erro) -> (Enquadramento) -> Bits -> Modulação
+        'out' (opcional) é um buffer do chamador que recebe o sinal modulado.
         """
         #Aplicação: Texto -> Bytes
         # Se o texto for vazio, usa um espaço para não quebrar
         if not texto: texto = " "
-        dados_originais = texto.encode('utf-8') 
-        
+        return self.processar_bytes(texto.encode('utf-8'), mod_digital, mod_portadora, tipo_enquadramento, tipo_erro, out)
+
+    def processar_bytes(self, dados_originais, mod_digital, mod_portadora, tipo_enquadramento, tipo_erro="Bit de Paridade Par", out=None):
+        """
+        Como processar(), mas a partir dos bytes da aplicação (dados binários).
+        """
+        # O quadro é montado num buffer com reserva: trailers e cabeçalhos são gravados no lugar
+        quadro = BufferQuadro.de_dados(dados_originais)
+
         # Aplica CRC, Hamming ou Paridade NO DADO BRUTO
-        dados_com_erro = self.enlace.aplicar_deteccao_correcao(dados_originais, tipo_erro)
+        self.enlace.aplicar_deteccao_correcao_buffer(quadro, tipo_erro)
 
         # Enquadra o dado já protegido
-        quadro_bytes = self.enlace.enquadrar(dados_com_erro, tipo_enquadramento)
+        self.enlace.enquadrar_buffer(quadro, tipo_enquadramento)
         
-        quadro_bits = self.bytes_para_bits(quadro_bytes)
+        quadro_bits = self.bytes_para_bits(quadro.dados())
 
         # Gera o sinal elétrico (amostras)
         sinal_digital = self.fisica.codificar_digital(quadro_bits, mod_digital)
 
-        sinal_modulado = self.fisica.modular_analogico(bits=quadro_bits, sinal_digital=sinal_digital, tipo=mod_portadora)
+        sinal_modulado = self.fisica.modular_analogico(bits=quadro_bits, sinal_digital=sinal_digital, tipo=mod_portadora, out=out)
         # Retorna o sinal para o meio e os bits para plotagem
         return sinal_digital, sinal_modulado,quadro_bits
\ No newline at end of file
@@ -2,12 +2,10 @@ import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 import numpy as np 
 
+from Bits import BitBuffer
+
 def bytes_para_bits(self, dados_em_bytes: bytes) -> list[int]:
-        bits = []
-        for byte in dados_em_bytes:
-            binario = format(byte, '08b')
-            bits.extend([int(b) for b in binario])
-        return bits
+        return BitBuffer.de_bytes(dados_em_bytes).bits().tolist()
 
     
 def findall(substring, string):
@@ -56,7 +54,7 @@ def bits_list_formatter(bits_data: list) -> str:
     """
     try:
         # Garante que é uma lista plana e converte cada item para string
-        return "".join(str(int(bit)) for bit in bits_data)
+        return str(BitBuffer.de_bits(bits_data))
     except Exception:
         return str(bits_data)
 
@@ -64,4 +62,4 @@ def byte_formarter(data: bytes) -> str:
     """
     Formata bytes para visualização binária.
     """
-    return ' '.join(f'{b:08b}' for b in data)
\ No newline at end of file
+    return BitBuffer.de_bytes(data).formatar()
\ No newline at end of file
@@ -0,0 +1,264 @@
+import itertools
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import CamadaFisica
+import Enlace.errorCorrection as errorCorrection
+from Transmissor import Transmissor
+from Receptor import Receptor
+from Meio import MeioDeComunicacao
+
+# O receptor demodula a portadora direto dos bits do quadro: o código de linha só
+# muda o sinal digital exibido, não o resultado. A grade padrão usa um só; outros
+# podem ser pedidos em codigos_linha, mas só diferem pela semente do ruído.
+CODIGOS_LINHA = ["NRZ"]
+PORTADORAS = ["ASK", "FSK", "QPSK", "16QAM"]
+ENQUADRAMENTOS = ["Contagem de Caracteres", "Inserção de Bytes", "Inserção de Bits"]
+CONTROLES_ERRO = ["Bit de Paridade Par", "Checksum", "CRC-32", "Hamming", "Convolucional 1/2"]
+
+# Caracteres usados nas cargas aleatórias (ASCII imprimível, 1 byte cada em UTF-8)
+_ALFABETO = np.frombuffer((string.ascii_letters + string.digits + " ").encode("ascii"), dtype=np.uint8)
+
+# Quantil da normal para o intervalo de confiança de 95%
+_Z_95 = 1.96
+
+
+def contar_erros_de_bit(bits_tx, bits_rx):
+    """
+    Conta os bits diferentes entre o quadro enviado e o recebido.
+    Bits que faltam (ou sobram) no quadro recebido contam como erros.
+    """
+    bits_tx = np.asarray(bits_tx, dtype=int)
+    bits_rx = np.asarray(bits_rx, dtype=int)
+    n = min(len(bits_tx), len(bits_rx))
+    return int(np.count_nonzero(bits_tx[:n] != bits_rx[:n])) + abs(len(bits_tx) - len(bits_rx))
+
+
+def meia_largura_relativa(erros, total):
+    """
+    Meia largura do intervalo de confiança de 95% (aproximação normal) de
+    uma taxa erros/total, relativa à própria taxa. Infinita sem erros.
+    """
+    if erros == 0 or total == 0:
+        return float("inf")
+    p = erros / total
+    return _Z_95 * np.sqrt(p * (1 - p) / total) / p
+
+
+def gerar_carga(rng, tamanho_carga):
+    """
+    Carga aleatória de tamanho_carga bytes tirados de _ALFABETO com o gerador 'rng'.
+    """
+    return rng.choice(_ALFABETO, tamanho_carga).tobytes()
+
+
+def simular_ponto(ponto, semente=0, indice=0, tamanho_carga=32, amostras_por_bit=50,
+                  alvo_erros=100, precisao_relativa=None, min_quadros=10, max_quadros=10_000):
+    """
+    Simula um ponto da varredura (um sigma e uma combinação de opções) até
+    atingir o critério de parada.
+
+    Parâmetros:
+    • ponto (dict): Chaves "sigma", "codigo_linha", "portadora", "enquadramento" e "controle_erro".
+    • semente, indice (int): O ruído e as cargas vêm do fluxo (semente, indice),
+      então o mesmo ponto com a mesma semente dá sempre o mesmo resultado.
+    • tamanho_carga (int): Caracteres por quadro.
+    • alvo_erros (int): Para ao acumular esse número de quadros errados.
+    • precisao_relativa (float | None): Para quando o IC de 95% da BER fica
+      dentro de ±precisao_relativa da estimativa.
+    • min_quadros, max_quadros (int): Limites de quadros simulados.
+
+    Retorna:
+    • dict: O ponto acrescido de quadros, bits, erros, BER, FER e goodput.
+    """
+    tx = Transmissor(amostras_por_bit)
+    rx = Receptor(amostras_por_bit)
+    meio = MeioDeComunicacao(semente=semente, trabalhador=indice)
+    rng_carga = np.random.default_rng(np.random.SeedSequence(semente, spawn_key=(indice, 0)))
+
+    quadros = 0
+    bits_canal = 0
+    erros_bit = 0
+    erros_quadro = 0
+    erros_nao_detectados = 0
+    bits_entregues = 0
+    inicio = time.perf_counter()
+
+    while quadros < max_quadros:
+        carga = gerar_carga(rng_carga, tamanho_carga)
+
+        _, sinal, bits_tx = tx.processar_bytes(carga, ponto["codigo_linha"], ponto["portadora"],
+                                               ponto["enquadramento"], ponto["controle_erro"])
+        sinal_rx = meio.transmitir(sinal, ponto["sigma"])
+        carga_rx, erro, bits_rx = rx.decodificar_bytes(sinal_rx, ponto["codigo_linha"], ponto["enquadramento"],
+                                                       ponto["controle_erro"], ponto["portadora"])
+
+        quadros += 1
+        bits_canal += len(bits_tx)
+        erros_bit += contar_erros_de_bit(bits_tx, bits_rx)
+
+        if carga_rx == carga:
+            bits_entregues += 8 * tamanho_carga
+        else:
+            erros_quadro += 1
+            # Quadro errado entregue como se fosse válido (erro is None: o receptor o aceitou)
+            if erro is None:
+                erros_nao_detectados += 1
+
+        if quadros < min_quadros:
+            continue
+        if erros_quadro >= alvo_erros:
+            break
+        if precisao_relativa is not None and meia_largura_relativa(erros_bit, bits_canal) <= precisao_relativa:
+            break
+
+    resultado = dict(ponto)
+    resultado.update({
+        "quadros": quadros,
+        "bits_canal": bits_canal,
+        "erros_bit": erros_bit,
+        "erros_quadro": erros_quadro,
+        "erros_nao_detectados": erros_nao_detectados,
+        "ber": erros_bit / bits_canal if bits_canal else 0.0,
+        "fer": erros_quadro / quadros if quadros else 0.0,
+        # Bits de carga entregues corretamente por bit transmitido no canal
+        "goodput": bits_entregues / bits_canal if bits_canal else 0.0,
+        "tempo_s": time.perf_counter() - inicio,
+    })
+    return resultado
+
+
+def _simular_ponto_trabalhador(argumentos):
+    ponto, semente, indice, opcoes = argumentos
+    return simular_ponto(ponto, semente, indice, **opcoes)
+
+
+def gerar_pontos(sigmas, codigos_linha=None, portadoras=None, enquadramentos=None, controles_erro=None):
+    """
+    Produto cartesiano das opções; cada combinação vira um ponto da varredura.
+    """
+    eixos = itertools.product(
+        codigos_linha or CODIGOS_LINHA,
+        portadoras or PORTADORAS,
+        enquadramentos or ENQUADRAMENTOS,
+        controles_erro or CONTROLES_ERRO,
+        sigmas,
+    )
+    return [
+        {"sigma": float(sigma), "codigo_linha": codigo, "portadora": portadora,
+         "enquadramento": enquadramento, "controle_erro": controle}
+        for codigo, portadora, enquadramento, controle, sigma in eixos
+    ]
+
+
+def executar_varredura(sigmas, codigos_linha=None, portadoras=None, enquadramentos=None, controles_erro=None,
+                       semente=0, max_workers=None, **opcoes):
+    """
+    Executa a varredura Monte Carlo em um pool de processos.
+
+    Cada ponto recebe o índice da sua posição na grade como fluxo de ruído,
+    de modo que o resultado completo é reprodutível a partir de 'semente',
+    independentemente do número de processos. As 'opcoes' são repassadas
+    para simular_ponto (tamanho_carga, alvo_erros, precisao_relativa, ...).
+
+    Retorna:
+    • list[dict]: Um resultado por ponto, na ordem de gerar_pontos.
+    """
+    pontos = gerar_pontos(sigmas, codigos_linha, portadoras, enquadramentos, controles_erro)
+    tarefas = [(ponto, semente, indice, opcoes) for indice, ponto in enumerate(pontos)]
+
+    if max_workers == 1:
+        return [_simular_ponto_trabalhador(tarefa) for tarefa in tarefas]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_simular_ponto_trabalhador, tarefas))
+
+
+def comparar_decisao_suave(sigmas, portadora="QPSK", codigo="Convolucional 1/2", n_bits=20_000,
+                           amostras_por_bit=50, semente=0):
+    """
+    BER de dados com decisão dura e com decisão suave (LLRs do demodulador)
+    para um código de CODIGOS_HAMMING (Chase-II) ou CODIGOS_CONVOLUCIONAIS (Viterbi).
+
+    Retorna:
+    • list[dict]: Uma linha por sigma com "ber_dura" e "ber_suave".
+    """
+    if codigo in errorCorrection.CODIGOS_HAMMING:
+        hamming = errorCorrection.CODIGOS_HAMMING[codigo]
+        n_bits -= n_bits % hamming.k
+        codificar = lambda bits: hamming.codificar_bits(bits).reshape(-1)
+        decodificar_duro = lambda bits: hamming.decodificar_bits(bits)[0]
+        decodificar_suave = hamming.decodificar_llr
+    elif codigo in errorCorrection.CODIGOS_CONVOLUCIONAIS:
+        convolucional = errorCorrection.CODIGOS_CONVOLUCIONAIS[codigo]
+        codificar = convolucional.codificar_bits
+        decodificar_duro = lambda bits: convolucional.decodificar(bits, n_bits, suave=False)
+        decodificar_suave = lambda llr: convolucional.decodificar(llr, n_bits)
+    else:
+        raise ValueError(f"Código sem decodificação suave: {codigo}")
+
+    _, modular, demodular = CamadaFisica.resolver_modem(portadora, amostras_por_bit)
+    meio = MeioDeComunicacao(semente=semente)
+    bits = np.random.default_rng(semente).integers(0, 2, n_bits).astype(np.uint8)
+    codificados = codificar(bits)
+    sinal = modular(codificados)
+
+    resultados = []
+    for sigma in sigmas:
+        recebido = meio.transmitir(sinal, sigma)
+        # Símbolos de preenchimento da modulação podem deixar valores a mais no fim
+        duros = np.asarray(demodular(recebido)[:len(codificados)], dtype=np.uint8)
+        llr = demodular(recebido, suave=True, sigma=sigma)[:len(codificados)]
+        resultados.append({
+            "sigma": float(sigma),
+            "ber_dura": float(np.mean(decodificar_duro(duros) != bits)),
+            "ber_suave": float(np.mean(decodificar_suave(llr) != bits)),
+        })
+    return resultados
+
+
+def tabela(resultados, metrica):
+    """
+    Organiza os resultados em linhas (combinação de opções) por colunas (sigma).
+
+    Retorna:
+    • list[dict]: Uma linha por combinação, com uma coluna "σ=<valor>" por sigma.
+    """
+    linhas = {}
+    for r in resultados:
+        chave = (r["codigo_linha"], r["portadora"], r["enquadramento"], r["controle_erro"])
+        if chave not in linhas:
+            linhas[chave] = {"configuracao": " / ".join(chave)}
+        linhas[chave][f"σ={r['sigma']:g}"] = float(r[metrica])
+    return list(linhas.values())
+
+
+def imprimir_tabela(titulo, linhas):
+    print(f"\n=== {titulo} ===")
+    if not linhas:
+        return
+    colunas = list(linhas[0].keys())
+    largura = max(len(linha["configuracao"]) for linha in linhas)
+    print(f"{colunas[0]:<{largura}} | " + " | ".join(f"{c:>10}" for c in colunas[1:]))
+    for linha in linhas:
+        valores = " | ".join(f"{linha[c]:>10.3e}" for c in colunas[1:])
+        print(f"{linha['configuracao']:<{largura}} | {valores}")
+
+
+def main():
+    resultados = executar_varredura(
+        sigmas=[0.0, 0.5, 1.0, 1.5],
+        enquadramentos=["Contagem de Caracteres"],
+        alvo_erros=50,
+        max_quadros=500,
+    )
+    imprimir_tabela("BER", tabela(resultados, "ber"))
+    imprimir_tabela("FER", tabela(resultados, "fer"))
+    imprimir_tabela("Goodput (bits de carga / bit no canal)", tabela(resultados, "goodput"))
+
+
+if __name__ == "__main__":
+    main()